@@ -0,0 +1,49 @@
+"""
+Bulk decode of concatenated LOOP records.
+
+Compares one `StationObservation.init_with_bytes` per record with
+`decode_loop_records` over the whole buffer. Requires NumPy. Run with
+`python -m benchmarks.bench_batch`.
+"""
+
+# Standard Library
+import time
+from typing import Dict
+
+# Skyentific Code
+from skyentific.models import (
+    LOOP_RECORD_SIZE_BYTES,
+    StationObservation,
+    decode_loop_records,
+)
+
+from .packets import LOOP_PACKET
+
+
+def run(count: int = 50_000) -> Dict[str, float]:
+    """Returns seconds to decode `count` records with each approach."""
+    buffer = LOOP_PACKET * count
+
+    started_at = time.perf_counter()
+    for offset in range(0, len(buffer), LOOP_RECORD_SIZE_BYTES):
+        StationObservation.init_with_bytes(
+            buffer[offset : offset + LOOP_RECORD_SIZE_BYTES]
+        )
+    per_object = time.perf_counter() - started_at
+
+    # Imports NumPy and builds the record dtype outside the timed region.
+    decode_loop_records(LOOP_PACKET)
+    started_at = time.perf_counter()
+    decode_loop_records(buffer)
+    batch = time.perf_counter() - started_at
+
+    return {"per_object_s": per_object, "batch_s": batch}
+
+
+def main():
+    for name, value in run().items():
+        print(f"{name}: {value:.4f}")
+
+
+if __name__ == "__main__":
+    main()
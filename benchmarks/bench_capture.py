@@ -0,0 +1,104 @@
+"""
+Capture file write and replay time, against NDJSON.
+
+Appends the fixed packet dataset to a capture file and to an NDJSON file
+of the decoded observations, then reads both back: the capture by
+iterating over its records, by decoding them with `init_with_bytes`, and,
+with NumPy, by decoding every record into columns at once. Reports
+microseconds and bytes on disk per record. Run with
+`python -m benchmarks.bench_capture`.
+"""
+
+# Standard Library
+import json
+import os
+import tempfile
+import time
+from typing import Dict
+
+# Skyentific Code
+from skyentific.capture import CaptureReader, CaptureWriter
+from skyentific.models import StationObservation
+from skyentific.serialize import write_ndjson
+
+from .packets import LOOP_PACKETS
+
+STATION = "192.168.1.100:22222"
+
+
+def best_of(function, repeat: int = 5) -> float:
+    """The best of `repeat` runs of `function`, in seconds."""
+    timings = []
+    for _ in range(repeat):
+        started_at = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - started_at)
+    return min(timings)
+
+
+def run(count: int = 100_000) -> Dict[str, float]:
+    """Returns microseconds and bytes per record."""
+    packets = (LOOP_PACKETS * (count // len(LOOP_PACKETS) + 1))[:count]
+    observations = [
+        StationObservation.init_with_bytes(packet, STATION) for packet in packets
+    ]
+    directory = tempfile.mkdtemp()
+    capture_path = os.path.join(directory, "loop.capture")
+    ndjson_path = os.path.join(directory, "loop.ndjson")
+
+    def write_capture():
+        if os.path.exists(capture_path):
+            os.remove(capture_path)
+        with CaptureWriter(capture_path) as capture:
+            for packet in packets:
+                capture.append(packet, STATION)
+
+    def write_json():
+        with open(ndjson_path, "wb") as ndjson_file:
+            write_ndjson(observations, ndjson_file)
+
+    def iterate():
+        with CaptureReader(capture_path) as capture:
+            for _ in capture:
+                pass
+
+    def replay():
+        with CaptureReader(capture_path) as capture:
+            for _ in capture.replay(StationObservation.init_with_bytes):
+                pass
+
+    def read_json():
+        with open(ndjson_path, "rb") as ndjson_file:
+            for line in ndjson_file:
+                json.loads(line)
+
+    try:
+        results = {
+            "capture_append_us": best_of(write_capture) / count * 1e6,
+            "ndjson_write_us": best_of(write_json) / count * 1e6,
+            "capture_iterate_us": best_of(iterate) / count * 1e6,
+            "capture_replay_us": best_of(replay) / count * 1e6,
+            "ndjson_read_us": best_of(read_json) / count * 1e6,
+            "capture_bytes_per_record": os.path.getsize(capture_path) / count,
+            "ndjson_bytes_per_record": os.path.getsize(ndjson_path) / count,
+        }
+        try:
+            with CaptureReader(capture_path) as capture:
+                results["capture_columns_us"] = best_of(capture.columns) / count * 1e6
+        except ImportError:
+            pass
+    finally:
+        for path in (capture_path, ndjson_path):
+            if os.path.exists(path):
+                os.remove(path)
+        os.rmdir(directory)
+    return results
+
+
+def main():
+    for name, value in run().items():
+        print(f"{name}: {value:.2f}")
+
+
+if __name__ == "__main__":
+    main()
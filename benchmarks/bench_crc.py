@@ -0,0 +1,44 @@
+"""
+CRC16 throughput over LOOP packets.
+
+Compares `crc16` (which uses `binascii.crc_hqx` when available) with the
+pure Python table loop. Run with `python -m benchmarks.bench_crc`.
+"""
+
+# Standard Library
+import time
+from typing import Dict
+
+# Skyentific Code
+from skyentific.utils import crc16, crc16_python
+
+from .packets import LOOP_PACKET
+
+
+def seconds_per_million(function, count: int) -> float:
+    """Time `count` CRC checks and scale the result to one million packets."""
+    packet = LOOP_PACKET
+    started_at = time.perf_counter()
+    for _ in range(count):
+        function(packet)
+    return (time.perf_counter() - started_at) * 1_000_000 / count
+
+
+def run(count: int = 1_000_000) -> Dict[str, float]:
+    """Returns seconds per one million packets for each implementation."""
+    return {
+        "crc16_s_per_million": seconds_per_million(crc16, count),
+        # The pure Python loop is sampled and scaled to keep runs short.
+        "crc16_python_s_per_million": seconds_per_million(
+            crc16_python, max(count // 20, 1)
+        ),
+    }
+
+
+def main():
+    for name, value in run().items():
+        print(f"{name}: {value:.3f}")
+
+
+if __name__ == "__main__":
+    main()
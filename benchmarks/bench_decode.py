@@ -0,0 +1,125 @@
+"""
+Per-packet LOOP decode time.
+
+Compares `StationObservation.init_with_bytes` against the BitStream read
+chain it replaced. Run with `python -m benchmarks.bench_decode`.
+"""
+
+# Standard Library
+import datetime
+import timeit
+from typing import Dict
+
+# Third Party Code
+from bitstring import BitStream
+
+# Skyentific Code
+from skyentific.bar_trend import BarTrend
+from skyentific.models import LoopPacketView, LoopRecord, StationObservation
+from skyentific.utils import make_time
+
+from .packets import LOOP_PACKET
+
+OBSERVATION_MADE_AT = datetime.datetime(2024, 5, 27, 17, 34, 9)
+
+
+def bitstream_init_with_bytes(record_bytes: bytes) -> StationObservation:
+    """The previous BitStream based decoder, kept as the baseline."""
+    record_bitstream = BitStream(record_bytes)
+    StationObservation.validate_record(record_bitstream, False)
+    record_bitstream.pos = 24
+    bar_trend = BarTrend(record_bitstream.read(8).intle)
+    StationObservation.validate_packet_type(record_bitstream)
+    record_bitstream.read(16)
+    barometer = record_bitstream.read(16).uintle / 1000.0
+    inside_temperature = record_bitstream.read(16).intle / 10.0
+    inside_humidity = record_bitstream.read(8).uintle
+    outside_temperature = record_bitstream.read(16).intle / 10.0
+    wind_speed = record_bitstream.read(8).uintle
+    ten_min_avg_wind_speed = record_bitstream.read(8).uintle
+    wind_direction = record_bitstream.read(16).uintle
+    record_bitstream.read(56)
+    record_bitstream.read(32)
+    record_bitstream.read(32)
+    outside_humidity = record_bitstream.read(8).uintle
+    record_bitstream.read(56)
+    rain_rate = record_bitstream.read(16).uintle
+    record_bitstream.read(8)
+    for _ in range(9):
+        record_bitstream.read(16)
+    record_bitstream.read(32)
+    record_bitstream.read(32)
+    record_bitstream.read(8)
+    record_bitstream.read(8)
+    record_bitstream.read(16)
+    record_bitstream.read(64)
+    record_bitstream.read(32)
+    record_bitstream.read(8)
+    console_battery_voltage = (
+        (record_bitstream.read(16).uintle * 300.0) / 512.0
+    ) / 100.0
+    forecast_icons = record_bitstream.read(8).uintle
+    forecast_rule_number = record_bitstream.read(8).uintle
+    sunrise = make_time(record_bitstream.read(16).uintle)
+    sunset = make_time(record_bitstream.read(16).uintle)
+    return StationObservation(
+        bar_trend=bar_trend,
+        barometer=barometer,
+        inside_temperature=inside_temperature,
+        inside_humidity=inside_humidity,
+        outside_temperature=outside_temperature,
+        outside_humidity=outside_humidity,
+        wind_speed=wind_speed,
+        ten_min_avg_wind_speed=ten_min_avg_wind_speed,
+        wind_direction=wind_direction,
+        rain_rate=rain_rate,
+        console_battery_voltage=console_battery_voltage,
+        forecast_icons=forecast_icons,
+        forecast_rule_number=forecast_rule_number,
+        sunrise=sunrise,
+        sunset=sunset,
+        identifier=1,
+        observation_made_at=OBSERVATION_MADE_AT,
+    )
+
+
+def per_call(statement, number: int) -> float:
+    """Best of five runs, in microseconds per call."""
+    return min(timeit.repeat(statement, number=number, repeat=5)) / number * 1e6
+
+
+def read_three_fields(record_bytes: bytes):
+    """What most consumers do: outside temperature, wind and barometer."""
+    view = LoopPacketView(record_bytes, 1, OBSERVATION_MADE_AT)
+    return view.outside_temperature, view.wind_speed, view.barometer
+
+
+def run(number: int = 20000) -> Dict[str, float]:
+    """Returns microseconds per decoded packet for each decoder."""
+    return {
+        "bitstream_init_with_bytes_us": per_call(
+            lambda: bitstream_init_with_bytes(LOOP_PACKET), number
+        ),
+        "struct_init_with_bytes_us": per_call(
+            lambda: StationObservation.init_with_bytes(
+                LOOP_PACKET, 1, OBSERVATION_MADE_AT
+            ),
+            number,
+        ),
+        "full_record_init_with_bytes_us": per_call(
+            lambda: LoopRecord.init_with_bytes(LOOP_PACKET, 1, OBSERVATION_MADE_AT),
+            number,
+        ),
+        "view_three_fields_us": per_call(
+            lambda: read_three_fields(LOOP_PACKET), number
+        ),
+    }
+
+
+def main():
+    for name, value in run().items():
+        print(f"{name}: {value:.2f}")
+
+
+if __name__ == "__main__":
+    main()
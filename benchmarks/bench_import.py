@@ -0,0 +1,86 @@
+"""
+Import time of the package.
+
+Runs `python -X importtime -c "import skyentific"` in fresh interpreters and
+reports the median cumulative time for the package and for `models`, which
+the CLI and every decoder import. The bytecode cache is warmed first so the
+numbers are those of an installed package rather than of compiling it.
+Optional and heavy dependencies (bitstring, dateutil, numpy, orjson) should
+only load when a feature needs them, so the run also counts any that
+`import skyentific` pulls in. Run with `python -m benchmarks.bench_import`.
+"""
+
+# Standard Library
+import importlib.util
+import os
+import statistics
+import subprocess
+import sys
+from typing import Dict, List
+
+# The target for a warm `import skyentific`, in milliseconds.
+IMPORT_BUDGET_MS = 35.0
+# Modules that must not load with the package itself.
+DEFERRED_MODULES = ("bitstring", "dateutil", "numpy", "orjson")
+
+
+def import_times(module: str = "skyentific") -> Dict[str, int]:
+    """Cumulative import time in microseconds of every module, by name."""
+    environment = dict(os.environ)
+    # Bytecode must be written for the cache to be warm after the first run.
+    environment.pop("PYTHONDONTWRITEBYTECODE", None)
+    package_root = os.path.dirname(
+        os.path.dirname(importlib.util.find_spec(module).origin)
+    )
+    environment["PYTHONPATH"] = os.pathsep.join(
+        filter(None, (package_root, environment.get("PYTHONPATH")))
+    )
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import %s" % module],
+        capture_output=True,
+        check=True,
+        env=environment,
+        text=True,
+    )
+    times = {}
+    for line in completed.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        if not line.startswith("import time:"):
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        if cumulative.strip().isdigit():
+            times[name.strip()] = int(cumulative)
+    return times
+
+
+def deferred_loaded(times: Dict[str, int]) -> List[str]:
+    """The deferred modules that were imported anyway."""
+    return sorted({name.split(".")[0] for name in times} & set(DEFERRED_MODULES))
+
+
+def run(repeat: int = 15) -> Dict[str, float]:
+    """Returns the median import times in milliseconds."""
+    import_times()
+    runs = [import_times() for _ in range(repeat)]
+    return {
+        "import_ms": statistics.median(run["skyentific"] for run in runs) / 1000,
+        "models_import_ms": statistics.median(run["skyentific.models"] for run in runs)
+        / 1000,
+        "budget_ms": IMPORT_BUDGET_MS,
+        "deferred_modules_loaded": float(len(deferred_loaded(runs[-1]))),
+    }
+
+
+def main():
+    results = run()
+    for name, value in results.items():
+        print(f"{name}: {value:.2f}")
+    if results["import_ms"] > IMPORT_BUDGET_MS:
+        print(f"over budget by {results['import_ms'] - IMPORT_BUDGET_MS:.2f} ms")
+    loaded = deferred_loaded(import_times())
+    if loaded:
+        print("loaded at import: %s" % ", ".join(loaded))
+
+
+if __name__ == "__main__":
+    main()
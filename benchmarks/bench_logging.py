@@ -0,0 +1,133 @@
+"""
+Per-packet logging overhead with logging at WARNING.
+
+Replays LOOP responses from memory through `get_current`, `make_time` and
+`forecast_icons_text` and compares them with copies of the previous
+versions, which built debug and info messages on every call. Run with
+`python -m benchmarks.bench_logging`.
+"""
+
+# Standard Library
+import datetime
+import logging
+import socket
+import timeit
+from typing import Dict
+
+# Skyentific Code
+from skyentific import LOOP_COMMAND, get_current, receive_loop_record
+from skyentific.exceptions import BadCRC, NotAcknowledged, UnknownResponseCode
+from skyentific.models import FORECAST_ICONS_LOOKUP, forecast_icons_text
+from skyentific.utils import make_time, request
+
+from .packets import LOOP_PACKET
+
+logger = logging.getLogger("skyentific")
+
+
+class ReplaySocket(object):
+    """Answers every request with an ACK and the same LOOP packet."""
+
+    def __init__(self, packet: bytes) -> None:
+        self.response = b"\x06" + packet
+        self.position = 0
+
+    def sendall(self, data: bytes) -> None:
+        self.position = 0
+
+    def recv(self, buffer_size: int) -> bytes:
+        data = self.response[self.position : self.position + buffer_size]
+        self.position += len(data)
+        return data
+
+    def recv_into(self, buffer, nbytes: int = 0) -> int:
+        data = self.recv(nbytes or len(buffer))
+        buffer[: len(data)] = data
+        return len(data)
+
+
+def previous_get_current(sock) -> bytes:
+    logger.debug("Attempting to get current conditions.")
+    try:
+        try:
+            request(sock, LOOP_COMMAND % 1)
+            logger.debug("Loop command issued successfully.")
+        except (BadCRC, NotAcknowledged, UnknownResponseCode) as e:
+            logger.exception("Could not issue loop command: %s", str(e))
+            raise
+        loop_data = receive_loop_record(sock)
+        logger.info("Loop data received successfully.")
+    except socket.error as socket_error:
+        logger.exception(
+            f"Could not issue loop command due to socket error: {str(socket_error)}"
+        )
+        raise NotAcknowledged()
+    logger.info("Request was acknowledged.")
+    logger.debug("Returning loop data.")
+    return loop_data
+
+
+def previous_make_time(time_stamp: int) -> datetime.time:
+    logger.debug(f"Converting time stamp {time_stamp} to time object.")
+    hour = time_stamp // 100
+    minute = time_stamp % 100
+    second = 0
+    logger.debug(f"Time stamp {time_stamp} converted to {hour}:{minute}:{second}.")
+    return datetime.time(hour=hour, minute=minute, second=second)
+
+
+def previous_forecast_icons_text(forecast_icons: int) -> str:
+    logger.debug(f"Forecast Icons For: {forecast_icons}, binary: {bin(forecast_icons)}")
+    text = []
+    for i in range(5):
+        if forecast_icons & (1 << i):
+            logger.debug(f"Forecast Icon: {i} -> {FORECAST_ICONS_LOOKUP[i]}")
+            text.append(FORECAST_ICONS_LOOKUP[i])
+        else:
+            logger.debug(f"Forecast Icon: {i} -> Not Set")
+    return ", ".join(text)
+
+
+def per_call(statement, number: int) -> float:
+    """Best of five runs, in microseconds per call."""
+    return min(timeit.repeat(statement, number=number, repeat=5)) / number * 1e6
+
+
+def per_packet(get, time_function, icons_function) -> None:
+    """What one poll costs: the request, two times and the forecast icons."""
+    get(ReplaySocket(LOOP_PACKET))
+    time_function(630)
+    time_function(1945)
+    icons_function(6)
+
+
+def run(number: int = 20000) -> Dict[str, float]:
+    """Returns microseconds per packet before and after."""
+    level = logging.getLogger().level
+    logging.getLogger().setLevel(logging.WARNING)
+    try:
+        return {
+            "previous_us_per_packet": per_call(
+                lambda: per_packet(
+                    previous_get_current,
+                    previous_make_time,
+                    previous_forecast_icons_text,
+                ),
+                number,
+            ),
+            "current_us_per_packet": per_call(
+                lambda: per_packet(get_current, make_time, forecast_icons_text),
+                number,
+            ),
+        }
+    finally:
+        logging.getLogger().setLevel(level)
+
+
+def main():
+    for name, value in run().items():
+        print(f"{name}: {value:.2f}")
+
+
+if __name__ == "__main__":
+    main()
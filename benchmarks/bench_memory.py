@@ -0,0 +1,40 @@
+"""
+Memory held per `StationObservation`.
+
+Decodes a batch of observations and reports the bytes allocated per
+observation with `tracemalloc`. Run with `python -m benchmarks.bench_memory`.
+"""
+
+# Standard Library
+import gc
+import tracemalloc
+from typing import Dict
+
+# Skyentific Code
+from skyentific.models import StationObservation
+
+from .packets import LOOP_PACKET
+
+
+def run(count: int = 10_000) -> Dict[str, float]:
+    """Returns the bytes allocated per retained observation."""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    observations = [
+        StationObservation.init_with_bytes(LOOP_PACKET) for _ in range(count)
+    ]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    allocated = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    del observations
+    return {"bytes_per_observation": allocated / count}
+
+
+def main():
+    for name, value in run().items():
+        print(f"{name}: {value:.1f}")
+
+
+if __name__ == "__main__":
+    main()
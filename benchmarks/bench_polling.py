@@ -0,0 +1,85 @@
+"""
+End-to-end request latency over a loopback socket.
+
+Polls a `SimulatedLogger` on localhost, both on one persistent connection
+and with a new connection per poll, as the `skyentific` command does, and
+again on one connection with `skyentific.metrics` enabled to show the cost
+of instrumentation. Run with `python -m benchmarks.bench_polling`.
+"""
+
+# Standard Library
+import socket
+import statistics
+import time
+from typing import Dict, List
+
+# Skyentific Code
+from skyentific import get_current, get_current_condition, metrics
+from skyentific.models import StationObservation
+from skyentific.simulator import SimulatedLogger
+from skyentific.utils import connect
+
+
+def summarize(name: str, latencies: List[float]) -> Dict[str, float]:
+    """Mean and percentiles of `latencies`, in microseconds."""
+    latencies = sorted(latencies)
+    last = len(latencies) - 1
+    return {
+        f"{name}_mean_us": statistics.fmean(latencies) * 1e6,
+        f"{name}_p50_us": latencies[last // 2] * 1e6,
+        f"{name}_p95_us": latencies[last * 95 // 100] * 1e6,
+        f"{name}_p99_us": latencies[last * 99 // 100] * 1e6,
+    }
+
+
+def persistent_connection(address, count: int) -> List[float]:
+    latencies = []
+    with socket.create_connection(address) as sock:
+        for _ in range(count):
+            started_at = time.perf_counter()
+            get_current(sock)
+            latencies.append(time.perf_counter() - started_at)
+    return latencies
+
+
+def connection_per_poll(address, count: int) -> List[float]:
+    latencies = []
+    for _ in range(count):
+        started_at = time.perf_counter()
+        sock = connect(address[0], address[1], socket.socket)
+        get_current_condition(sock, StationObservation.init_with_bytes)
+        latencies.append(time.perf_counter() - started_at)
+    return latencies
+
+
+def run(count: int = 2000) -> Dict[str, float]:
+    """Returns latency statistics for each way of polling."""
+    with SimulatedLogger() as simulator:
+        results = summarize(
+            "persistent", persistent_connection(simulator.address, count)
+        )
+        results.update(
+            summarize(
+                "connect_per_poll",
+                connection_per_poll(simulator.address, max(count // 4, 1)),
+            )
+        )
+        metrics.enable()
+        try:
+            results.update(
+                summarize(
+                    "instrumented", persistent_connection(simulator.address, count)
+                )
+            )
+        finally:
+            metrics.disable()
+    return results
+
+
+def main():
+    for name, value in run().items():
+        print(f"{name}: {value:.1f}")
+
+
+if __name__ == "__main__":
+    main()
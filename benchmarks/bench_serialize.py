@@ -0,0 +1,88 @@
+"""
+Per-record serialization time.
+
+Times `to_dict` on decoded records, `json.dumps` of the result, and the
+`skyentific.serialize` writers, per record and as one NDJSON batch, over
+the fixed packet dataset. Run with `python -m benchmarks.bench_serialize`.
+"""
+
+# Standard Library
+import datetime
+import json
+import timeit
+from typing import Dict
+
+# Skyentific Code
+from skyentific.models import LoopRecord, StationObservation
+from skyentific.serialize import dumps, dumps_ndjson, orjson
+
+from .packets import LOOP_PACKETS
+
+OBSERVATION_MADE_AT = datetime.datetime(2024, 5, 27, 17, 34, 9)
+
+
+def per_record(function, records, number: int) -> float:
+    """Best of five runs, in microseconds per record."""
+    calls = max(number // len(records), 1)
+
+    def statement():
+        for record in records:
+            function(record)
+
+    seconds = min(timeit.repeat(statement, number=calls, repeat=5))
+    return seconds / (calls * len(records)) * 1e6
+
+
+def run(number: int = 20000) -> Dict[str, float]:
+    """Returns microseconds per record for each serialization step."""
+    observations = [
+        StationObservation.init_with_bytes(packet, 1, OBSERVATION_MADE_AT)
+        for packet in LOOP_PACKETS
+    ]
+    records = [
+        LoopRecord.init_with_bytes(packet, 1, OBSERVATION_MADE_AT)
+        for packet in LOOP_PACKETS
+    ]
+    results = {
+        "observation_to_dict_us": per_record(
+            lambda observation: observation.to_dict(), observations, number
+        ),
+        "record_to_dict_us": per_record(
+            lambda record: record.to_dict(), records, number
+        ),
+        "observation_json_us": per_record(
+            lambda observation: json.dumps(observation.to_dict(), default=str),
+            observations,
+            number,
+        ),
+        "observation_dumps_us": per_record(
+            lambda observation: dumps(observation, "json"), observations, number
+        ),
+        "record_dumps_us": per_record(
+            lambda record: dumps(record, "json"), records, number
+        ),
+        # One batch per call, so scale the calls down to match.
+        "observation_ndjson_batch_us": per_record(
+            lambda batch: dumps_ndjson(batch, "json"),
+            [observations],
+            number // len(observations),
+        )
+        / len(observations),
+    }
+    if orjson is not None:
+        results["observation_dumps_orjson_us"] = per_record(
+            lambda observation: dumps(observation, "orjson"), observations, number
+        )
+        results["record_dumps_orjson_us"] = per_record(
+            lambda record: dumps(record, "orjson"), records, number
+        )
+    return results
+
+
+def main():
+    for name, value in run().items():
+        print(f"{name}: {value:.2f}")
+
+
+if __name__ == "__main__":
+    main()
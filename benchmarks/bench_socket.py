@@ -0,0 +1,85 @@
+"""
+Receive syscalls and latency per LOOP packet over a local socketpair.
+
+Compares the previous 16 byte `recv` loop with `PacketReader`. Run with
+`python -m benchmarks.bench_socket`.
+"""
+
+# Standard Library
+import socket
+import threading
+import time
+from typing import Dict
+
+# Skyentific Code
+from skyentific import LOOP_RECORD_SIZE_BYTES
+from skyentific.utils import SOCKET_BUFFER_SIZE, PacketReader
+
+from .packets import LOOP_PACKET
+
+
+class CountingSocket(object):
+    """Counts the receive calls made on a socket."""
+
+    def __init__(self, sock: socket.socket) -> None:
+        self.sock = sock
+        self.calls = 0
+
+    def recv(self, buffer_size: int) -> bytes:
+        self.calls += 1
+        return self.sock.recv(buffer_size)
+
+    def recv_into(self, buffer, nbytes: int = 0) -> int:
+        self.calls += 1
+        return self.sock.recv_into(buffer, nbytes)
+
+
+def recv_loop(sock: CountingSocket, count: int) -> None:
+    """The previous reader: 16 byte reads concatenated into bytes."""
+    for _ in range(count):
+        loop_data = b""
+        while len(loop_data) < LOOP_RECORD_SIZE_BYTES:
+            loop_data += sock.recv(
+                min(SOCKET_BUFFER_SIZE, LOOP_RECORD_SIZE_BYTES - len(loop_data))
+            )
+
+
+def packet_reader(sock: CountingSocket, count: int) -> None:
+    reader = PacketReader(sock, LOOP_RECORD_SIZE_BYTES)
+    for _ in range(count):
+        reader.read()
+
+
+def measure(read, count: int) -> Dict[str, float]:
+    reader_socket, writer_socket = socket.socketpair()
+    with reader_socket, writer_socket:
+        writer = threading.Thread(
+            target=writer_socket.sendall, args=(LOOP_PACKET * count,)
+        )
+        counting_socket = CountingSocket(reader_socket)
+        writer.start()
+        started_at = time.perf_counter()
+        read(counting_socket, count)
+        elapsed = time.perf_counter() - started_at
+        writer.join()
+    return {
+        "calls_per_packet": counting_socket.calls / count,
+        "us_per_packet": elapsed / count * 1e6,
+    }
+
+
+def run(count: int = 100_000) -> Dict[str, float]:
+    results = {}
+    for name, read in (("recv_loop", recv_loop), ("packet_reader", packet_reader)):
+        for metric, value in measure(read, count).items():
+            results[f"{name}_{metric}"] = value
+    return results
+
+
+def main():
+    for name, value in run().items():
+        print(f"{name}: {value:.2f}")
+
+
+if __name__ == "__main__":
+    main()
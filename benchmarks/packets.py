@@ -0,0 +1,12 @@
+"""Captured LOOP packets shared by the benchmarks."""
+
+# Skyentific Code
+from skyentific.simulator import synthetic_loop2_packet, synthetic_loop_packet
+
+LOOP_PACKET = b"LOO\x14\x00\xb1\x02It\x1e\x03\x0f\x8a\x02\x02\x03\x8c\x00\xff\xff\xff\xff\xff\xff\xff\xff\xff\xff\xff\xff\xff\xff\xff\x1b\xff\xff\xff\xff\xff\xff\xff\x00\x00V\xff\x7f\x00\x00\xff\xff\x00\x00\x02\x00\x02\x00\x00\x00\x00\x00\x00\x00\xff\xff\xff\xff\xff\xff\xff\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x006\x03\x03\xc0\x1b\x02\xe3\x07\n\r\xee\x00"
+
+# A fixed dataset: the captured packet followed by synthetic packets whose
+# readings drift, so decoders see varied values without depending on a
+# random seed.
+LOOP_PACKETS = [LOOP_PACKET] + [synthetic_loop_packet(i) for i in range(255)]
+LOOP2_PACKETS = [synthetic_loop2_packet(i) for i in range(256)]
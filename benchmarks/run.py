@@ -0,0 +1,133 @@
+"""
+Runs the benchmark suite and saves the results as JSON.
+
+Every `benchmarks.bench_*` module exposes `run()`, returning a flat dict
+of metrics. This runs each of them (or those named on the command line),
+records the commit and interpreter alongside the numbers, and optionally
+compares against an earlier results file:
+
+    python -m benchmarks.run --output results.json
+    python -m benchmarks.run decode crc --compare results.json
+
+`--quick` shrinks the iteration counts for a smoke run.
+"""
+
+# Standard Library
+import argparse
+import datetime
+import importlib
+import json
+import platform
+import subprocess
+import sys
+from typing import Dict, Iterable, Optional
+
+BENCHMARKS = (
+    "decode",
+    "crc",
+    "batch",
+    "socket",
+    "memory",
+    "serialize",
+    "polling",
+    "logging",
+    "import",
+    "capture",
+)
+# Iteration arguments that keep each benchmark to a fraction of a second.
+QUICK_ARGUMENTS = {
+    "decode": {"number": 200},
+    "crc": {"count": 2000},
+    "batch": {"count": 500},
+    "socket": {"count": 1000},
+    "memory": {"count": 500},
+    "serialize": {"number": 512},
+    "polling": {"count": 40},
+    "logging": {"number": 200},
+    "import": {"repeat": 3},
+    "capture": {"count": 2000},
+}
+
+
+def current_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            capture_output=True,
+            check=True,
+            text=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(names: Iterable[str] = BENCHMARKS, quick: bool = False) -> Dict:
+    """
+    Runs the named benchmarks.
+
+    A benchmark whose optional dependency is missing is listed under
+    `skipped` rather than failing the whole run.
+    """
+    results: Dict[str, Dict[str, float]] = {}
+    skipped: Dict[str, str] = {}
+    for name in names:
+        try:
+            module = importlib.import_module("benchmarks.bench_%s" % name)
+            results[name] = module.run(**(QUICK_ARGUMENTS[name] if quick else {}))
+        except ImportError as error:
+            skipped[name] = str(error)
+    return {
+        "commit": current_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "created_at": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "quick": quick,
+        "results": results,
+        "skipped": skipped,
+    }
+
+
+def compare(current: Dict, baseline: Dict) -> Iterable[str]:
+    """Lines showing each metric against the baseline's."""
+    for name, metrics in current["results"].items():
+        for metric, value in metrics.items():
+            before = baseline.get("results", {}).get(name, {}).get(metric)
+            if before:
+                yield "%s.%s: %.3f -> %.3f (%.2fx)" % (
+                    name,
+                    metric,
+                    before,
+                    value,
+                    value / before,
+                )
+            else:
+                yield "%s.%s: %.3f" % (name, metric, value)
+
+
+def main(argv: Optional[Iterable[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Run the benchmark suite.")
+    parser.add_argument("benchmarks", nargs="*", help=", ".join(BENCHMARKS))
+    parser.add_argument("--output", help="Write the results to this JSON file.")
+    parser.add_argument("--compare", help="A JSON results file to compare with.")
+    parser.add_argument("--quick", action="store_true")
+    args = parser.parse_args(argv)
+    unknown = set(args.benchmarks) - set(BENCHMARKS)
+    if unknown:
+        parser.error("unknown benchmarks: %s" % ", ".join(sorted(unknown)))
+
+    results = run(args.benchmarks or BENCHMARKS, args.quick)
+    if args.output:
+        with open(args.output, "w") as output_file:
+            json.dump(results, output_file, indent=2, sort_keys=True)
+    baseline = {}
+    if args.compare:
+        with open(args.compare) as baseline_file:
+            baseline = json.load(baseline_file)
+    for line in compare(results, baseline):
+        print(line)
+    for name, reason in results["skipped"].items():
+        print("%s: skipped (%s)" % (name, reason), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
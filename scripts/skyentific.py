@@ -1,12 +1,34 @@
 import argparse
+import asyncio
 import datetime
 import json
 import logging
 import socket
+import sys
+import time
 
-from skyentific import get_current_condition
+from skyentific import get_current_condition, stream_loop
+from skyentific.aio import DEFAULT_TIMEOUT
+from skyentific.connection import DEFAULT_RECONNECT_DELAYS
+from skyentific.exceptions import (
+    BadCRC,
+    NotAcknowledged,
+    SkyentificError,
+    UnknownResponseCode,
+)
+from skyentific.fleet import (
+    DEFAULT_INTERVAL,
+    DEFAULT_MAX_CONCURRENCY,
+    FleetPoller,
+    Station,
+)
 from skyentific.models import StationObservation
-from skyentific.utils import connect
+from skyentific.serialize import record_encoder
+from skyentific.utils import connect, crc16, wake_up
+
+# LOOP packets arrive about every two seconds, so allow a few to go missing
+# before treating the connection as dead.
+WATCH_TIMEOUT = 10.0
 
 
 def configure_logging(verbose: bool, quiet: bool):
@@ -27,22 +49,220 @@ def configure_logging(verbose: bool, quiet: bool):
     )
 
 
-def main():
+def watch(host, port, interval, count, output=None, sleep=time.sleep):
+    """
+    Streams observations over one connection as NDJSON.
+
+    Writes at most one observation per `interval` seconds (every packet when
+    it is 0), stopping after `count` observations if given. Packets with a
+    bad CRC, or with a field that does not decode, are skipped, and a
+    dropped connection is reopened after the reconnect delays.
+    """
+    output = output or sys.stdout.buffer
+    encode = record_encoder()
+    written = 0
+    failures = 0
+    last_written_at = None
+    while count is None or written < count:
+        sock = None
+        try:
+            sock = connect(host, port, socket.socket)
+            sock.settimeout(WATCH_TIMEOUT)
+            wake_up(sock)
+            for packet in stream_loop(sock):
+                failures = 0
+                if crc16(packet) != 0:
+                    logging.warning("Skipping a LOOP packet with a bad CRC.")
+                    continue
+                now = time.monotonic()
+                if last_written_at is not None and now - last_written_at < interval:
+                    continue
+                try:
+                    observation = StationObservation.init_with_bytes(packet)
+                except ValueError as e:
+                    logging.warning(
+                        "Skipping a LOOP packet that does not decode: %s", e
+                    )
+                    continue
+                last_written_at = now
+                output.write(encode(observation) + b"\n")
+                output.flush()
+                written += 1
+                if count is not None and written >= count:
+                    break
+        except (
+            BadCRC,
+            NotAcknowledged,
+            UnknownResponseCode,
+            SkyentificError,
+            OSError,
+        ) as e:
+            delay = DEFAULT_RECONNECT_DELAYS[
+                min(failures, len(DEFAULT_RECONNECT_DELAYS) - 1)
+            ]
+            failures += 1
+            logging.error("Error: %s, reconnecting in %.1fs", e, delay)
+            sleep(delay)
+        finally:
+            if sock is not None:
+                sock.close()
+    return written
+
+
+def read_stations_file(path):
+    """The `host:port` addresses in a file, one per line, `#` for comments."""
+    with open(path) as stations_file:
+        lines = (line.split("#", 1)[0].strip() for line in stations_file)
+        return [line for line in lines if line]
+
+
+def station_result(station, observation, error, encode):
+    """One JSON line for a station's poll, tagged with its address."""
+    if error is None:
+        return b'{"station":%s,"ok":true,"observation":%s}\n' % (
+            json.dumps(station.address).encode(),
+            encode(observation),
+        )
+    result = {
+        "station": station.address,
+        "ok": False,
+        "error": type(error).__name__,
+        "message": str(error),
+    }
+    return json.dumps(result, separators=(",", ":")).encode() + b"\n"
+
+
+def poll_stations(stations, workers, output=None):
+    """
+    Polls every station once, concurrently, writing one line per station.
+
+    Returns the number of stations that failed.
+    """
+    output = output or sys.stdout.buffer
+    encode = record_encoder()
+    results = asyncio.run(FleetPoller(stations, workers).poll_all())
+    for station, observation, error in results:
+        output.write(station_result(station, observation, error, encode))
+    output.flush()
+    return sum(1 for _, _, error in results if error is not None)
+
+
+def watch_stations(stations, workers, count, output=None):
+    """Polls every station on its interval, writing one line per poll."""
+    output = output or sys.stdout.buffer
+    encode = record_encoder()
+
+    def write(station, observation=None, error=None):
+        output.write(station_result(station, observation, error, encode))
+        output.flush()
+
+    poller = FleetPoller(
+        stations,
+        workers,
+        on_observation=write,
+        on_error=lambda station, error: write(station, error=error),
+    )
+    asyncio.run(poller.run(count))
+
+
+def main(argv=None):
     parser = argparse.ArgumentParser(
         description="Retrieve current weather conditions from a Skyentific IP Logger."
     )
     parser.add_argument(
-        "host", help="The hostname or IP address of the Skyentific IP Logger."
+        "host",
+        nargs="?",
+        help="The hostname or IP address of the Skyentific IP Logger.",
+    )
+    parser.add_argument(
+        "port", type=int, nargs="?", help="The port number to connect to."
+    )
+    parser.add_argument(
+        "--station",
+        action="append",
+        default=[],
+        metavar="HOST:PORT",
+        help="A logger to poll; repeat to poll several concurrently.",
+    )
+    parser.add_argument(
+        "--stations-file",
+        help="A file of loggers to poll, one HOST:PORT per line.",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=DEFAULT_MAX_CONCURRENCY,
+        help="With several stations, how many to poll at once.",
+    )
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        default=DEFAULT_TIMEOUT,
+        help="With several stations, seconds allowed for each network call.",
     )
-    parser.add_argument("port", type=int, help="The port number to connect to.")
     parser.add_argument("--verbose", action="store_true", help="Enable verbose output.")
     parser.add_argument(
         "--quiet", action="store_true", help="Enable quiet mode (only error messages)."
     )
-    args = parser.parse_args()
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Keep one connection open and write one JSON line per observation.",
+    )
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=0.0,
+        help="With --watch, write at most one observation per this many seconds.",
+    )
+    parser.add_argument(
+        "--count",
+        type=int,
+        help="With --watch, stop after this many observations.",
+    )
+    args = parser.parse_args(argv)
 
     configure_logging(args.verbose, args.quiet)
 
+    addresses = list(args.station)
+    if args.stations_file:
+        addresses += read_stations_file(args.stations_file)
+    if args.host is not None and args.port is None:
+        parser.error("a port is needed with the host")
+    if not addresses and args.host is None:
+        parser.error("give a host and port, --station or --stations-file")
+
+    if addresses:
+        if args.host is not None:
+            addresses.insert(0, "%s:%d" % (args.host, args.port))
+        try:
+            stations = [
+                Station.parse(
+                    address,
+                    interval=args.interval or DEFAULT_INTERVAL,
+                    timeout=args.timeout,
+                )
+                for address in addresses
+            ]
+        except ValueError as e:
+            parser.error(str(e))
+        if args.watch:
+            try:
+                watch_stations(stations, args.workers, args.count)
+            except KeyboardInterrupt:
+                pass
+            return
+        if poll_stations(stations, args.workers):
+            exit(1)
+        return
+
+    if args.watch:
+        try:
+            watch(args.host, args.port, args.interval, args.count)
+        except KeyboardInterrupt:
+            pass
+        return
+
     try:
         sock = connect(args.host, args.port, socket.socket)
         observation = get_current_condition(sock, StationObservation.init_with_bytes)
@@ -6,8 +6,10 @@ Tools for retrieving the current conditions from a Davis Skyentific IP Logger
 import logging
 import socket
 import time
+from typing import Callable, Iterator, Optional, Union
 
 # Skyentific Code
+from . import metrics, trace
 from .exceptions import (
     BadCRC,
     NotAcknowledged,
@@ -15,16 +17,34 @@ from .exceptions import (
     StopTrying,
     SkyentificError,
 )
-from .models import StationObservation
-from .utils import receive_data, request
+from .models import Loop2Record, LoopRecord, StationObservation, decode_record
+from .retry import RetryPolicy, RetryStats
+from .utils import PacketReader, crc16, drain, receive_exactly, request, wake_up
 
 LOOP_COMMAND = b"LOOP %d\n"
+# LPS takes a bit mask of packet types (1 = LOOP, 2 = LOOP2) and a count.
+LPS_COMMAND = b"LPS %d %d\n"
+LPS_LOOP = 1
+LPS_LOOP2 = 2
+LPS_LOOP_AND_LOOP2 = LPS_LOOP | LPS_LOOP2
 LOOP_RECORD_SIZE_BYTES = 99
 LOOP_RECORD_SIZE_BITS = LOOP_RECORD_SIZE_BYTES * 8
+# Packets requested per LOOP command when streaming.
+LOOP_STREAM_PACKETS = 100
 
 logger = logging.getLogger(__name__)
 
 
+def receive_loop_record(sock: socket.socket) -> bytes:
+    """
+    Receives exactly one LOOP record from the socket.
+
+    Never reads past the end of the record, so packets that follow it on
+    the same connection are left for the next call.
+    """
+    return bytes(receive_exactly(sock, LOOP_RECORD_SIZE_BYTES))
+
+
 def get_current(sock: socket.socket) -> bytes:
     """
     Gets the current readings on the device.
@@ -42,58 +62,270 @@ def get_current(sock: socket.socket) -> bytes:
     - UnknownResponseCode: If the loop command receives an unknown response code.
     - socket.timeout: If a socket timeout occurs while issuing the loop command.
     """
-    loop_data = b""
-    logger.debug("Attempting to get current conditions.")
+    registry = metrics.active
+    traced = False
+    if registry is not None or trace.stations:
+        station = metrics.station_label(sock)
+        traced = trace.is_traced(station)
+        started_at = time.perf_counter()
     try:
         try:
             request(sock, LOOP_COMMAND % 1)
-            logger.debug("Loop command issued successfully.")
         except (BadCRC, NotAcknowledged, UnknownResponseCode) as e:
             logger.exception("Could not issue loop command: %s", str(e))
+            if registry is not None:
+                registry.count_error(station, e)
+            if traced:
+                trace.event(station, "error", phase="request", error=repr(e))
             raise
-        while len(loop_data) != LOOP_RECORD_SIZE_BYTES:
-            data = receive_data(sock)
-            loop_data += data
-            logger.debug(
-                f"Data received: {len(data)} bytes, loop data is {len(loop_data)} of {LOOP_RECORD_SIZE_BYTES} bytes."
-            )
-        logger.info("Loop data received successfully.")
+        if registry is not None or traced:
+            acknowledged_at = time.perf_counter()
+            if registry is not None:
+                registry.observe("request", acknowledged_at - started_at, station)
+            if traced:
+                trace.event(
+                    station, "acknowledged", seconds=acknowledged_at - started_at
+                )
+        loop_data = receive_loop_record(sock)
+        if registry is not None or traced:
+            elapsed = time.perf_counter() - acknowledged_at
+            if registry is not None:
+                registry.observe("receive", elapsed, station)
+            if traced:
+                trace.event(
+                    station,
+                    "received",
+                    seconds=elapsed,
+                    size=len(loop_data),
+                    crc_ok=crc16(loop_data) == 0,
+                )
     except socket.error as socket_error:
+        if registry is not None:
+            registry.count_error(station, socket_error)
+        if traced:
+            trace.event(station, "error", phase="receive", error=repr(socket_error))
         logger.exception(
-            f"Could not issue loop command due to socket error: {str(socket_error)}"
+            "Could not issue loop command due to socket error: %s", socket_error
         )
-        raise NotAcknowledged()
-    logger.debug("Returning loop data.")
+        raise NotAcknowledged() from socket_error
     return loop_data
 
 
+def stream_records(
+    sock: socket.socket,
+    make_command: Callable[[int], bytes],
+    count: Optional[int] = None,
+    packets_per_command: int = LOOP_STREAM_PACKETS,
+    initialization_function: Optional[callable] = None,
+) -> Iterator:
+    """
+    Streams 99 byte records from the device.
+
+    Issues `make_command(N)` once and yields each record as the console
+    sends it, re-issuing the command when N records have been received.
+    Parameters, yields and raises as for `stream_loop`.
+    """
+    reader = PacketReader(sock, LOOP_RECORD_SIZE_BYTES)
+    remaining = count
+    while remaining is None or remaining > 0:
+        packets = packets_per_command
+        if remaining is not None:
+            packets = min(packets, remaining)
+            remaining -= packets
+        command = make_command(packets)
+        try:
+            request(sock, command)
+        except socket.error as socket_error:
+            logger.exception(
+                "Could not issue loop command due to socket error: %s", socket_error
+            )
+            raise NotAcknowledged() from socket_error
+        logger.debug("Issued %r.", command)
+        for _ in range(packets):
+            try:
+                loop_data = reader.read()
+            except socket.error as socket_error:
+                logger.exception(
+                    "Could not receive loop data due to socket error: %s",
+                    socket_error,
+                )
+                raise NotAcknowledged() from socket_error
+            if initialization_function is None:
+                yield bytes(loop_data)
+            else:
+                yield initialization_function(loop_data)
+
+
+def stream_loop(
+    sock: socket.socket,
+    count: Optional[int] = None,
+    packets_per_command: int = LOOP_STREAM_PACKETS,
+    initialization_function: Optional[callable] = None,
+) -> Iterator[Union[bytes, StationObservation]]:
+    """
+    Streams LOOP records from the device.
+
+    Issues `LOOP N` once and yields each record as the console sends it,
+    roughly every two seconds, re-issuing the command when N is exhausted.
+
+    Parameters:
+    - sock (socket.socket): A connected socket.
+    - count (int): Total records to yield, or None to stream forever.
+    - packets_per_command (int): The N sent with each LOOP command.
+    - initialization_function (callable): Optional decoder applied to each
+      record, e.g. `StationObservation.init_with_bytes`. It is handed a
+      memoryview of a buffer that is reused for the next record, so it must
+      not keep a reference to it.
+
+    Yields:
+    - bytes: Each record, or the decoded record if a decoder was given.
+
+    Raises:
+    - BadCRC: If the loop command fails due to a bad CRC.
+    - NotAcknowledged: If the loop command fails to be acknowledged or a
+      socket error occurs.
+    - UnknownResponseCode: If the loop command receives an unknown response code.
+    """
+    return stream_records(
+        sock,
+        lambda packets: LOOP_COMMAND % packets,
+        count,
+        packets_per_command,
+        initialization_function,
+    )
+
+
+def stream_lps(
+    sock: socket.socket,
+    count: Optional[int] = None,
+    packets_per_command: int = LOOP_STREAM_PACKETS,
+    initialization_function: Optional[callable] = decode_record,
+    packet_types: int = LPS_LOOP_AND_LOOP2,
+) -> Iterator[Union[bytes, LoopRecord, Loop2Record]]:
+    """
+    Streams LOOP and LOOP2 records with the `LPS` command.
+
+    With the default `packet_types` the console alternates LOOP and LOOP2
+    records, giving the full sensor picture from one command. Records are
+    decoded with `decode_record` unless another `initialization_function`
+    (or None, for raw bytes) is given. Otherwise as for `stream_loop`.
+    """
+    return stream_records(
+        sock,
+        lambda packets: LPS_COMMAND % (packet_types, packets),
+        count,
+        packets_per_command,
+        initialization_function,
+    )
+
+
+def recover(
+    sock: socket.socket,
+    reconnect: Optional[Callable[[], socket.socket]] = None,
+) -> socket.socket:
+    """
+    Readies a connection for another attempt after a failed one.
+
+    With `reconnect` the socket is closed and replaced by a new one.
+    Otherwise the bytes left over from the failed attempt, such as the
+    rest of a LOOP record that timed out, are discarded and the console is
+    woken again. Raises ConnectionError if the logger has closed the
+    connection, as no retry on it can succeed.
+    """
+    if reconnect is not None:
+        sock.close()
+        return reconnect()
+    if not drain(sock):
+        raise ConnectionError("The logger closed the connection.")
+    wake_up(sock)
+    return sock
+
+
 def get_current_condition(
-    sock: socket.socket, initialization_function: callable, delay_function=callable
+    sock: socket.socket,
+    initialization_function: callable,
+    delay_function: Optional[callable] = None,
+    retry_policy: Optional[RetryPolicy] = None,
+    retry_stats: Optional[RetryStats] = None,
+    reconnect: Optional[Callable[[], socket.socket]] = None,
 ) -> StationObservation:
-    """Obtains the current conditions."""
-    keep_trying = True
-    while keep_trying:
+    """
+    Obtains the current conditions.
+
+    Failed attempts are retried by `retry_policy` when given, recording
+    attempts and time spent in `retry_stats`. Otherwise `delay_function` is
+    called between attempts until it raises StopTrying, and without either
+    the first failure is final. Before each retry the connection is
+    drained and the console woken, or, when `reconnect` is given, a new
+    socket is opened with it. A connection the logger has closed ends the
+    retries.
+    """
+    registry = metrics.active
+    station = metrics.station_label(sock) if registry is not None else None
+    if retry_policy is not None:
+        if retry_stats is None and registry is not None:
+            retry_stats = RetryStats()
+        attempts_before = retry_stats.attempts if retry_stats is not None else 0
+        attempted = False
+
+        def attempt() -> bytes:
+            nonlocal sock, attempted
+            if attempted:
+                sock = recover(sock, reconnect)
+            attempted = True
+            return get_current(sock)
+
         try:
-            current_bytes = get_current(sock)
-            keep_trying = False
+            current_bytes = retry_policy.call(attempt, retry_stats)
+        except (BadCRC, NotAcknowledged, UnknownResponseCode, OSError):
+            logger.warning("Retries exhausted, could not get current conditions.")
+            raise SkyentificError("Could not get current conditions.")
+        finally:
             sock.close()
-        except (BadCRC, NotAcknowledged, UnknownResponseCode):
-            # Wait a little and try again.
-            logger.warning("Bad CRC, Not Acknowledged, or Unknown Response Code")
-            if delay_function is not None:
-                logger.info("Trying again with: %s", delay_function)
-                try:
-                    delay_function()
-                except StopTrying:
-                    logger.warning(f"StopTrying exception caught. Exiting loop.")
-                    sock.close()
-                    raise SkyentificError("Could not get current conditions.")
-            else:
-                logger.debug("No delay function provided.")
+            if registry is not None:
+                retries = retry_stats.attempts - attempts_before - 1
+                if retries > 0:
+                    registry.count_retry(station, retries)
+    else:
+        keep_trying = True
+        attempted = False
+        while keep_trying:
+            try:
+                if attempted:
+                    sock = recover(sock, reconnect)
+                attempted = True
+                current_bytes = get_current(sock)
+                keep_trying = False
+                sock.close()
+            except OSError as e:
+                logger.warning("Could not get current conditions: %r", e)
+                sock.close()
                 raise SkyentificError("Could not get current conditions.")
+            except (BadCRC, NotAcknowledged, UnknownResponseCode):
+                # Wait a little and try again.
+                logger.warning("Bad CRC, Not Acknowledged, or Unknown Response Code")
+                if delay_function is not None:
+                    logger.info("Trying again with: %s", delay_function)
+                    try:
+                        delay_function()
+                        if registry is not None:
+                            registry.count_retry(station)
+                    except StopTrying:
+                        logger.warning("StopTrying exception caught. Exiting loop.")
+                        sock.close()
+                        raise SkyentificError("Could not get current conditions.")
+                else:
+                    logger.debug("No delay function provided.")
+                    raise SkyentificError("Could not get current conditions.")
+    if registry is not None:
+        started_at = time.perf_counter()
     try:
         condition = initialization_function(current_bytes)
     except Exception as e:
         logger.exception("Initialization function failed.")
+        if registry is not None:
+            registry.count_error(station, e)
         raise SkyentificError("Could not initialize current conditions.")
+    if registry is not None:
+        registry.observe("decode", time.perf_counter() - started_at, station)
     return condition
@@ -0,0 +1,191 @@
+"""
+An asyncio client for Davis Skyentific IP Loggers.
+
+Uses asyncio streams with a timeout on every call, so one event loop can
+poll many loggers concurrently without blocking threads.
+"""
+
+# Standard Library
+import asyncio
+import logging
+import time
+from typing import Optional
+
+# Skyentific Code
+from . import LOOP_COMMAND, LOOP_RECORD_SIZE_BYTES, metrics, trace
+from .exceptions import (
+    BadCRC,
+    NotAcknowledged,
+    UnknownResponseCode,
+    SkyentificError,
+)
+from .models import StationObservation
+from .utils import RESPONSE_CODE_SIZE, check_response_code, crc16
+
+DEFAULT_TIMEOUT = 2.0
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncWeatherLinkClient(object):
+    """
+    A connection to one IP logger.
+
+    Use it as an async context manager, or call `connect` and `close`:
+
+        async with AsyncWeatherLinkClient(host, port) as client:
+            observation = await client.get_current_condition()
+    """
+
+    def __init__(self, host: str, port: int, timeout: float = DEFAULT_TIMEOUT):
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self.reader: Optional[asyncio.StreamReader] = None
+        self.writer: Optional[asyncio.StreamWriter] = None
+
+    @property
+    def station(self) -> str:
+        """The `host:port` label used by metrics and tracing."""
+        return "%s:%s" % (self.host, self.port)
+
+    @property
+    def connected(self) -> bool:
+        return self.writer is not None and not self.writer.is_closing()
+
+    async def __aenter__(self) -> "AsyncWeatherLinkClient":
+        await self.connect()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    async def connect(self) -> None:
+        """Connects to the logger."""
+        logger.info("Connecting to %s:%s", self.host, self.port)
+        registry = metrics.active
+        if registry is None and not trace.stations:
+            self.reader, self.writer = await asyncio.wait_for(
+                asyncio.open_connection(self.host, self.port), self.timeout
+            )
+            return
+        station = self.station
+        traced = trace.is_traced(station)
+        started_at = time.perf_counter()
+        try:
+            self.reader, self.writer = await asyncio.wait_for(
+                asyncio.open_connection(self.host, self.port), self.timeout
+            )
+        except (OSError, asyncio.TimeoutError) as error:
+            if registry is not None:
+                registry.count_error(station, error)
+            if traced:
+                trace.event(station, "error", phase="connect", error=repr(error))
+            raise
+        finally:
+            elapsed = time.perf_counter() - started_at
+            if registry is not None:
+                registry.observe("connect", elapsed, station)
+        if traced:
+            trace.event(station, "connected", seconds=elapsed)
+
+    async def close(self) -> None:
+        """Closes the connection, if open."""
+        writer, self.reader, self.writer = self.writer, None, None
+        if writer is None:
+            return
+        writer.close()
+        try:
+            await asyncio.wait_for(writer.wait_closed(), self.timeout)
+        except (OSError, asyncio.TimeoutError):
+            logger.debug("Connection to %s:%s closed uncleanly.", self.host, self.port)
+
+    async def receive_exactly(self, size: int) -> bytes:
+        """Receives exactly `size` bytes within the timeout."""
+        return await asyncio.wait_for(self.reader.readexactly(size), self.timeout)
+
+    async def request(self, body: bytes) -> None:
+        """Sends a request and checks the response code."""
+        self.writer.write(body)
+        await asyncio.wait_for(self.writer.drain(), self.timeout)
+        response = await self.receive_exactly(RESPONSE_CODE_SIZE)
+        check_response_code(response[0])
+
+    async def get_current(self) -> bytes:
+        """
+        Gets the current readings on the device, connecting if needed.
+
+        Raises:
+        - BadCRC: If the loop command fails due to a bad CRC.
+        - NotAcknowledged: If the loop command fails to be acknowledged, or
+          the connection fails or times out.
+        - UnknownResponseCode: If the loop command receives an unknown response code.
+        """
+        if not self.connected:
+            try:
+                await self.connect()
+            except (OSError, asyncio.TimeoutError) as e:
+                logger.exception("Could not connect: %r", e)
+                await self.close()
+                raise NotAcknowledged() from e
+        registry = metrics.active
+        traced = False
+        if registry is not None or trace.stations:
+            station = self.station
+            traced = trace.is_traced(station)
+            started_at = time.perf_counter()
+        try:
+            try:
+                await self.request(LOOP_COMMAND % 1)
+            except (BadCRC, NotAcknowledged, UnknownResponseCode) as e:
+                logger.exception("Could not issue loop command: %s", str(e))
+                if registry is not None:
+                    registry.count_error(station, e)
+                if traced:
+                    trace.event(station, "error", phase="request", error=repr(e))
+                raise
+            if registry is not None or traced:
+                acknowledged_at = time.perf_counter()
+                if registry is not None:
+                    registry.observe("request", acknowledged_at - started_at, station)
+                if traced:
+                    trace.event(
+                        station, "acknowledged", seconds=acknowledged_at - started_at
+                    )
+            loop_data = await self.receive_exactly(LOOP_RECORD_SIZE_BYTES)
+            if registry is not None or traced:
+                elapsed = time.perf_counter() - acknowledged_at
+                if registry is not None:
+                    registry.observe("receive", elapsed, station)
+                if traced:
+                    trace.event(
+                        station,
+                        "received",
+                        seconds=elapsed,
+                        size=len(loop_data),
+                        crc_ok=crc16(loop_data) == 0,
+                    )
+        except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError) as e:
+            logger.exception("Could not issue loop command: %r", e)
+            if registry is not None:
+                registry.count_error(station, e)
+            if traced:
+                trace.event(station, "error", phase="receive", error=repr(e))
+            await self.close()
+            raise NotAcknowledged() from e
+        return loop_data
+
+    async def get_current_condition(
+        self, initialization_function: callable = StationObservation.init_with_bytes
+    ) -> StationObservation:
+        """Obtains the current conditions."""
+        try:
+            current_bytes = await self.get_current()
+        except (BadCRC, NotAcknowledged, UnknownResponseCode):
+            logger.warning("Bad CRC, Not Acknowledged, or Unknown Response Code")
+            raise SkyentificError("Could not get current conditions.")
+        try:
+            return initialization_function(current_bytes)
+        except Exception:
+            logger.exception("Initialization function failed.")
+            raise SkyentificError("Could not initialize current conditions.")
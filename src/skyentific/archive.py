@@ -0,0 +1,298 @@
+"""
+Downloading archive records with `DMPAFT`.
+
+The console keeps 52 byte archive records in 267 byte pages: a sequence
+number, five records, four unused bytes and a CRC. `download_archive`
+requests every record after a timestamp, checks each page's CRC and asks
+for bad pages again, and collects the new records into one buffer that
+`decode_archive_records` turns into columns without building a Python
+object per record. `ArchiveFile` keeps the raw records on disk so a
+download can resume from the last stored record.
+"""
+
+# Standard Library
+import datetime
+import logging
+import os
+import socket
+from typing import Dict, Iterator, Optional, Tuple
+
+# Skyentific Code
+from .exceptions import BadCRC
+from .models import compile_layout, layout_dtype, layout_offsets, require_numpy
+from .utils import (
+    ACKNOWLEDGED_RESPONSE_CODE,
+    NACK_RESPONSE_CODE,
+    PacketReader,
+    crc16,
+    receive_exactly,
+    request,
+)
+
+DUMP_AFTER_COMMAND = b"DMPAFT\n"
+CANCEL_CODE = 0x1B
+
+ARCHIVE_RECORD_SIZE_BYTES = 52
+ARCHIVE_RECORDS_PER_PAGE = 5
+# Sequence number, five records and four unused bytes, then a CRC.
+ARCHIVE_PAGE_SIZE_BYTES = (
+    1 + ARCHIVE_RECORDS_PER_PAGE * ARCHIVE_RECORD_SIZE_BYTES + 4 + 2
+)
+ARCHIVE_HEADER_SIZE_BYTES = 6
+MAX_PAGE_ATTEMPTS = 3
+# Date stamp of a record slot that has never been written.
+EMPTY_RECORD_STAMP = 0xFFFF
+
+# Field name and `struct` format of every field in a Rev B archive record.
+ARCHIVE_RECORD_LAYOUT: Tuple[Tuple[str, str], ...] = (
+    ("date_stamp", "H"),
+    ("time_stamp", "H"),
+    ("outside_temperature", "h"),
+    ("high_outside_temperature", "h"),
+    ("low_outside_temperature", "h"),
+    ("rainfall", "H"),
+    ("high_rain_rate", "H"),
+    ("barometer", "H"),
+    ("solar_radiation", "H"),
+    ("wind_samples", "H"),
+    ("inside_temperature", "h"),
+    ("inside_humidity", "B"),
+    ("outside_humidity", "B"),
+    ("average_wind_speed", "B"),
+    ("high_wind_speed", "B"),
+    ("high_wind_speed_direction", "B"),
+    ("prevailing_wind_direction", "B"),
+    ("average_uv_index", "B"),
+    ("et", "B"),
+    ("high_solar_radiation", "H"),
+    ("high_uv_index", "B"),
+    ("forecast_rule_number", "B"),
+    ("leaf_temperatures", "2s"),
+    ("leaf_wetnesses", "2s"),
+    ("soil_temperatures", "4s"),
+    ("record_type", "B"),
+    ("extra_humidities", "2s"),
+    ("extra_temperatures", "3s"),
+    ("soil_moistures", "4s"),
+)
+
+ARCHIVE_RECORD_STRUCT = compile_layout(ARCHIVE_RECORD_LAYOUT)
+ARCHIVE_RECORD_OFFSETS = layout_offsets(ARCHIVE_RECORD_LAYOUT)
+
+logger = logging.getLogger(__name__)
+
+
+def pack_date_stamp(timestamp: datetime.datetime) -> Tuple[int, int]:
+    """Packs a timestamp into the console's date stamp and time stamp."""
+    date_stamp = timestamp.day + timestamp.month * 32 + (timestamp.year - 2000) * 512
+    time_stamp = timestamp.hour * 100 + timestamp.minute
+    return date_stamp, time_stamp
+
+
+def unpack_date_stamp(date_stamp: int, time_stamp: int) -> datetime.datetime:
+    """Converts a date stamp and time stamp back into a naive datetime."""
+    return datetime.datetime(
+        (date_stamp >> 9) + 2000,
+        (date_stamp >> 5) & 0x0F,
+        date_stamp & 0x1F,
+        time_stamp // 100,
+        time_stamp % 100,
+    )
+
+
+def record_stamp(record: bytes) -> Tuple[int, int]:
+    """The (date stamp, time stamp) of a raw archive record, for ordering."""
+    return (
+        int.from_bytes(record[0:2], "little"),
+        int.from_bytes(record[2:4], "little"),
+    )
+
+
+def dump_after_body(since: Optional[datetime.datetime]) -> bytes:
+    """The timestamp and CRC sent after `DMPAFT`, zero for every record."""
+    date_stamp, time_stamp = pack_date_stamp(since) if since else (0, 0)
+    body = date_stamp.to_bytes(2, "little") + time_stamp.to_bytes(2, "little")
+    return body + crc16(body).to_bytes(2, "big")
+
+
+def iter_archive_pages(
+    sock: socket.socket,
+    since: Optional[datetime.datetime] = None,
+    max_page_attempts: int = MAX_PAGE_ATTEMPTS,
+) -> Iterator[bytes]:
+    """
+    Downloads archive pages after `since`, yielding the new records of each.
+
+    Each yielded value holds whole 52 byte records: the records before the
+    first new one and never written slots are left out. A page with a bad
+    CRC is requested again up to `max_page_attempts` times before BadCRC
+    is raised. The download is cancelled if the generator is not finished.
+
+    Raises:
+    - BadCRC: If a page or the header keeps failing its CRC.
+    - NotAcknowledged: If the console refuses the command.
+    - UnknownResponseCode: If the console sends an unknown response code.
+    """
+    request(sock, DUMP_AFTER_COMMAND)
+    request(sock, dump_after_body(since))
+    header = receive_exactly(sock, ARCHIVE_HEADER_SIZE_BYTES)
+    if crc16(header) != 0:
+        sock.sendall(bytes((CANCEL_CODE,)))
+        raise BadCRC("Archive header failed its CRC check.")
+    pages = int.from_bytes(header[0:2], "little")
+    first_record = int.from_bytes(header[2:4], "little")
+    logger.info("Downloading %d archive pages.", pages)
+    since_stamp = pack_date_stamp(since) if since else (0, 0)
+
+    reader = PacketReader(sock, ARCHIVE_PAGE_SIZE_BYTES)
+    finished = False
+    try:
+        for page_number in range(pages):
+            prompt = ACKNOWLEDGED_RESPONSE_CODE
+            for attempt in range(max_page_attempts):
+                sock.sendall(bytes((prompt,)))
+                page = reader.read()
+                if crc16(page) == 0:
+                    break
+                logger.warning(
+                    "Archive page %d failed its CRC check, attempt %d.",
+                    page_number,
+                    attempt + 1,
+                )
+                prompt = NACK_RESPONSE_CODE
+            else:
+                raise BadCRC("Archive page %d failed its CRC check." % page_number)
+            records = bytearray()
+            start = first_record if page_number == 0 else 0
+            for index in range(start, ARCHIVE_RECORDS_PER_PAGE):
+                offset = 1 + index * ARCHIVE_RECORD_SIZE_BYTES
+                record = page[offset : offset + ARCHIVE_RECORD_SIZE_BYTES]
+                stamp = record_stamp(record)
+                if stamp[0] == EMPTY_RECORD_STAMP or stamp <= since_stamp:
+                    continue
+                records += record
+            yield bytes(records)
+        finished = True
+    finally:
+        if not finished:
+            try:
+                sock.sendall(bytes((CANCEL_CODE,)))
+            except OSError:
+                pass
+
+
+def download_archive(
+    sock: socket.socket,
+    since: Optional[datetime.datetime] = None,
+    max_page_attempts: int = MAX_PAGE_ATTEMPTS,
+) -> bytes:
+    """Downloads every archive record after `since` into one buffer."""
+    return b"".join(iter_archive_pages(sock, since, max_page_attempts))
+
+
+def decode_archive_records(buffer: bytes) -> Dict[str, "numpy.ndarray"]:
+    """
+    Decodes concatenated archive records into columns.
+
+    `timestamp` is a `datetime64[m]` column built from the date and time
+    stamps. Temperatures are in degrees F and the barometer in inHg, the
+    rest are left as stored by the console.
+    """
+    numpy = require_numpy()
+    raw = numpy.frombuffer(buffer, dtype=numpy.uint8)
+    if raw.size % ARCHIVE_RECORD_SIZE_BYTES:
+        raise ValueError(
+            "Buffer should be a multiple of %d bytes in length. It is %d"
+            % (ARCHIVE_RECORD_SIZE_BYTES, raw.size)
+        )
+    records = raw.view(layout_dtype(ARCHIVE_RECORD_LAYOUT))
+    date_stamp = records["date_stamp"].astype(numpy.int64)
+    time_stamp = records["time_stamp"].astype(numpy.int64)
+    months = ((date_stamp >> 9) + 30) * 12 + ((date_stamp >> 5) & 0x0F) - 1
+    timestamp = (
+        months.astype("datetime64[M]").astype("datetime64[m]")
+        + ((date_stamp & 0x1F) - 1) * numpy.timedelta64(1, "D")
+        + (time_stamp // 100) * numpy.timedelta64(1, "h")
+        + (time_stamp % 100) * numpy.timedelta64(1, "m")
+    )
+    columns = {"timestamp": timestamp}
+    for name, field_format in ARCHIVE_RECORD_LAYOUT:
+        if field_format.endswith("s"):
+            columns[name] = records[name].copy()
+        else:
+            columns[name] = records[name].astype(numpy.int64)
+    for name in (
+        "outside_temperature",
+        "high_outside_temperature",
+        "low_outside_temperature",
+        "inside_temperature",
+    ):
+        columns[name] = records[name] / 10.0
+    columns["barometer"] = records["barometer"] / 1000.0
+    return columns
+
+
+class ArchiveFile(object):
+    """
+    An append-only file of raw archive records.
+
+    `backfill` downloads every record newer than the last one stored, so
+    after an outage the gap is filled from where the file left off.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+
+    def last_timestamp(self) -> Optional[datetime.datetime]:
+        """The timestamp of the last stored record, if any."""
+        try:
+            size = os.path.getsize(self.path)
+        except FileNotFoundError:
+            return None
+        size -= size % ARCHIVE_RECORD_SIZE_BYTES
+        if not size:
+            return None
+        with open(self.path, "rb") as archive_file:
+            archive_file.seek(size - ARCHIVE_RECORD_SIZE_BYTES)
+            record = archive_file.read(ARCHIVE_RECORD_SIZE_BYTES)
+        return unpack_date_stamp(*record_stamp(record))
+
+    def read(self) -> bytes:
+        """Every stored record, concatenated."""
+        try:
+            with open(self.path, "rb") as archive_file:
+                buffer = archive_file.read()
+        except FileNotFoundError:
+            return b""
+        return buffer[: len(buffer) - len(buffer) % ARCHIVE_RECORD_SIZE_BYTES]
+
+    def backfill(
+        self, sock: socket.socket, max_page_attempts: int = MAX_PAGE_ATTEMPTS
+    ) -> int:
+        """
+        Appends every record newer than the last stored one.
+
+        Pages are written as they arrive, so an interrupted backfill keeps
+        what it downloaded, and a record left incomplete by a crash is
+        dropped before appending so the records that follow stay aligned.
+        Returns the number of records appended.
+        """
+        appended = 0
+        with open(self.path, "ab") as archive_file:
+            size = archive_file.seek(0, os.SEEK_END)
+            partial = size % ARCHIVE_RECORD_SIZE_BYTES
+            if partial:
+                logger.warning(
+                    "Dropping %d bytes of an incomplete record from %s.",
+                    partial,
+                    self.path,
+                )
+                archive_file.truncate(size - partial)
+            for records in iter_archive_pages(
+                sock, self.last_timestamp(), max_page_attempts
+            ):
+                archive_file.write(records)
+                archive_file.flush()
+                appended += len(records) // ARCHIVE_RECORD_SIZE_BYTES
+        logger.info("Appended %d archive records to %s.", appended, self.path)
+        return appended
@@ -0,0 +1,172 @@
+"""
+Caches current conditions per station and coalesces concurrent reads.
+
+The console only refreshes its readings every couple of seconds and serves
+one TCP client at a time, so callers asking for the same station within
+the TTL share the last observation, and callers arriving while a read is
+in flight wait for that read instead of opening their own connection.
+"""
+
+# Standard Library
+import asyncio
+import logging
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+DEFAULT_TTL = 2.5
+
+logger = logging.getLogger(__name__)
+
+
+class CacheStats(object):
+    """Counts how each lookup was answered."""
+
+    def __init__(self) -> None:
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.errors = 0
+
+    def to_dict(self) -> Dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "errors": self.errors,
+        }
+
+
+class _Flight(object):
+    """One read in progress, shared by every caller that waits on it."""
+
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class ObservationCache(object):
+    """
+    A thread safe cache of the latest observation of each station.
+
+    `fetch` reads a station, e.g. by connecting and calling
+    `get_current_condition`. Failed reads are not cached: everyone waiting
+    on the read gets its exception and the next lookup tries again.
+    """
+
+    def __init__(
+        self,
+        fetch: Callable[[Hashable], Any],
+        ttl: float = DEFAULT_TTL,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.fetch = fetch
+        self.ttl = ttl
+        self.clock = clock
+        self.stats = CacheStats()
+        self._entries: Dict[Hashable, Tuple[float, Any]] = {}
+        self._flights: Dict[Hashable, _Flight] = {}
+        self._lock = threading.Lock()
+
+    def get(self, station: Hashable) -> Any:
+        """The station's observation, read from the device if stale."""
+        with self._lock:
+            entry = self._entries.get(station)
+            if entry is not None and self.clock() - entry[0] < self.ttl:
+                self.stats.hits += 1
+                return entry[1]
+            flight = self._flights.get(station)
+            leader = flight is None
+            if leader:
+                flight = self._flights[station] = _Flight()
+                self.stats.misses += 1
+            else:
+                self.stats.coalesced += 1
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        try:
+            flight.result = self.fetch(station)
+        except BaseException as error:
+            flight.error = error
+            with self._lock:
+                self.stats.errors += 1
+            raise
+        else:
+            with self._lock:
+                self._entries[station] = (self.clock(), flight.result)
+            return flight.result
+        finally:
+            with self._lock:
+                del self._flights[station]
+            flight.done.set()
+
+    def invalidate(self, station: Optional[Hashable] = None) -> None:
+        """Forgets one station's observation, or every station's."""
+        with self._lock:
+            if station is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(station, None)
+
+
+class AsyncObservationCache(object):
+    """
+    The asyncio counterpart of `ObservationCache`.
+
+    `fetch` is a coroutine function, e.g. one that awaits
+    `AsyncWeatherLinkClient.get_current_condition`. Waiters share the
+    leader's task, so cancelling one waiter does not cancel the read.
+    """
+
+    def __init__(
+        self,
+        fetch: Callable[[Hashable], Awaitable[Any]],
+        ttl: float = DEFAULT_TTL,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.fetch = fetch
+        self.ttl = ttl
+        self.clock = clock
+        self.stats = CacheStats()
+        self._entries: Dict[Hashable, Tuple[float, Any]] = {}
+        self._flights: Dict[Hashable, "asyncio.Task"] = {}
+
+    async def get(self, station: Hashable) -> Any:
+        """The station's observation, read from the device if stale."""
+        entry = self._entries.get(station)
+        if entry is not None and self.clock() - entry[0] < self.ttl:
+            self.stats.hits += 1
+            return entry[1]
+        flight = self._flights.get(station)
+        if flight is None:
+            self.stats.misses += 1
+            flight = self._flights[station] = asyncio.ensure_future(self._read(station))
+        else:
+            self.stats.coalesced += 1
+        return await asyncio.shield(flight)
+
+    async def _read(self, station: Hashable) -> Any:
+        try:
+            result = await self.fetch(station)
+        except BaseException:
+            self.stats.errors += 1
+            raise
+        else:
+            self._entries[station] = (self.clock(), result)
+            return result
+        finally:
+            del self._flights[station]
+
+    def invalidate(self, station: Optional[Hashable] = None) -> None:
+        """Forgets one station's observation, or every station's."""
+        if station is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(station, None)
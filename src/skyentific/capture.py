@@ -0,0 +1,280 @@
+"""
+An append-only capture file of raw LOOP records.
+
+Each record is stored as the console sent it, in a fixed size frame with
+the time it was received and the station it came from, so a capture is
+about a third of the size of the same observations as JSON and can be
+decoded again later, with whatever decoder is current by then. Frames
+are little endian:
+
+- received at, nanoseconds since the epoch (`q`)
+- station, NUL padded UTF-8 (`station_size` bytes, 85 by default)
+- the 99 byte LOOP record
+
+after a 16 byte file header holding a magic number, the format version
+and the frame size. `CaptureWriter` appends frames, and `CaptureReader`
+memory-maps the file to iterate over records or decode them all at once
+with NumPy without copying them out of the file.
+"""
+
+# Standard Library
+import datetime
+import logging
+import mmap
+import os
+import struct
+import time
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterator, Optional, Tuple
+
+# Skyentific Code
+from .models import LOOP_RECORD_SIZE_BYTES, decode_loop_rows, require_numpy
+
+if TYPE_CHECKING:
+    import numpy
+
+CAPTURE_MAGIC = b"SKYCAP"
+CAPTURE_VERSION = 1
+# Magic number, format version and frame size, padded to 16 bytes.
+CAPTURE_HEADER_STRUCT = struct.Struct("<6sHH6x")
+CAPTURE_HEADER_SIZE_BYTES = CAPTURE_HEADER_STRUCT.size
+# Room for a host name of up to 79 bytes and a port, and makes 192 byte
+# frames.
+DEFAULT_STATION_SIZE = 85
+# Received at and the record, around the station.
+FRAME_OVERHEAD_BYTES = 8 + LOOP_RECORD_SIZE_BYTES
+
+logger = logging.getLogger(__name__)
+
+
+def frame_struct(station_size: int) -> struct.Struct:
+    """The `struct` of one frame with a `station_size` byte station."""
+    return struct.Struct("<q%ds%ds" % (station_size, LOOP_RECORD_SIZE_BYTES))
+
+
+def read_header(header: bytes) -> int:
+    """Checks a capture file header and returns its frame size."""
+    if len(header) < CAPTURE_HEADER_SIZE_BYTES:
+        raise ValueError("Not a capture file, the header is incomplete.")
+    magic, version, frame_size = CAPTURE_HEADER_STRUCT.unpack_from(header)
+    if magic != CAPTURE_MAGIC:
+        raise ValueError("Not a capture file, the magic number is %r." % magic)
+    if version != CAPTURE_VERSION:
+        raise ValueError("Unsupported capture file version %d." % version)
+    if frame_size <= FRAME_OVERHEAD_BYTES:
+        raise ValueError("Capture file frames of %d bytes are too small." % frame_size)
+    return frame_size
+
+
+class CaptureWriter(object):
+    """
+    Appends raw LOOP records to a capture file.
+
+        with CaptureWriter('station.capture') as capture:
+            for packet in stream_loop(sock):
+                capture.append(packet, '192.168.1.100:22222')
+
+    Frames go through the file's buffer, call `flush` to push them to the
+    operating system. A new file is given a header with `station_size`, an
+    existing one keeps its own, and a frame left incomplete by a crash is
+    dropped before appending so the frames that follow stay aligned. A
+    station longer than `station_size` bytes raises ValueError.
+    """
+
+    def __init__(self, path: str, station_size: int = DEFAULT_STATION_SIZE) -> None:
+        self.path = path
+        self.file = open(path, "a+b")
+        try:
+            size = self.file.seek(0, os.SEEK_END)
+            if size:
+                self.file.seek(0)
+                frame_size = read_header(self.file.read(CAPTURE_HEADER_SIZE_BYTES))
+                station_size = frame_size - FRAME_OVERHEAD_BYTES
+                partial = (size - CAPTURE_HEADER_SIZE_BYTES) % frame_size
+                if partial:
+                    logger.warning(
+                        "Dropping %d bytes of an incomplete frame from %s.",
+                        partial,
+                        path,
+                    )
+                    self.file.truncate(size - partial)
+            else:
+                self.file.write(
+                    CAPTURE_HEADER_STRUCT.pack(
+                        CAPTURE_MAGIC,
+                        CAPTURE_VERSION,
+                        station_size + FRAME_OVERHEAD_BYTES,
+                    )
+                )
+        except Exception:
+            self.file.close()
+            raise
+        self.station_size = station_size
+        self.frame = frame_struct(station_size)
+        self.buffer = bytearray(self.frame.size)
+        self.stations: Dict[str, bytes] = {}
+
+    def __enter__(self) -> "CaptureWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def encode_station(self, station: str) -> bytes:
+        """The station as stored in a frame."""
+        encoded = self.stations.get(station)
+        if encoded is None:
+            encoded = station.encode()
+            if len(encoded) > self.station_size:
+                raise ValueError(
+                    "Station %r is longer than %d bytes." % (station, self.station_size)
+                )
+            self.stations[station] = encoded
+        return encoded
+
+    def append(
+        self,
+        record: bytes,
+        station: str = "",
+        received_at_ns: Optional[int] = None,
+    ) -> None:
+        """
+        Appends one 99 byte LOOP record.
+
+        `received_at_ns` defaults to now. The record is copied into the
+        frame, so a reused buffer, such as `PacketReader`'s, is fine.
+        """
+        if len(record) != LOOP_RECORD_SIZE_BYTES:
+            raise ValueError(
+                "Records should be %d bytes in length. It is %d"
+                % (LOOP_RECORD_SIZE_BYTES, len(record))
+            )
+        if received_at_ns is None:
+            received_at_ns = time.time_ns()
+        self.frame.pack_into(
+            self.buffer, 0, received_at_ns, self.encode_station(station), record
+        )
+        self.file.write(self.buffer)
+
+    def flush(self) -> None:
+        self.file.flush()
+
+    def close(self) -> None:
+        self.file.close()
+
+
+class CaptureReader(object):
+    """
+    Reads a capture file through a read-only memory map.
+
+        with CaptureReader('station.capture') as capture:
+            columns = capture.columns()
+
+    Records are copied out of the map as `bytes`, so they outlive the
+    reader, while `frames` and `columns` read the records in place. Frames
+    appended after the reader was opened are not seen, and an incomplete
+    last frame is ignored.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        with open(path, "rb") as capture_file:
+            self.frame_size = read_header(capture_file.read(CAPTURE_HEADER_SIZE_BYTES))
+            size = os.fstat(capture_file.fileno()).st_size
+            self.count = (size - CAPTURE_HEADER_SIZE_BYTES) // self.frame_size
+            self.map = mmap.mmap(capture_file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.station_size = self.frame_size - FRAME_OVERHEAD_BYTES
+        self.frame = frame_struct(self.station_size)
+        self.stations: Dict[bytes, str] = {}
+
+    def __enter__(self) -> "CaptureReader":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __iter__(self) -> Iterator[Tuple[int, str, bytes]]:
+        for index in range(self.count):
+            yield self[index]
+
+    def __getitem__(self, index: int) -> Tuple[int, str, bytes]:
+        """The received at nanoseconds, station and record of one frame."""
+        if index < 0:
+            index += self.count
+        if not 0 <= index < self.count:
+            raise IndexError("frame index out of range")
+        received_at_ns, station, record = self.frame.unpack_from(
+            self.map, CAPTURE_HEADER_SIZE_BYTES + index * self.frame_size
+        )
+        return received_at_ns, self.decode_station(station), record
+
+    def decode_station(self, station: bytes) -> str:
+        decoded = self.stations.get(station)
+        if decoded is None:
+            decoded = self.stations[station] = station.rstrip(b"\0").decode()
+        return decoded
+
+    def replay(self, initialization_function: Callable) -> Iterator[Tuple[str, Any]]:
+        """
+        Yields the station and decoded record of every frame.
+
+        `initialization_function` is called with the record and when it was
+        received, as `observation_made_at`, e.g.
+        `StationObservation.init_with_bytes`.
+        """
+        for received_at_ns, station, record in self:
+            yield station, initialization_function(
+                record,
+                observation_made_at=datetime.datetime.fromtimestamp(
+                    received_at_ns / 1e9, datetime.timezone.utc
+                ),
+            )
+
+    def frames(self) -> "numpy.ndarray":
+        """Every frame as a structured NumPy array over the map."""
+        numpy = require_numpy()
+        frame_dtype = numpy.dtype(
+            {
+                "names": ["received_at", "station", "record"],
+                "formats": [
+                    "<i8",
+                    "S%d" % self.station_size,
+                    ("u1", (LOOP_RECORD_SIZE_BYTES,)),
+                ],
+                "offsets": [0, 8, 8 + self.station_size],
+                "itemsize": self.frame_size,
+            }
+        )
+        return numpy.frombuffer(
+            self.map,
+            dtype=frame_dtype,
+            count=self.count,
+            offset=CAPTURE_HEADER_SIZE_BYTES,
+        )
+
+    def columns(self, validate_crc: bool = True) -> Dict[str, "numpy.ndarray"]:
+        """
+        Decodes every record into columns with `decode_loop_rows`.
+
+        The records are read in place from the map. `received_at` is added
+        as `datetime64[ns]` (UTC) and `station` as byte strings.
+        """
+        frames = self.frames()
+        columns = decode_loop_rows(frames["record"], validate_crc)
+        columns["received_at"] = frames["received_at"].astype("datetime64[ns]")
+        columns["station"] = frames["station"].copy()
+        return columns
+
+    def close(self) -> None:
+        """
+        Closes the map.
+
+        While arrays from `frames` are still alive the map stays open, and
+        it is unmapped when the last of them is released.
+        """
+        try:
+            self.map.close()
+        except BufferError:
+            logger.debug("Arrays still refer to %s, leaving it mapped.", self.path)
@@ -0,0 +1,166 @@
+"""
+A long-lived connection to one IP logger.
+
+Keeps the socket open between readings, wakes the console only when it
+may have gone to sleep, and reconnects with backoff when the socket dies.
+"""
+
+# Standard Library
+import logging
+import socket
+import time
+from typing import Callable, Optional, Sequence
+
+# Skyentific Code
+from . import get_current
+from .exceptions import (
+    BadCRC,
+    NotAcknowledged,
+    UnknownResponseCode,
+    SkyentificError,
+)
+from .models import StationObservation
+from .utils import connect, drain, wake_up
+
+# Seconds without traffic after which the console is woken before a command.
+DEFAULT_IDLE_TIMEOUT = 30.0
+# Seconds to wait before each reconnect attempt.
+DEFAULT_RECONNECT_DELAYS = (0.0, 0.5, 1.0, 2.0, 4.0)
+
+logger = logging.getLogger(__name__)
+
+
+class WeatherLinkConnection(object):
+    """
+    A persistent connection to an IP logger.
+
+        with WeatherLinkConnection(host, port) as connection:
+            observation = connection.get_current_condition()
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        socket_generator: callable = socket.socket,
+        idle_timeout: float = DEFAULT_IDLE_TIMEOUT,
+        reconnect_delays: Sequence[float] = DEFAULT_RECONNECT_DELAYS,
+        sleep: Callable[[float], None] = time.sleep,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.host = host
+        self.port = port
+        self.socket_generator = socket_generator
+        self.idle_timeout = idle_timeout
+        self.reconnect_delays = tuple(reconnect_delays)
+        self.sleep = sleep
+        self.clock = clock
+        self.sock: Optional[socket.socket] = None
+        self.last_activity_at: Optional[float] = None
+        self.needs_wake_up = True
+        self.connections = 0
+
+    def __enter__(self) -> "WeatherLinkConnection":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Closes the socket, if open."""
+        sock, self.sock = self.sock, None
+        if sock is not None:
+            try:
+                sock.close()
+            except OSError:
+                pass
+        self.needs_wake_up = True
+
+    def reconnect(self) -> socket.socket:
+        """Opens a new socket and wakes the console, backing off between tries."""
+        self.close()
+        last_error = None
+        for delay in self.reconnect_delays:
+            if delay:
+                self.sleep(delay)
+            try:
+                self.sock = connect(self.host, self.port, self.socket_generator)
+                self.connections += 1
+                self.wake_up()
+                return self.sock
+            except (OSError, NotAcknowledged) as e:
+                logger.warning(
+                    "Could not connect to %s:%s: %r", self.host, self.port, e
+                )
+                last_error = e
+                self.close()
+        raise SkyentificError(
+            "Could not connect to %s:%s" % (self.host, self.port)
+        ) from last_error
+
+    def wake_up(self) -> None:
+        """Wakes the console up."""
+        wake_up(self.sock)
+        self.needs_wake_up = False
+        self.last_activity_at = self.clock()
+
+    def is_idle(self) -> bool:
+        return (
+            self.last_activity_at is None
+            or self.clock() - self.last_activity_at > self.idle_timeout
+        )
+
+    def ensure_ready(self) -> socket.socket:
+        """
+        Returns a socket ready for a command.
+
+        Reconnects if there is no socket or the peer has closed it, discards
+        stale bytes, and wakes the console after a failure or when idle.
+        """
+        if self.sock is None or not drain(self.sock):
+            if self.sock is not None:
+                logger.info("Connection to %s:%s was closed.", self.host, self.port)
+            return self.reconnect()
+        if self.needs_wake_up or self.is_idle():
+            try:
+                self.wake_up()
+            except (OSError, NotAcknowledged):
+                logger.info("Wake up failed, reconnecting.")
+                return self.reconnect()
+        return self.sock
+
+    def get_current(self) -> bytes:
+        """
+        Gets the current readings, reconnecting once if the exchange fails.
+
+        Raises:
+        - BadCRC, NotAcknowledged, UnknownResponseCode: If the retry fails too.
+        - SkyentificError: If the logger cannot be reached.
+        """
+        for attempt in (1, 2):
+            sock = self.ensure_ready()
+            try:
+                current_bytes = get_current(sock)
+            except (BadCRC, NotAcknowledged, UnknownResponseCode):
+                self.needs_wake_up = True
+                if attempt == 2:
+                    raise
+                logger.info("Loop command failed, retrying.")
+                continue
+            self.last_activity_at = self.clock()
+            return current_bytes
+
+    def get_current_condition(
+        self, initialization_function: callable = StationObservation.init_with_bytes
+    ) -> StationObservation:
+        """Obtains the current conditions, keeping the connection open."""
+        try:
+            current_bytes = self.get_current()
+        except (BadCRC, NotAcknowledged, UnknownResponseCode):
+            logger.warning("Bad CRC, Not Acknowledged, or Unknown Response Code")
+            raise SkyentificError("Could not get current conditions.")
+        try:
+            return initialization_function(current_bytes)
+        except Exception:
+            logger.exception("Initialization function failed.")
+            raise SkyentificError("Could not initialize current conditions.")
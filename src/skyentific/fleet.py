@@ -0,0 +1,217 @@
+"""
+Polls many IP loggers from one process.
+
+Each station runs on its own schedule, with start times spread across the
+first interval, while a semaphore bounds how many polls are in flight.
+"""
+
+# Standard Library
+import asyncio
+import logging
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+# Skyentific Code
+from .aio import DEFAULT_TIMEOUT, AsyncWeatherLinkClient
+from .models import StationObservation
+
+DEFAULT_INTERVAL = 60.0
+DEFAULT_MAX_CONCURRENCY = 32
+
+logger = logging.getLogger(__name__)
+
+
+class Station(object):
+    """An IP logger to poll."""
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        interval: float = DEFAULT_INTERVAL,
+        timeout: float = DEFAULT_TIMEOUT,
+    ) -> None:
+        self.host = host
+        self.port = int(port)
+        self.interval = float(interval)
+        self.timeout = float(timeout)
+
+    @property
+    def address(self) -> str:
+        return "%s:%d" % (self.host, self.port)
+
+    @classmethod
+    def parse(cls, address: str, **kwargs) -> "Station":
+        """Creates a station from a `host:port` string."""
+        host, separator, port = address.rpartition(":")
+        if not separator or not host or not port.isdigit():
+            raise ValueError("Station address must be host:port, got %r" % address)
+        return cls(host, int(port), **kwargs)
+
+    def __repr__(self) -> str:
+        return "Station(%r, interval=%r)" % (self.address, self.interval)
+
+
+class StationStats(object):
+    """Latency and failure counts for one station."""
+
+    def __init__(self) -> None:
+        self.successes = 0
+        self.failures = 0
+        self.errors: Dict[str, int] = {}
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+        self.last_latency: Optional[float] = None
+        self.last_error: Optional[BaseException] = None
+
+    @property
+    def polls(self) -> int:
+        return self.successes + self.failures
+
+    @property
+    def mean_latency(self) -> Optional[float]:
+        if not self.polls:
+            return None
+        return self.total_latency / self.polls
+
+    def record(self, latency: float, error: Optional[BaseException] = None) -> None:
+        """Records the outcome of one poll."""
+        self.total_latency += latency
+        self.max_latency = max(self.max_latency, latency)
+        self.last_latency = latency
+        if error is None:
+            self.successes += 1
+            return
+        self.failures += 1
+        self.last_error = error
+        name = type(error).__name__
+        self.errors[name] = self.errors.get(name, 0) + 1
+
+    def to_dict(self) -> Dict:
+        """A dictionary representation of the stats."""
+        return {
+            "successes": self.successes,
+            "failures": self.failures,
+            "errors": dict(self.errors),
+            "mean_latency": self.mean_latency,
+            "max_latency": self.max_latency,
+            "last_latency": self.last_latency,
+        }
+
+
+class FleetPoller(object):
+    """
+    Polls a list of stations concurrently on one event loop.
+
+    `on_observation(station, observation)` and `on_error(station, error)`
+    are called after each poll. An exception raised by either is logged,
+    and does not stop the polling.
+    """
+
+    def __init__(
+        self,
+        stations: Iterable[Station],
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        initialization_function: callable = StationObservation.init_with_bytes,
+        on_observation: Optional[Callable] = None,
+        on_error: Optional[Callable] = None,
+    ) -> None:
+        self.stations: List[Station] = list(stations)
+        self.max_concurrency = max_concurrency
+        self.initialization_function = initialization_function
+        self.on_observation = on_observation
+        self.on_error = on_error
+        self.stats: Dict[str, StationStats] = {
+            station.address: StationStats() for station in self.stations
+        }
+        # Replaced at the start of each `run` or `poll_all`, as a semaphore
+        # belongs to the event loop it is first awaited in.
+        self.semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def poll(self, station: Station):
+        """Polls one station once, recording its latency and any failure."""
+        observation, _ = await self.poll_result(station)
+        return observation
+
+    async def poll_result(
+        self, station: Station
+    ) -> Tuple[Optional[StationObservation], Optional[Exception]]:
+        """Polls one station once, returning the observation or the error."""
+        async with self.semaphore:
+            started_at = time.perf_counter()
+            try:
+                async with AsyncWeatherLinkClient(
+                    station.host, station.port, station.timeout
+                ) as client:
+                    observation = await client.get_current_condition(
+                        self.initialization_function
+                    )
+            except Exception as e:
+                error = e
+                observation = None
+            else:
+                error = None
+            latency = time.perf_counter() - started_at
+        self.stats[station.address].record(latency, error)
+        if error is None:
+            logger.debug("Polled %s in %.3fs", station.address, latency)
+            if self.on_observation is not None:
+                self.notify(self.on_observation, station, observation)
+        else:
+            logger.warning("Polling %s failed: %r", station.address, error)
+            if self.on_error is not None:
+                self.notify(self.on_error, station, error)
+        return observation, error
+
+    def notify(self, callback: Callable, station: Station, result) -> None:
+        """Calls a callback, logging rather than raising what it raises."""
+        try:
+            callback(station, result)
+        except Exception:
+            logger.exception("Callback %r failed for %s", callback, station.address)
+
+    async def poll_all(
+        self,
+    ) -> List[Tuple[Station, Optional[StationObservation], Optional[Exception]]]:
+        """Polls every station once, concurrently, in the order given."""
+        self.semaphore = asyncio.Semaphore(self.max_concurrency)
+        results = await asyncio.gather(
+            *(self.poll_result(station) for station in self.stations)
+        )
+        return [
+            (station, observation, error)
+            for station, (observation, error) in zip(self.stations, results)
+        ]
+
+    async def run_station(
+        self, station: Station, offset: float, cycles: Optional[int] = None
+    ) -> None:
+        """Polls a station every `station.interval` seconds after `offset`."""
+        loop = asyncio.get_running_loop()
+        next_poll_at = loop.time() + offset
+        polled = 0
+        while cycles is None or polled < cycles:
+            await asyncio.sleep(max(0.0, next_poll_at - loop.time()))
+            await self.poll(station)
+            polled += 1
+            next_poll_at += station.interval
+            if next_poll_at < loop.time():
+                # Running behind, skip the missed polls rather than bunching up.
+                missed = (loop.time() - next_poll_at) // station.interval + 1
+                next_poll_at += missed * station.interval
+
+    async def run(self, cycles: Optional[int] = None) -> None:
+        """
+        Polls every station, `cycles` times each or forever.
+
+        Start times are staggered evenly across each station's interval so
+        the fleet does not poll all at once.
+        """
+        self.semaphore = asyncio.Semaphore(self.max_concurrency)
+        count = len(self.stations)
+        await asyncio.gather(
+            *(
+                self.run_station(station, station.interval * index / count, cycles)
+                for index, station in enumerate(self.stations)
+            )
+        )
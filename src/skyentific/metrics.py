@@ -0,0 +1,205 @@
+"""
+Per-phase timing of polls, exported in the Prometheus text format.
+
+Instrumentation is off until a registry is installed with `enable`. The
+hot paths check `metrics.active` once per call and skip all timing when it
+is None, so a disabled registry costs one attribute lookup:
+
+    registry = metrics.enable()
+    ...
+    print(registry.to_prometheus())
+
+Phases are `connect`, `request` (sending the command and waiting for the
+ACK), `receive` (reading the record) and `decode` (the initialization
+function), each labelled with the station's `host:port`.
+"""
+
+# Standard Library
+import bisect
+import socket
+import threading
+import weakref
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# Seconds; chosen to separate loopback, LAN and retrying polls.
+DEFAULT_BUCKETS = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+UNKNOWN_STATION = "unknown"
+
+
+class Histogram(object):
+    """Cumulative bucket counts, a sum and a count."""
+
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS) -> None:
+        self.buckets = tuple(buckets)
+        self.counts = [0] * len(self.buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        if index < len(self.counts):
+            self.counts[index] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative_counts(self) -> List[int]:
+        """The number of observations at or below each bucket bound."""
+        total = 0
+        cumulative = []
+        for count in self.counts:
+            total += count
+            cumulative.append(total)
+        return cumulative
+
+
+class MetricsRegistry(object):
+    """
+    Thread safe phase histograms and retry and error counters.
+
+    Subclass and override `observe`, `count_retry` or `count_error` to
+    forward measurements elsewhere instead of, or as well as, keeping them.
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS) -> None:
+        self.buckets = tuple(buckets)
+        self.histograms: Dict[Tuple[str, str], Histogram] = {}
+        self.retries: Dict[str, int] = {}
+        self.errors: Dict[Tuple[str, str], int] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, phase: str, seconds: float, station: str) -> None:
+        """Records how long one phase of a poll took."""
+        with self._lock:
+            histogram = self.histograms.get((phase, station))
+            if histogram is None:
+                histogram = self.histograms[(phase, station)] = Histogram(self.buckets)
+            histogram.observe(seconds)
+
+    def count_retry(self, station: str, count: int = 1) -> None:
+        with self._lock:
+            self.retries[station] = self.retries.get(station, 0) + count
+
+    def count_error(self, station: str, error: BaseException) -> None:
+        key = (station, type(error).__name__)
+        with self._lock:
+            self.errors[key] = self.errors.get(key, 0) + 1
+
+    def to_prometheus(self, prefix: str = "skyentific") -> str:
+        """The metrics in the Prometheus text exposition format."""
+        lines = [
+            "# HELP %s_phase_seconds Time spent in each phase of a poll." % prefix,
+            "# TYPE %s_phase_seconds histogram" % prefix,
+        ]
+        with self._lock:
+            for (phase, station), histogram in sorted(self.histograms.items()):
+                labels = 'phase="%s",station="%s"' % (
+                    escape_label(phase),
+                    escape_label(station),
+                )
+                for bound, count in zip(
+                    histogram.buckets, histogram.cumulative_counts()
+                ):
+                    lines.append(
+                        '%s_phase_seconds_bucket{%s,le="%s"} %d'
+                        % (prefix, labels, format_bound(bound), count)
+                    )
+                lines.append(
+                    '%s_phase_seconds_bucket{%s,le="+Inf"} %d'
+                    % (prefix, labels, histogram.count)
+                )
+                lines.append(
+                    "%s_phase_seconds_sum{%s} %r" % (prefix, labels, histogram.sum)
+                )
+                lines.append(
+                    "%s_phase_seconds_count{%s} %d" % (prefix, labels, histogram.count)
+                )
+            lines.append("# HELP %s_retries_total Poll attempts retried." % prefix)
+            lines.append("# TYPE %s_retries_total counter" % prefix)
+            for station, count in sorted(self.retries.items()):
+                lines.append(
+                    '%s_retries_total{station="%s"} %d'
+                    % (prefix, escape_label(station), count)
+                )
+            lines.append(
+                "# HELP %s_errors_total Failed poll attempts by error." % prefix
+            )
+            lines.append("# TYPE %s_errors_total counter" % prefix)
+            for (station, error), count in sorted(self.errors.items()):
+                lines.append(
+                    '%s_errors_total{station="%s",error="%s"} %d'
+                    % (prefix, escape_label(station), escape_label(error), count)
+                )
+        return "\n".join(lines) + "\n"
+
+
+def escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def format_bound(bound: float) -> str:
+    return repr(float(bound))
+
+
+# The `host:port` each socket was opened for by `utils.connect`, so a
+# station reached by host name keeps one label for every phase.
+labels: "weakref.WeakKeyDictionary[socket.socket, str]" = weakref.WeakKeyDictionary()
+
+
+def label_socket(sock: socket.socket, station: str) -> None:
+    """Records the station label of a socket about to be connected."""
+    try:
+        labels[sock] = station
+    except TypeError:
+        pass
+
+
+def station_label(sock: socket.socket) -> str:
+    """
+    The `host:port` of a socket's station.
+
+    That is the address given to `utils.connect` when it opened the
+    socket, or otherwise the peer the socket is connected to.
+    """
+    try:
+        return labels[sock]
+    except (KeyError, TypeError):
+        pass
+    try:
+        host, port = sock.getpeername()[:2]
+    except (OSError, AttributeError, TypeError, ValueError):
+        return UNKNOWN_STATION
+    return "%s:%s" % (host, port)
+
+
+# The installed registry, or None when instrumentation is off.
+active: Optional[MetricsRegistry] = None
+
+
+def enable(registry: Optional[MetricsRegistry] = None) -> MetricsRegistry:
+    """Installs `registry` (a new one by default) and returns it."""
+    global active
+    active = registry if registry is not None else MetricsRegistry()
+    return active
+
+
+def disable() -> None:
+    """Turns instrumentation off."""
+    global active
+    active = None
@@ -1,20 +1,48 @@
 # Standard Library
+import bisect
 import datetime
+import functools
 import logging
 import random
-from typing import Dict, List, Optional, Literal
-
-# Third Party Code
-from bitstring import BitStream
-from dateutil.tz import tzlocal
+import struct
+from typing import (
+    TYPE_CHECKING,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Literal,
+    Tuple,
+    Union,
+)
 
 # Supercell Code
 from .exceptions import BadCRC
 from .utils import crc16, CRC16_TABLE, make_time
 from .bar_trend import BarTrend
 
+if TYPE_CHECKING:
+    import numpy
+    from bitstring import BitStream
+
 logger = logging.getLogger(__name__)
 
+
+@functools.lru_cache(maxsize=None)
+def local_timezone() -> datetime.tzinfo:
+    """The local time zone, loaded from `dateutil` on first use."""
+    from dateutil.tz import tzlocal
+
+    return tzlocal()
+
+
+def __getattr__(name: str):
+    # `LOCAL_TIMEZONE` used to be built at import time.
+    if name == "LOCAL_TIMEZONE":
+        return local_timezone()
+    raise AttributeError("module %r has no attribute %r" % (__name__, name))
+
+
 FORECAST_RULES = [
     "Mostly clear and cooler.",
     "Mostly clear with little temperature change.",
@@ -246,6 +274,169 @@ LOOP_HEADER = b"LOOP"
 LOOP2_PACKET_TYPE = 1
 LOOP_PACKET_TYPE = 0
 
+# Field name and `struct` format of every field in a LOOP record, in order.
+# See docs/loop_packet_spec.md. All multi-byte values are little endian
+# except the CRC, which is kept as raw bytes.
+LOOP_RECORD_LAYOUT: Tuple[Tuple[str, str], ...] = (
+    ("header", "3s"),
+    ("bar_trend", "b"),
+    ("packet_type", "B"),
+    ("next_record", "H"),
+    ("barometer", "H"),
+    ("inside_temperature", "h"),
+    ("inside_humidity", "B"),
+    ("outside_temperature", "h"),
+    ("wind_speed", "B"),
+    ("ten_min_avg_wind_speed", "B"),
+    ("wind_direction", "H"),
+    ("extra_temperatures", "7s"),
+    ("soil_temperatures", "4s"),
+    ("leaf_temperatures", "4s"),
+    ("outside_humidity", "B"),
+    ("extra_humidities", "7s"),
+    ("rain_rate", "H"),
+    ("uv_index", "B"),
+    ("solar_radiation", "H"),
+    ("storm_rain", "H"),
+    ("start_date_of_storm", "H"),
+    ("day_rain", "H"),
+    ("month_rain", "H"),
+    ("year_rain", "H"),
+    ("day_et", "H"),
+    ("month_et", "H"),
+    ("year_et", "H"),
+    ("soil_moistures", "4s"),
+    ("leaf_wetnesses", "4s"),
+    ("inside_alarms", "B"),
+    ("rain_alarms", "B"),
+    ("outside_alarms", "H"),
+    ("extra_temperature_humidity_alarms", "8s"),
+    ("soil_leaf_alarms", "4s"),
+    ("transmitter_battery_status", "B"),
+    ("console_battery_voltage", "H"),
+    ("forecast_icons", "B"),
+    ("forecast_rule_number", "B"),
+    ("sunrise", "H"),
+    ("sunset", "H"),
+    ("line_terminator", "2s"),
+    ("crc", "2s"),
+)
+
+
+def compile_layout(
+    layout: Iterable[Tuple[str, str]], field_names: Optional[Iterable[str]] = None
+) -> struct.Struct:
+    """
+    Compiles a record layout into a single little endian `struct.Struct`.
+
+    Fields not named in `field_names` are compiled as padding so that one
+    `unpack` call returns only the wanted values, in layout order.
+    """
+    wanted = None if field_names is None else set(field_names)
+    format_string = "<"
+    for name, field_format in layout:
+        if wanted is None or name in wanted:
+            format_string += field_format
+        else:
+            format_string += "%dx" % struct.calcsize("<" + field_format)
+    return struct.Struct(format_string)
+
+
+def layout_offsets(layout: Iterable[Tuple[str, str]]) -> Dict[str, Tuple[int, str]]:
+    """Maps each field name in a layout to its byte offset and format."""
+    offsets = {}
+    offset = 0
+    for name, field_format in layout:
+        offsets[name] = (offset, field_format)
+        offset += struct.calcsize("<" + field_format)
+    return offsets
+
+
+LOOP_RECORD_STRUCT = compile_layout(LOOP_RECORD_LAYOUT)
+LOOP_RECORD_OFFSETS = layout_offsets(LOOP_RECORD_LAYOUT)
+
+# Only the fields a `StationObservation` needs, padding over the rest.
+OBSERVATION_STRUCT = compile_layout(
+    LOOP_RECORD_LAYOUT,
+    (
+        "bar_trend",
+        "packet_type",
+        "barometer",
+        "inside_temperature",
+        "inside_humidity",
+        "outside_temperature",
+        "wind_speed",
+        "ten_min_avg_wind_speed",
+        "wind_direction",
+        "outside_humidity",
+        "rain_rate",
+        "console_battery_voltage",
+        "forecast_icons",
+        "forecast_rule_number",
+        "sunrise",
+        "sunset",
+    ),
+)
+
+# Field name and `struct` format of every field in a LOOP2 record. Wind
+# averages are in 0.1 mph, dew point, heat index, wind chill and THSW index
+# in whole degrees F.
+LOOP2_RECORD_LAYOUT: Tuple[Tuple[str, str], ...] = (
+    ("header", "3s"),
+    ("bar_trend", "b"),
+    ("packet_type", "B"),
+    ("unused_1", "2s"),
+    ("barometer", "H"),
+    ("inside_temperature", "h"),
+    ("inside_humidity", "B"),
+    ("outside_temperature", "h"),
+    ("wind_speed", "B"),
+    ("unused_2", "1s"),
+    ("wind_direction", "H"),
+    ("ten_min_avg_wind_speed", "H"),
+    ("two_min_avg_wind_speed", "H"),
+    ("ten_min_wind_gust", "H"),
+    ("wind_direction_for_ten_min_wind_gust", "H"),
+    ("unused_3", "4s"),
+    ("dew_point", "h"),
+    ("unused_4", "1s"),
+    ("outside_humidity", "B"),
+    ("unused_5", "1s"),
+    ("heat_index", "h"),
+    ("wind_chill", "h"),
+    ("thsw_index", "h"),
+    ("rain_rate", "H"),
+    ("uv_index", "B"),
+    ("solar_radiation", "H"),
+    ("storm_rain", "H"),
+    ("start_date_of_storm", "H"),
+    ("day_rain", "H"),
+    ("last_fifteen_min_rain", "H"),
+    ("last_hour_rain", "H"),
+    ("day_et", "H"),
+    ("last_twenty_four_hour_rain", "H"),
+    ("barometric_reduction_method", "B"),
+    ("user_barometric_offset", "H"),
+    ("barometric_calibration_number", "H"),
+    ("barometric_sensor_raw_reading", "H"),
+    ("absolute_barometric_pressure", "H"),
+    ("altimeter_setting", "H"),
+    ("unused_6", "2s"),
+    ("next_ten_min_wind_speed_graph_pointer", "B"),
+    ("next_fifteen_min_wind_speed_graph_pointer", "B"),
+    ("next_hourly_wind_speed_graph_pointer", "B"),
+    ("next_daily_wind_speed_graph_pointer", "B"),
+    ("next_minute_rain_graph_pointer", "B"),
+    ("next_rain_storm_graph_pointer", "B"),
+    ("minute_in_hour_index", "B"),
+    ("next_monthly_rain", "B"),
+    ("next_yearly_rain", "B"),
+    ("next_seasonal_rain", "B"),
+    ("unused_7", "12s"),
+    ("line_terminator", "2s"),
+    ("crc", "2s"),
+)
+
 LUNATION_LOOKUP = {
     0.05: "New Moon",
     0.15: "Crescent",
@@ -280,28 +471,43 @@ WIND_DIRECTION_LOOKUP = {
 }
 
 
+# The lunation thresholds in order, and each one's text waxing, at
+# Full/New Moon exactly, and waning, so `lunation_text` is a bisect and an
+# index rather than a walk of the lookup and a format.
+LUNATION_THRESHOLDS = tuple(LUNATION_LOOKUP)
+LUNATION_TEXTS = tuple(
+    ("%s (Waxing)" % text, text, "%s (Waning)" % text)
+    for text in LUNATION_LOOKUP.values()
+)
+
+
 def lunation_text(lunation: float) -> str:
     """Converts the lunation value to a string."""
     if lunation < 0 or lunation > 1.0:
         raise ValueError("Lunation must be between 0.0 - 1.0")
 
+    texts = LUNATION_TEXTS[bisect.bisect_left(LUNATION_THRESHOLDS, lunation)]
     if lunation < 0.5:
-        direction = "Waxing"
+        return texts[0]
     elif lunation == 0.5 or lunation == 1.0:
-        direction = ""
-    else:
-        direction = "Waning"
+        return texts[1]
+    return texts[2]
+
 
-    lunation_text = "Unknown Lunation"
+WIND_DIRECTION_THRESHOLDS = tuple(WIND_DIRECTION_LOOKUP)
+WIND_DIRECTION_NAMES = tuple(WIND_DIRECTION_LOOKUP.values())
 
-    for lunation_value, lunation_text in LUNATION_LOOKUP.items():
-        if lunation > lunation_value:
-            continue
-        break
 
-    if direction == "":
-        return "{text}".format(text=lunation_text)
-    return "{text} ({direction})".format(text=lunation_text, direction=direction)
+def search_wind_direction_text(wind_direction: float) -> str:
+    """The name of the first threshold above `wind_direction`."""
+    index = bisect.bisect_right(WIND_DIRECTION_THRESHOLDS, wind_direction)
+    return WIND_DIRECTION_NAMES[min(index, len(WIND_DIRECTION_NAMES) - 1)]
+
+
+# The text of every whole degree from 0 to 360.
+WIND_DIRECTION_TEXTS = tuple(
+    search_wind_direction_text(degrees) for degrees in range(361)
+)
 
 
 def wind_direction_text(wind_direction: int) -> str:
@@ -310,14 +516,9 @@ def wind_direction_text(wind_direction: int) -> str:
         raise ValueError(
             "Wind direction (%s) must be between 0 - 360" % (wind_direction)
         )
-
-    wind_direction_text = "Unknown Wind Direction"
-
-    for wind_direction_value, wind_direction_text in WIND_DIRECTION_LOOKUP.items():
-        if wind_direction >= wind_direction_value:
-            continue
-        break
-    return wind_direction_text
+    if type(wind_direction) is int:
+        return WIND_DIRECTION_TEXTS[wind_direction]
+    return search_wind_direction_text(wind_direction)
 
 
 FORECAST_ICONS_LOOKUP = {
@@ -328,6 +529,14 @@ FORECAST_ICONS_LOOKUP = {
     4: "Snow",
 }
 
+# The text of every icon bitmap, 0 to 31.
+FORECAST_ICONS_TEXTS = ("Unknown",) + tuple(
+    ", ".join(
+        FORECAST_ICONS_LOOKUP[bit] for bit in range(5) if forecast_icons & (1 << bit)
+    )
+    for forecast_icons in range(1, 32)
+)
+
 
 def forecast_icons_text(forecast_icons: int) -> List[str]:
     """
@@ -362,25 +571,123 @@ def forecast_icons_text(forecast_icons: int) -> List[str]:
     """
     if forecast_icons < 0 or forecast_icons > 31:
         raise ValueError("Forecast icons must be between 0 - 31.")
+    return FORECAST_ICONS_TEXTS[forecast_icons]
+
+
+class BaseRecord(object):
+    """
+    The timestamp and identifier shared by decoded records.
+
+    Subclasses provide `observed_at`, `_observation_made_at` and
+    `_identifier`.
+    """
+
+    __slots__ = ()
+
+    @property
+    def observation_made_at(self) -> str:
+        """When the observation was made, ISO formatted."""
+        if self._observation_made_at is None:
+            self._observation_made_at = self.observed_at.isoformat()
+        return self._observation_made_at
+
+    @observation_made_at.setter
+    def observation_made_at(self, value: Union[str, datetime.datetime]) -> None:
+        """Sets `observed_at` from a datetime or an ISO formatted string."""
+        if isinstance(value, datetime.datetime):
+            self.observed_at = value
+            self._observation_made_at = None
+        else:
+            self.observed_at = datetime.datetime.fromisoformat(value)
+            self._observation_made_at = value
+
+    @property
+    def identifier(self) -> int:
+        """The identifier given, or a random 32 bit one chosen on first use."""
+        if self._identifier is None:
+            self._identifier = random.getrandbits(32)
+        return self._identifier
+
+    @identifier.setter
+    def identifier(self, value: Optional[int]) -> None:
+        self._identifier = value
+
+
+class BaseObservation(BaseRecord):
+    """
+    Derived text and serialization shared by observation types.
+
+    Subclasses provide the observation fields.
+    """
+
+    __slots__ = ()
 
-    logger.debug(f"Forecast Icons For: {forecast_icons}, binary: {bin(forecast_icons)}")
+    def wind_direction_text(self) -> str:
+        """Produces a string description of the wind direction."""
+        return wind_direction_text(self.wind_direction)
+
+    def forecast_icons_text(self) -> List[str]:
+        return forecast_icons_text(self.forecast_icons)
+
+    def forecast_text(self) -> str:
+        """Returns the string version of the forecast rule."""
+        return FORECAST_RULES[self.forecast_rule_number]
+
+    def to_dict(self) -> Dict:
+        """A dictionary representation of the observation."""
+        return {
+            "bar_trend": self.bar_trend,
+            "barometer": self.barometer,
+            "inside_temperature": self.inside_temperature,
+            "inside_humidity": self.inside_humidity,
+            "outside_temperature": self.outside_temperature,
+            "outside_humidity": self.outside_humidity,
+            "wind_speed": self.wind_speed,
+            "ten_min_avg_wind_speed": self.ten_min_avg_wind_speed,
+            "wind_direction": self.wind_direction,
+            "wind_direction_text": self.wind_direction_text(),
+            "rain_rate": self.rain_rate,
+            "console_battery_voltage": self.console_battery_voltage,
+            "forecast_icons": self.forecast_icons,
+            "forecast_icons_text": self.forecast_icons_text(),
+            "forecast_rule_number": self.forecast_rule_number,
+            "forecast_text": self.forecast_text(),
+            "sunrise": self.sunrise.isoformat(),
+            "sunset": self.sunset.isoformat(),
+            "observation_made_at": self.observation_made_at,
+            "identifier": self.identifier,
+        }
 
-    forecast_icons_text = []
-    if forecast_icons == 0:
-        return "Unknown"
-    else:
-        for i in range(5):
-            if forecast_icons & (1 << i):
-                logger.debug(f"Forecast Icon: {i} -> {FORECAST_ICONS_LOOKUP[i]}")
-                forecast_icons_text.append(FORECAST_ICONS_LOOKUP[i])
-            else:
-                logger.debug(f"Forecast Icon: {i} -> Not Set")
 
-    return ", ".join(forecast_icons_text)
+class StationObservation(BaseObservation):
+    """
+    A station observation
 
+    Slotted to keep long runs of observations compact. The ISO formatted
+    `observation_made_at` and a random `identifier` are only produced when
+    first read.
+    """
 
-class StationObservation(object):
-    """A station observation"""
+    __slots__ = (
+        "bar_trend",
+        "barometer",
+        "inside_temperature",
+        "inside_humidity",
+        "outside_temperature",
+        "outside_humidity",
+        "wind_speed",
+        "ten_min_avg_wind_speed",
+        "wind_direction",
+        "rain_rate",
+        "console_battery_voltage",
+        "forecast_icons",
+        "forecast_rule_number",
+        "sunrise",
+        "sunset",
+        "observed_at",
+        "_observation_made_at",
+        "_identifier",
+    )
 
     bar_trend: int
     barometer: float
@@ -397,8 +704,7 @@ class StationObservation(object):
     forecast_rule_number: int
     sunrise: datetime.time
     sunset: datetime.time
-    observation_made_at: datetime.datetime
-    identitier: int
+    observed_at: datetime.datetime
 
     def __init__(
         self,
@@ -435,52 +741,19 @@ class StationObservation(object):
         self.forecast_rule_number = int(forecast_rule_number)
         self.sunrise = sunrise
         self.sunset = sunset
-        self.observation_made_at = (
-            observation_made_at or datetime.datetime.now(tzlocal())
-        ).isoformat()
-        self.identifier = identifier or random.getrandbits(32)
-
-    def wind_direction_text(self) -> str:
-        """Produces a string description of the wind direction."""
-        return wind_direction_text(self.wind_direction)
-
-    def forecast_icons_text(self) -> List[str]:
-        return forecast_icons_text(self.forecast_icons)
-
-    def forecast_text(self) -> str:
-        """Returns the string version of the forecast rule."""
-        return FORECAST_RULES[self.forecast_rule_number]
-
-    def to_dict(self) -> Dict:
-        """A dictionary representation of the observation."""
-        return {
-            "bar_trend": self.bar_trend,
-            "barometer": self.barometer,
-            "inside_temperature": self.inside_temperature,
-            "inside_humidity": self.inside_humidity,
-            "outside_temperature": self.outside_temperature,
-            "outside_humidity": self.outside_humidity,
-            "wind_speed": self.wind_speed,
-            "ten_min_avg_wind_speed": self.ten_min_avg_wind_speed,
-            "wind_direction": self.wind_direction,
-            "wind_direction_text": self.wind_direction_text(),
-            "rain_rate": self.rain_rate,
-            "console_battery_voltage": self.console_battery_voltage,
-            "forecast_icons": self.forecast_icons,
-            "forecast_icons_text": self.forecast_icons_text(),
-            "forecast_rule_number": self.forecast_rule_number,
-            "forecast_text": self.forecast_text(),
-            "sunrise": self.sunrise.isoformat(),
-            "sunset": self.sunset.isoformat(),
-            "observation_made_at": self.observation_made_at,
-            "identifier": self.identifier,
-        }
+        self.observed_at = observation_made_at or datetime.datetime.now(
+            local_timezone()
+        )
+        self._observation_made_at = None
+        self._identifier = identifier or None
 
     @classmethod
     def validate_record(
-        cls, record_bitstream: BitStream, validate_crc: bool = True
+        cls, record_bitstream: "BitStream", validate_crc: bool = True
     ) -> None:
         """Validates a record."""
+        from bitstring import BitStream
+
         if type(record_bitstream) is not BitStream:
             raise ValueError("Record must be a BitStream.")
         if len(record_bitstream) != LOOP_RECORD_SIZE_BITS:
@@ -492,12 +765,14 @@ class StationObservation(object):
             raise BadCRC()
 
     @classmethod
-    def validate_packet_type(cls, record_bitstream: BitStream) -> None:
+    def validate_packet_type(cls, record_bitstream: "BitStream") -> None:
         """Validates the packet type."""
+        from bitstring import BitStream
+
         if type(record_bitstream) is not BitStream:
             raise ValueError("Record must be a BitStream.")
         packet_type_value = record_bitstream.read(8).int
-        logger.debug(f"Packet Type Value: {packet_type_value}")
+        logger.debug("Packet Type Value: %d", packet_type_value)
         if packet_type_value == LOOP2_PACKET_TYPE:
             raise ValueError("LOOP2 Packet Not Supported")
 
@@ -509,119 +784,752 @@ class StationObservation(object):
         observation_made_at: Optional[datetime.datetime] = None,
     ):
         """Creates a new Station Observation from record of bytes."""
-        record_bitstream = BitStream(record_bytes)
-        cls.validate_record(record_bitstream, False)
-        # Set to position four
-        record_bitstream.pos = 24
-        # Awkwardly positioned bar trend
-        bar_trend = BarTrend(record_bitstream.read(8).intle)
-        cls.validate_packet_type(record_bitstream)
-        # Skip 2 bytes
-        record_bitstream.read(16)
+        if len(record_bytes) != LOOP_RECORD_SIZE_BYTES:
+            raise ValueError(
+                "Records should be %d bytes in length. It is %d"
+                % (LOOP_RECORD_SIZE_BYTES, len(record_bytes))
+            )
+        (
+            bar_trend,
+            packet_type,
+            barometer,
+            inside_temperature,
+            inside_humidity,
+            outside_temperature,
+            wind_speed,
+            ten_min_avg_wind_speed,
+            wind_direction,  # 0º = None, 90º = E, 180 = S, 270 = W, 360 = N
+            outside_humidity,
+            rain_rate,
+            console_battery_voltage,
+            forecast_icons,
+            forecast_rule_number,
+            sunrise,
+            sunset,
+        ) = OBSERVATION_STRUCT.unpack(record_bytes)
+        if packet_type == LOOP2_PACKET_TYPE:
+            raise ValueError("LOOP2 Packet Not Supported")
+        console_battery_voltage = ((console_battery_voltage * 300.0) / 512.0) / 100.0
 
-        barometer = record_bitstream.read(16).uintle / 1000.0
-        inside_temperature = record_bitstream.read(16).intle / 10.0
-        inside_humidity = record_bitstream.read(8).uintle
-        outside_temperature = record_bitstream.read(16).intle / 10.0
-        wind_speed = record_bitstream.read(8).uintle
-        ten_min_avg_wind_speed = record_bitstream.read(8).uintle
-        wind_direction = record_bitstream.read(
-            16
-        ).uintle  # 0º = None, 90º = E, 180 = S, 270 = W, 360 = N
+        return cls(
+            bar_trend=BarTrend(bar_trend),
+            barometer=barometer / 1000.0,
+            inside_temperature=inside_temperature / 10.0,
+            inside_humidity=inside_humidity,
+            outside_temperature=outside_temperature / 10.0,
+            outside_humidity=outside_humidity,
+            wind_speed=wind_speed,
+            wind_direction=wind_direction,
+            ten_min_avg_wind_speed=ten_min_avg_wind_speed,
+            rain_rate=rain_rate,
+            console_battery_voltage=console_battery_voltage,
+            forecast_icons=forecast_icons,
+            forecast_rule_number=forecast_rule_number,
+            sunrise=make_time(sunrise),
+            sunset=make_time(sunset),
+            identifier=identifier,
+            observation_made_at=observation_made_at,
+        )
 
-        # Skip "extra temperatures"
-        record_bitstream.read(
-            56
-        )  # Each byte is a one extra temperature value in whole degrees F
-        # with # an offset  of 90 degrees. 0 = -90, 100 = 10, 169 = 79
-        # Skip soil temperatures
-        record_bitstream.read(32)
-        # Skip leaf temperatures
-        record_bitstream.read(32)
 
-        outside_humidity = record_bitstream.read(8).uintle
+# Values the console sends when a sensor is not present.
+MISSING_SENSOR_BYTE = 0xFF
+MISSING_SOLAR_RADIATION = 0x7FFF
+MISSING_STORM_DATE = 0xFFFF
 
-        # Skip extra humidities
-        record_bitstream.read(56)
+# Extra, soil and leaf temperatures are whole degrees F offset by 90.
+EXTRA_TEMPERATURE_OFFSET = 90
+EXTRA_TEMPERATURE_VALUES = tuple(
+    None if value == MISSING_SENSOR_BYTE else value - EXTRA_TEMPERATURE_OFFSET
+    for value in range(256)
+)
+SENSOR_BYTE_VALUES = tuple(
+    None if value == MISSING_SENSOR_BYTE else value for value in range(256)
+)
 
-        rain_rate = record_bitstream.read(16).uintle
 
-        # ultraviolet_index
-        record_bitstream.read(8)
+def offset_temperatures(raw: bytes) -> Tuple[Optional[int], ...]:
+    """Converts offset temperature bytes to degrees F, None where missing."""
+    return tuple([EXTRA_TEMPERATURE_VALUES[value] for value in raw])
 
-        # solar_radiation
-        record_bitstream.read(16)
 
-        # storm_rain
-        record_bitstream.read(16)
+def optional_sensor_values(raw: bytes) -> Tuple[Optional[int], ...]:
+    """Converts sensor bytes to integers, None where missing."""
+    return tuple([SENSOR_BYTE_VALUES[value] for value in raw])
 
-        # start_date_of_storm
-        record_bitstream.read(16)
 
-        # day_rain
-        record_bitstream.read(16)
+def optional_sensor_byte(value: int) -> Optional[int]:
+    return SENSOR_BYTE_VALUES[value]
 
-        # month_rain
-        record_bitstream.read(16)
 
-        # year_rain
-        record_bitstream.read(16)
+def optional_solar_radiation(value: int) -> Optional[int]:
+    return None if value == MISSING_SOLAR_RADIATION else value
 
-        # day_et
-        record_bitstream.read(16)
 
-        # month_et
-        record_bitstream.read(16)
+def storm_start_date(value: int) -> Optional[datetime.date]:
+    """
+    Converts the packed start date of the current storm.
 
-        # year_et
-        record_bitstream.read(16)
+    Bits 15-12 are the month, 11-7 the day and 6-0 the year since 2000.
+    """
+    if value == MISSING_STORM_DATE:
+        return None
+    try:
+        return datetime.date((value & 0x7F) + 2000, value >> 12, (value >> 7) & 0x1F)
+    except ValueError:
+        return None
 
-        # Skip extra soil moistures
-        record_bitstream.read(32)
-        # Skip extra leaf wetnesses
-        record_bitstream.read(32)
 
-        # inside_alarms
-        record_bitstream.read(8)
+class LoopRecord(StationObservation):
+    """
+    Every field of a LOOP record, decoded in one pass.
 
-        # rain_alarms
-        record_bitstream.read(8)
+    Rain and ET totals are in clicks as sent by the console, alarms are the
+    raw bit fields, and missing sensors read as None.
+    """
 
-        # outside_alarms
-        record_bitstream.read(16)
+    __slots__ = (
+        "next_record",
+        "extra_temperatures",
+        "soil_temperatures",
+        "leaf_temperatures",
+        "extra_humidities",
+        "uv_index",
+        "solar_radiation",
+        "storm_rain",
+        "start_date_of_storm",
+        "day_rain",
+        "month_rain",
+        "year_rain",
+        "day_et",
+        "month_et",
+        "year_et",
+        "soil_moistures",
+        "leaf_wetnesses",
+        "inside_alarms",
+        "rain_alarms",
+        "outside_alarms",
+        "extra_temperature_humidity_alarms",
+        "soil_leaf_alarms",
+        "transmitter_battery_status",
+    )
+
+    next_record: int
+    extra_temperatures: Tuple[Optional[int], ...]
+    soil_temperatures: Tuple[Optional[int], ...]
+    leaf_temperatures: Tuple[Optional[int], ...]
+    extra_humidities: Tuple[Optional[int], ...]
+    uv_index: Optional[int]
+    solar_radiation: Optional[int]
+    storm_rain: int
+    start_date_of_storm: Optional[datetime.date]
+    day_rain: int
+    month_rain: int
+    year_rain: int
+    day_et: int
+    month_et: int
+    year_et: int
+    soil_moistures: Tuple[Optional[int], ...]
+    leaf_wetnesses: Tuple[Optional[int], ...]
+    inside_alarms: int
+    rain_alarms: int
+    outside_alarms: int
+    extra_temperature_humidity_alarms: bytes
+    soil_leaf_alarms: bytes
+    transmitter_battery_status: int
 
-        # Skip extra temp/humidity alarms
-        record_bitstream.read(64)
-        # Skip extra soil leaf alarms
-        record_bitstream.read(32)
+    def to_dict(self) -> Dict:
+        """A dictionary representation of the whole record."""
+        record_dict = super().to_dict()
+        record_dict.update(
+            {
+                "next_record": self.next_record,
+                "extra_temperatures": list(self.extra_temperatures),
+                "soil_temperatures": list(self.soil_temperatures),
+                "leaf_temperatures": list(self.leaf_temperatures),
+                "extra_humidities": list(self.extra_humidities),
+                "uv_index": self.uv_index,
+                "solar_radiation": self.solar_radiation,
+                "storm_rain": self.storm_rain,
+                "start_date_of_storm": (
+                    self.start_date_of_storm.isoformat()
+                    if self.start_date_of_storm
+                    else None
+                ),
+                "day_rain": self.day_rain,
+                "month_rain": self.month_rain,
+                "year_rain": self.year_rain,
+                "day_et": self.day_et,
+                "month_et": self.month_et,
+                "year_et": self.year_et,
+                "soil_moistures": list(self.soil_moistures),
+                "leaf_wetnesses": list(self.leaf_wetnesses),
+                "inside_alarms": self.inside_alarms,
+                "rain_alarms": self.rain_alarms,
+                "outside_alarms": self.outside_alarms,
+                "extra_temperature_humidity_alarms": list(
+                    self.extra_temperature_humidity_alarms
+                ),
+                "soil_leaf_alarms": list(self.soil_leaf_alarms),
+                "transmitter_battery_status": self.transmitter_battery_status,
+            }
+        )
+        return record_dict
 
-        # Skip tx battery status
-        record_bitstream.read(8)
+    @classmethod
+    def init_with_bytes(
+        cls,
+        record_bytes: bytes,
+        identifier: Optional[int] = None,
+        observation_made_at: Optional[datetime.datetime] = None,
+    ) -> "LoopRecord":
+        """Creates a full record from record of bytes."""
+        if len(record_bytes) != LOOP_RECORD_SIZE_BYTES:
+            raise ValueError(
+                "Records should be %d bytes in length. It is %d"
+                % (LOOP_RECORD_SIZE_BYTES, len(record_bytes))
+            )
+        (
+            _,
+            bar_trend,
+            packet_type,
+            next_record,
+            barometer,
+            inside_temperature,
+            inside_humidity,
+            outside_temperature,
+            wind_speed,
+            ten_min_avg_wind_speed,
+            wind_direction,
+            raw_extra_temperatures,
+            raw_soil_temperatures,
+            raw_leaf_temperatures,
+            outside_humidity,
+            raw_extra_humidities,
+            rain_rate,
+            uv_index,
+            solar_radiation,
+            storm_rain,
+            start_date_of_storm,
+            day_rain,
+            month_rain,
+            year_rain,
+            day_et,
+            month_et,
+            year_et,
+            raw_soil_moistures,
+            raw_leaf_wetnesses,
+            inside_alarms,
+            rain_alarms,
+            outside_alarms,
+            extra_temperature_humidity_alarms,
+            soil_leaf_alarms,
+            transmitter_battery_status,
+            console_battery_voltage,
+            forecast_icons,
+            forecast_rule_number,
+            sunrise,
+            sunset,
+            _,
+            _,
+        ) = LOOP_RECORD_STRUCT.unpack(record_bytes)
+        if packet_type == LOOP2_PACKET_TYPE:
+            raise ValueError("LOOP2 Packet Not Supported")
 
-        console_battery_voltage = (
-            (record_bitstream.read(16).uintle * 300.0) / 512.0
+        # Fields are set directly, skipping the conversions in __init__.
+        record = cls.__new__(cls)
+        record.bar_trend = BarTrend(bar_trend)
+        record.barometer = barometer / 1000.0
+        record.inside_temperature = inside_temperature / 10.0
+        record.inside_humidity = float(inside_humidity)
+        record.outside_temperature = outside_temperature / 10.0
+        record.outside_humidity = float(outside_humidity)
+        record.wind_speed = wind_speed
+        record.ten_min_avg_wind_speed = ten_min_avg_wind_speed
+        record.wind_direction = wind_direction
+        record.rain_rate = rain_rate
+        record.console_battery_voltage = (
+            (console_battery_voltage * 300.0) / 512.0
         ) / 100.0
-        forecast_icons = record_bitstream.read(8).uintle
-        forecast_rule_number = record_bitstream.read(8).uintle
-        sunrise = make_time(record_bitstream.read(16).uintle)
-        sunset = make_time(record_bitstream.read(16).uintle)
+        record.forecast_icons = forecast_icons
+        record.forecast_rule_number = forecast_rule_number
+        record.sunrise = make_time(sunrise)
+        record.sunset = make_time(sunset)
+        record.observed_at = observation_made_at or datetime.datetime.now(
+            local_timezone()
+        )
+        record._observation_made_at = None
+        record._identifier = identifier or None
+        record.next_record = next_record
+        record.extra_temperatures = offset_temperatures(raw_extra_temperatures)
+        record.soil_temperatures = offset_temperatures(raw_soil_temperatures)
+        record.leaf_temperatures = offset_temperatures(raw_leaf_temperatures)
+        record.extra_humidities = optional_sensor_values(raw_extra_humidities)
+        record.uv_index = SENSOR_BYTE_VALUES[uv_index]
+        record.solar_radiation = optional_solar_radiation(solar_radiation)
+        record.storm_rain = storm_rain
+        record.start_date_of_storm = storm_start_date(start_date_of_storm)
+        record.day_rain = day_rain
+        record.month_rain = month_rain
+        record.year_rain = year_rain
+        record.day_et = day_et
+        record.month_et = month_et
+        record.year_et = year_et
+        record.soil_moistures = optional_sensor_values(raw_soil_moistures)
+        record.leaf_wetnesses = optional_sensor_values(raw_leaf_wetnesses)
+        record.inside_alarms = inside_alarms
+        record.rain_alarms = rain_alarms
+        record.outside_alarms = outside_alarms
+        record.extra_temperature_humidity_alarms = extra_temperature_humidity_alarms
+        record.soil_leaf_alarms = soil_leaf_alarms
+        record.transmitter_battery_status = transmitter_battery_status
+        return record
+
+
+class LazyField(object):
+    """
+    A field of a packet view, decoded on first access.
 
-        return cls(
-            bar_trend=bar_trend,
-            barometer=barometer,
-            inside_temperature=inside_temperature,
-            inside_humidity=inside_humidity,
-            outside_temperature=outside_temperature,
-            outside_humidity=outside_humidity,
-            wind_speed=wind_speed,
-            wind_direction=wind_direction,
-            ten_min_avg_wind_speed=ten_min_avg_wind_speed,
-            rain_rate=rain_rate,
-            console_battery_voltage=console_battery_voltage,
-            forecast_icons=forecast_icons,
-            forecast_rule_number=forecast_rule_number,
-            sunrise=sunrise,
-            sunset=sunset,
-            identifier=identifier,
-            observation_made_at=observation_made_at,
+    The decoded value is stored in the instance `__dict__`, which shadows
+    this descriptor for every later access.
+    """
+
+    def __init__(
+        self,
+        offsets: Dict[str, Tuple[int, str]],
+        name: str,
+        convert: Optional[callable] = None,
+    ) -> None:
+        self.name = name
+        self.offset, field_format = offsets[name]
+        self.struct = struct.Struct("<" + field_format)
+        self.convert = convert
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        value = self.struct.unpack_from(instance.record, self.offset)[0]
+        if self.convert is not None:
+            value = self.convert(value)
+        instance.__dict__[self.name] = value
+        return value
+
+
+class LoopPacketView(BaseObservation):
+    """
+    A LOOP record whose fields are decoded when they are first read.
+
+    Has the same attributes and methods as `StationObservation`. Read-only
+    buffers such as `bytes` are wrapped without copying. Writable buffers
+    are copied once, so a reused receive buffer cannot change the view.
+    """
+
+    bar_trend = LazyField(LOOP_RECORD_OFFSETS, "bar_trend", BarTrend)
+    barometer = LazyField(
+        LOOP_RECORD_OFFSETS, "barometer", lambda value: value / 1000.0
+    )
+    inside_temperature = LazyField(
+        LOOP_RECORD_OFFSETS, "inside_temperature", lambda value: value / 10.0
+    )
+    inside_humidity = LazyField(LOOP_RECORD_OFFSETS, "inside_humidity", float)
+    outside_temperature = LazyField(
+        LOOP_RECORD_OFFSETS, "outside_temperature", lambda value: value / 10.0
+    )
+    outside_humidity = LazyField(LOOP_RECORD_OFFSETS, "outside_humidity", float)
+    wind_speed = LazyField(LOOP_RECORD_OFFSETS, "wind_speed")
+    ten_min_avg_wind_speed = LazyField(LOOP_RECORD_OFFSETS, "ten_min_avg_wind_speed")
+    wind_direction = LazyField(LOOP_RECORD_OFFSETS, "wind_direction")
+    rain_rate = LazyField(LOOP_RECORD_OFFSETS, "rain_rate")
+    console_battery_voltage = LazyField(
+        LOOP_RECORD_OFFSETS,
+        "console_battery_voltage",
+        lambda value: ((value * 300.0) / 512.0) / 100.0,
+    )
+    forecast_icons = LazyField(LOOP_RECORD_OFFSETS, "forecast_icons")
+    forecast_rule_number = LazyField(LOOP_RECORD_OFFSETS, "forecast_rule_number")
+    sunrise = LazyField(LOOP_RECORD_OFFSETS, "sunrise", make_time)
+    sunset = LazyField(LOOP_RECORD_OFFSETS, "sunset", make_time)
+    next_record = LazyField(LOOP_RECORD_OFFSETS, "next_record")
+    extra_temperatures = LazyField(
+        LOOP_RECORD_OFFSETS, "extra_temperatures", offset_temperatures
+    )
+    soil_temperatures = LazyField(
+        LOOP_RECORD_OFFSETS, "soil_temperatures", offset_temperatures
+    )
+    leaf_temperatures = LazyField(
+        LOOP_RECORD_OFFSETS, "leaf_temperatures", offset_temperatures
+    )
+    extra_humidities = LazyField(
+        LOOP_RECORD_OFFSETS, "extra_humidities", optional_sensor_values
+    )
+    uv_index = LazyField(LOOP_RECORD_OFFSETS, "uv_index", optional_sensor_byte)
+    solar_radiation = LazyField(
+        LOOP_RECORD_OFFSETS, "solar_radiation", optional_solar_radiation
+    )
+    storm_rain = LazyField(LOOP_RECORD_OFFSETS, "storm_rain")
+    start_date_of_storm = LazyField(
+        LOOP_RECORD_OFFSETS, "start_date_of_storm", storm_start_date
+    )
+    day_rain = LazyField(LOOP_RECORD_OFFSETS, "day_rain")
+    month_rain = LazyField(LOOP_RECORD_OFFSETS, "month_rain")
+    year_rain = LazyField(LOOP_RECORD_OFFSETS, "year_rain")
+    day_et = LazyField(LOOP_RECORD_OFFSETS, "day_et")
+    month_et = LazyField(LOOP_RECORD_OFFSETS, "month_et")
+    year_et = LazyField(LOOP_RECORD_OFFSETS, "year_et")
+    soil_moistures = LazyField(
+        LOOP_RECORD_OFFSETS, "soil_moistures", optional_sensor_values
+    )
+    leaf_wetnesses = LazyField(
+        LOOP_RECORD_OFFSETS, "leaf_wetnesses", optional_sensor_values
+    )
+    inside_alarms = LazyField(LOOP_RECORD_OFFSETS, "inside_alarms")
+    rain_alarms = LazyField(LOOP_RECORD_OFFSETS, "rain_alarms")
+    outside_alarms = LazyField(LOOP_RECORD_OFFSETS, "outside_alarms")
+    extra_temperature_humidity_alarms = LazyField(
+        LOOP_RECORD_OFFSETS, "extra_temperature_humidity_alarms"
+    )
+    soil_leaf_alarms = LazyField(LOOP_RECORD_OFFSETS, "soil_leaf_alarms")
+    transmitter_battery_status = LazyField(
+        LOOP_RECORD_OFFSETS, "transmitter_battery_status"
+    )
+
+    def __init__(
+        self,
+        record_bytes: bytes,
+        identifier: Optional[int] = None,
+        observation_made_at: Optional[datetime.datetime] = None,
+    ) -> None:
+        record = memoryview(record_bytes)
+        if len(record) != LOOP_RECORD_SIZE_BYTES:
+            raise ValueError(
+                "Records should be %d bytes in length. It is %d"
+                % (LOOP_RECORD_SIZE_BYTES, len(record))
+            )
+        if not record.readonly:
+            record = memoryview(bytes(record))
+        if record[LOOP_RECORD_OFFSETS["packet_type"][0]] == LOOP2_PACKET_TYPE:
+            raise ValueError("LOOP2 Packet Not Supported")
+        self.record = record
+        self.observed_at = observation_made_at or datetime.datetime.now(
+            local_timezone()
+        )
+        self._observation_made_at = None
+        self._identifier = identifier or None
+
+    @classmethod
+    def init_with_bytes(
+        cls,
+        record_bytes: bytes,
+        identifier: Optional[int] = None,
+        observation_made_at: Optional[datetime.datetime] = None,
+    ) -> "LoopPacketView":
+        """Creates a view of a record, mirroring `StationObservation`."""
+        return cls(record_bytes, identifier, observation_made_at)
+
+
+# Fields that are only framing, never decoded into a record.
+FRAMING_FIELDS = ("header", "packet_type", "line_terminator", "crc")
+
+
+class RecordLayout(object):
+    """
+    A fixed record layout and how to convert each of its fields.
+
+    Fields named in `FRAMING_FIELDS` or starting with `unused` are compiled
+    as padding, every other field is decoded by `decode` through its entry
+    in `conversions`, or kept as is without one.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        packet_type: int,
+        fields: Tuple[Tuple[str, str], ...],
+        conversions: Dict[str, callable],
+    ) -> None:
+        self.name = name
+        self.packet_type = packet_type
+        self.fields = fields
+        self.conversions = conversions
+        self.field_names = tuple(
+            field_name
+            for field_name, _ in fields
+            if field_name not in FRAMING_FIELDS and not field_name.startswith("unused")
+        )
+        self.struct = compile_layout(fields, self.field_names)
+        self.offsets = layout_offsets(fields)
+        if self.struct.size != LOOP_RECORD_SIZE_BYTES:
+            raise ValueError("%s layout is %d bytes" % (name, self.struct.size))
+
+    def validate(self, record_bytes: bytes) -> None:
+        """Checks the length and packet type of a record."""
+        if len(record_bytes) != LOOP_RECORD_SIZE_BYTES:
+            raise ValueError(
+                "Records should be %d bytes in length. It is %d"
+                % (LOOP_RECORD_SIZE_BYTES, len(record_bytes))
+            )
+        packet_type = record_bytes[self.offsets["packet_type"][0]]
+        if packet_type != self.packet_type:
+            raise ValueError(
+                "Expected a %s packet, got packet type %d" % (self.name, packet_type)
+            )
+
+    def decode(self, record_bytes: bytes) -> Dict:
+        """Decodes and converts every field of a record."""
+        self.validate(record_bytes)
+        conversions = self.conversions
+        decoded = {}
+        for field_name, value in zip(
+            self.field_names, self.struct.unpack(record_bytes)
+        ):
+            conversion = conversions.get(field_name)
+            decoded[field_name] = value if conversion is None else conversion(value)
+        return decoded
+
+
+def tenths(value: int) -> float:
+    return value / 10.0
+
+
+def thousandths(value: int) -> float:
+    return value / 1000.0
+
+
+def console_battery_voltage(value: int) -> float:
+    return ((value * 300.0) / 512.0) / 100.0
+
+
+LOOP_LAYOUT = RecordLayout(
+    "LOOP",
+    LOOP_PACKET_TYPE,
+    LOOP_RECORD_LAYOUT,
+    {
+        "bar_trend": BarTrend,
+        "barometer": thousandths,
+        "inside_temperature": tenths,
+        "inside_humidity": float,
+        "outside_temperature": tenths,
+        "outside_humidity": float,
+        "extra_temperatures": offset_temperatures,
+        "soil_temperatures": offset_temperatures,
+        "leaf_temperatures": offset_temperatures,
+        "extra_humidities": optional_sensor_values,
+        "uv_index": optional_sensor_byte,
+        "solar_radiation": optional_solar_radiation,
+        "start_date_of_storm": storm_start_date,
+        "soil_moistures": optional_sensor_values,
+        "leaf_wetnesses": optional_sensor_values,
+        "console_battery_voltage": console_battery_voltage,
+        "sunrise": make_time,
+        "sunset": make_time,
+    },
+)
+
+LOOP2_LAYOUT = RecordLayout(
+    "LOOP2",
+    LOOP2_PACKET_TYPE,
+    LOOP2_RECORD_LAYOUT,
+    {
+        "bar_trend": BarTrend,
+        "barometer": thousandths,
+        "inside_temperature": tenths,
+        "inside_humidity": float,
+        "outside_temperature": tenths,
+        "outside_humidity": float,
+        "ten_min_avg_wind_speed": tenths,
+        "two_min_avg_wind_speed": tenths,
+        "uv_index": optional_sensor_byte,
+        "solar_radiation": optional_solar_radiation,
+        "start_date_of_storm": storm_start_date,
+        "absolute_barometric_pressure": thousandths,
+        "altimeter_setting": thousandths,
+    },
+)
+
+RECORD_LAYOUTS = {
+    LOOP_LAYOUT.packet_type: LOOP_LAYOUT,
+    LOOP2_LAYOUT.packet_type: LOOP2_LAYOUT,
+}
+
+
+class Loop2Record(BaseRecord):
+    """Every field of a LOOP2 record, decoded through `LOOP2_LAYOUT`."""
+
+    __slots__ = LOOP2_LAYOUT.field_names + (
+        "observed_at",
+        "_observation_made_at",
+        "_identifier",
+    )
+
+    def wind_direction_text(self) -> str:
+        """Produces a string description of the wind direction."""
+        return wind_direction_text(self.wind_direction)
+
+    def to_dict(self) -> Dict:
+        """A dictionary representation of the record."""
+        record_dict = {}
+        for field_name in LOOP2_LAYOUT.field_names:
+            value = getattr(self, field_name)
+            if isinstance(value, (datetime.date, datetime.time)):
+                value = value.isoformat()
+            record_dict[field_name] = value
+        record_dict["wind_direction_text"] = self.wind_direction_text()
+        record_dict["observation_made_at"] = self.observation_made_at
+        record_dict["identifier"] = self.identifier
+        return record_dict
+
+    @classmethod
+    def init_with_bytes(
+        cls,
+        record_bytes: bytes,
+        identifier: Optional[int] = None,
+        observation_made_at: Optional[datetime.datetime] = None,
+    ) -> "Loop2Record":
+        """Creates a LOOP2 record from record of bytes."""
+        record = cls.__new__(cls)
+        for field_name, value in LOOP2_LAYOUT.decode(record_bytes).items():
+            setattr(record, field_name, value)
+        record.observed_at = observation_made_at or datetime.datetime.now(
+            local_timezone()
+        )
+        record._observation_made_at = None
+        record._identifier = identifier or None
+        return record
+
+
+def decode_record(
+    record_bytes: bytes,
+    identifier: Optional[int] = None,
+    observation_made_at: Optional[datetime.datetime] = None,
+):
+    """Decodes a LOOP or LOOP2 record, by its packet type, into a full record."""
+    if len(record_bytes) != LOOP_RECORD_SIZE_BYTES:
+        raise ValueError(
+            "Records should be %d bytes in length. It is %d"
+            % (LOOP_RECORD_SIZE_BYTES, len(record_bytes))
+        )
+    packet_type = record_bytes[LOOP_RECORD_OFFSETS["packet_type"][0]]
+    if packet_type == LOOP2_PACKET_TYPE:
+        return Loop2Record.init_with_bytes(
+            record_bytes, identifier, observation_made_at
+        )
+    return LoopRecord.init_with_bytes(record_bytes, identifier, observation_made_at)
+
+
+# `struct` format characters to NumPy dtypes, for `LOOP_RECORD_LAYOUT`.
+NUMPY_FIELD_TYPES = {"b": "i1", "B": "u1", "h": "<i2", "H": "<u2"}
+
+
+def require_numpy():
+    """Imports NumPy, which is only needed for the batch decoders."""
+    try:
+        import numpy
+    except ImportError as e:
+        raise ImportError(
+            "NumPy is required for batch decoding, install skyentific[numpy]."
+        ) from e
+    return numpy
+
+
+def layout_dtype(layout: Iterable[Tuple[str, str]]):
+    """Builds a NumPy structured dtype from a record layout."""
+    numpy = require_numpy()
+    fields = []
+    for name, field_format in layout:
+        if field_format.endswith("s"):
+            fields.append((name, "u1", (int(field_format[:-1]),)))
+        else:
+            fields.append((name, NUMPY_FIELD_TYPES[field_format]))
+    return numpy.dtype(fields)
+
+
+def crc16_rows(rows) -> "numpy.ndarray":
+    """Calculates the CRC16 of every row of a 2D `uint8` array at once."""
+    numpy = require_numpy()
+    table = numpy.array(CRC16_TABLE, dtype=numpy.uint16)
+    crc = numpy.zeros(rows.shape[0], dtype=numpy.uint16)
+    for column in range(rows.shape[1]):
+        crc = ((crc & 0x00FF) << 8) ^ table[(crc >> 8) ^ rows[:, column]]
+    return crc
+
+
+def decode_loop_records(
+    buffer: bytes, validate_crc: bool = True
+) -> Dict[str, "numpy.ndarray"]:
+    """
+    Decodes N concatenated LOOP records into columns.
+
+    The buffer is viewed as a structured array without copying. Values are
+    scaled the same way as `StationObservation.init_with_bytes`, sunrise and
+    sunset are left as `hour * 100 + minute`. The scalar `LoopRecord` fields
+    are included raw, with missing sensor values left as sent.
+    """
+    numpy = require_numpy()
+    raw = numpy.frombuffer(buffer, dtype=numpy.uint8)
+    if raw.size % LOOP_RECORD_SIZE_BYTES:
+        raise ValueError(
+            "Buffer should be a multiple of %d bytes in length. It is %d"
+            % (LOOP_RECORD_SIZE_BYTES, raw.size)
+        )
+    return decode_loop_rows(raw.reshape(-1, LOOP_RECORD_SIZE_BYTES), validate_crc)
+
+
+def decode_loop_rows(
+    rows: "numpy.ndarray", validate_crc: bool = True
+) -> Dict[str, "numpy.ndarray"]:
+    """
+    Decodes a 2D `uint8` array of LOOP records, one per row, into columns.
+
+    Only each row has to be contiguous, so the rows can be a strided view
+    into larger frames, such as those of a capture file, and are still read
+    without copying. Otherwise as for `decode_loop_records`.
+    """
+    numpy = require_numpy()
+    if rows.ndim != 2 or rows.shape[1] != LOOP_RECORD_SIZE_BYTES:
+        raise ValueError(
+            "Rows should be %d bytes in length. They are %s"
+            % (LOOP_RECORD_SIZE_BYTES, rows.shape[1:])
+        )
+    if validate_crc:
+        crc = crc16_rows(rows)
+        if crc.any():
+            raise BadCRC(
+                "%d of %d records failed the CRC check"
+                % (numpy.count_nonzero(crc), crc.size)
+            )
+    records = rows.view(layout_dtype(LOOP_RECORD_LAYOUT))[:, 0]
+    if (records["packet_type"] == LOOP2_PACKET_TYPE).any():
+        raise ValueError("LOOP2 Packet Not Supported")
+    return {
+        "bar_trend": records["bar_trend"].astype(numpy.int64),
+        "barometer": records["barometer"] / 1000.0,
+        "inside_temperature": records["inside_temperature"] / 10.0,
+        "inside_humidity": records["inside_humidity"].astype(numpy.float64),
+        "outside_temperature": records["outside_temperature"] / 10.0,
+        "outside_humidity": records["outside_humidity"].astype(numpy.float64),
+        "wind_speed": records["wind_speed"].astype(numpy.int64),
+        "ten_min_avg_wind_speed": records["ten_min_avg_wind_speed"].astype(numpy.int64),
+        "wind_direction": records["wind_direction"].astype(numpy.int64),
+        "rain_rate": records["rain_rate"].astype(numpy.int64),
+        "console_battery_voltage": (
+            (records["console_battery_voltage"] * 300.0) / 512.0
         )
+        / 100.0,
+        "forecast_icons": records["forecast_icons"].astype(numpy.int64),
+        "forecast_rule_number": records["forecast_rule_number"].astype(numpy.int64),
+        "sunrise": records["sunrise"].astype(numpy.int64),
+        "sunset": records["sunset"].astype(numpy.int64),
+        "next_record": records["next_record"].astype(numpy.int64),
+        "uv_index": records["uv_index"].astype(numpy.int64),
+        "solar_radiation": records["solar_radiation"].astype(numpy.int64),
+        "storm_rain": records["storm_rain"].astype(numpy.int64),
+        "day_rain": records["day_rain"].astype(numpy.int64),
+        "month_rain": records["month_rain"].astype(numpy.int64),
+        "year_rain": records["year_rain"].astype(numpy.int64),
+        "day_et": records["day_et"].astype(numpy.int64),
+        "month_et": records["month_et"].astype(numpy.int64),
+        "year_et": records["year_et"].astype(numpy.int64),
+        "transmitter_battery_status": records["transmitter_battery_status"].astype(
+            numpy.int64
+        ),
+    }
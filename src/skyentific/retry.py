@@ -0,0 +1,162 @@
+"""
+Retry policies for talking to flaky loggers.
+
+A `RetryPolicy` retries a call with exponential backoff and jitter, bounded
+by a number of attempts and an optional deadline. Policies can be
+overridden per exception class, and every run can record its attempts and
+time spent in a `RetryStats`.
+"""
+
+# Standard Library
+import logging
+import random
+import socket
+import time
+from typing import Callable, Dict, Optional, Tuple, Type
+
+# Skyentific Code
+from .exceptions import BadCRC, NotAcknowledged, UnknownResponseCode
+
+RETRYABLE_EXCEPTIONS: Tuple[Type[BaseException], ...] = (
+    BadCRC,
+    NotAcknowledged,
+    UnknownResponseCode,
+    socket.timeout,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class RetryStats(object):
+    """Attempts, errors and time spent across one or more retried calls."""
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.attempts = 0
+        self.errors: Dict[str, int] = {}
+        self.elapsed = 0.0
+        self.delayed = 0.0
+        self.last_error: Optional[BaseException] = None
+
+    def record_error(self, error: BaseException) -> None:
+        name = type(error).__name__
+        self.errors[name] = self.errors.get(name, 0) + 1
+        self.last_error = error
+
+    def to_dict(self) -> Dict:
+        """A dictionary representation of the stats."""
+        return {
+            "calls": self.calls,
+            "attempts": self.attempts,
+            "errors": dict(self.errors),
+            "elapsed": self.elapsed,
+            "delayed": self.delayed,
+        }
+
+
+class RetryPolicy(object):
+    """
+    Exponential backoff with jitter.
+
+    The delay before retry `n` is `base_delay * multiplier ** (n - 1)`,
+    capped at `max_delay` and spread by +/- `jitter` (a fraction). Only
+    exceptions in `retry_on`, or with an entry in `overrides`, are retried.
+    `overrides` maps an exception class to the policy used when it is
+    raised, e.g. a slower backoff for `NotAcknowledged` than for `BadCRC`.
+    An error raised from another, such as the `NotAcknowledged` that
+    `get_current` raises from a `socket.timeout`, is matched by its cause
+    first.
+    No retry is started that would end after `deadline` seconds.
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = 5,
+        base_delay: float = 0.5,
+        max_delay: float = 30.0,
+        multiplier: float = 2.0,
+        jitter: float = 0.1,
+        deadline: Optional[float] = None,
+        retry_on: Tuple[Type[BaseException], ...] = RETRYABLE_EXCEPTIONS,
+        overrides: Optional[Dict[Type[BaseException], "RetryPolicy"]] = None,
+        random_function: Callable[[], float] = random.random,
+    ) -> None:
+        if max_attempts < 1:
+            raise ValueError("max_attempts must be at least 1.")
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.multiplier = multiplier
+        self.jitter = jitter
+        self.deadline = deadline
+        self.retry_on = tuple(retry_on)
+        self.overrides = dict(overrides or {})
+        self.random_function = random_function
+
+    def policy_for(self, error: BaseException) -> Optional["RetryPolicy"]:
+        """Returns the policy that applies to an error, or None to not retry."""
+        errors = (error,) if error.__cause__ is None else (error.__cause__, error)
+        for candidate in errors:
+            for exception_class, policy in self.overrides.items():
+                if isinstance(candidate, exception_class):
+                    return policy
+        for candidate in errors:
+            if isinstance(candidate, self.retry_on):
+                return self
+        return None
+
+    def delay(self, attempt: int) -> float:
+        """The delay, in seconds, after failed attempt number `attempt`."""
+        delay = min(self.base_delay * self.multiplier ** (attempt - 1), self.max_delay)
+        if self.jitter:
+            delay *= 1.0 + self.jitter * (2.0 * self.random_function() - 1.0)
+        return max(delay, 0.0)
+
+    def call(
+        self,
+        function: Callable,
+        stats: Optional[RetryStats] = None,
+        sleep: Callable[[float], None] = time.sleep,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Calls `function` until it succeeds or the policy gives up.
+
+        The last error is re-raised when attempts or the deadline run out,
+        and any error the policy does not cover is raised straight away.
+        """
+        stats = stats if stats is not None else RetryStats()
+        stats.calls += 1
+        started_at = clock()
+        attempt = 0
+        try:
+            while True:
+                attempt += 1
+                stats.attempts += 1
+                try:
+                    return function()
+                except Exception as e:
+                    policy = self.policy_for(e)
+                    if policy is None:
+                        raise
+                    stats.record_error(e)
+                    if attempt >= policy.max_attempts:
+                        logger.warning("Giving up after %d attempts: %r", attempt, e)
+                        raise
+                    delay = policy.delay(attempt)
+                    if (
+                        self.deadline is not None
+                        and clock() - started_at + delay > self.deadline
+                    ):
+                        logger.warning("Retry deadline exceeded: %r", e)
+                        raise
+                    logger.info(
+                        "Attempt %d failed with %r, retrying in %.2fs",
+                        attempt,
+                        e,
+                        delay,
+                    )
+                    sleep(delay)
+                    stats.delayed += delay
+        finally:
+            stats.elapsed += clock() - started_at
@@ -0,0 +1,150 @@
+"""
+Compact JSON and NDJSON for observations.
+
+Records are encoded by orjson when it is installed (`pip install
+skyentific[orjson]`). Otherwise the standard library encodes them, except
+that a `StationObservation` is written straight into a format string
+without building its `to_dict` dictionary first. Output is compact, with
+no spaces after separators, and is returned as bytes ready for a socket or
+message bus:
+
+    payload = dumps(observation)
+    batch = dumps_ndjson(observations)
+"""
+
+# Standard Library
+import functools
+import json
+from json.encoder import encode_basestring_ascii
+from typing import IO, Any, Callable, Iterable, Optional
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+# Skyentific Code
+from .models import StationObservation
+
+JSON_BACKEND = "json"
+ORJSON_BACKEND = "orjson"
+
+# The keys of `BaseObservation.to_dict`, in order, with the conversion each
+# value is written with. `observation_json` fills them in the same order.
+OBSERVATION_FIELDS = (
+    ("bar_trend", "%d"),
+    ("barometer", "%r"),
+    ("inside_temperature", "%r"),
+    ("inside_humidity", "%r"),
+    ("outside_temperature", "%r"),
+    ("outside_humidity", "%r"),
+    ("wind_speed", "%d"),
+    ("ten_min_avg_wind_speed", "%d"),
+    ("wind_direction", "%d"),
+    ("wind_direction_text", "%s"),
+    ("rain_rate", "%d"),
+    ("console_battery_voltage", "%r"),
+    ("forecast_icons", "%d"),
+    ("forecast_icons_text", "%s"),
+    ("forecast_rule_number", "%d"),
+    ("forecast_text", "%s"),
+    ("sunrise", "%s"),
+    ("sunset", "%s"),
+    ("observation_made_at", "%s"),
+    ("identifier", "%d"),
+)
+OBSERVATION_TEMPLATE = "{%s}" % ",".join(
+    '"%s":%s' % field for field in OBSERVATION_FIELDS
+)
+
+def default_backend() -> str:
+    return ORJSON_BACKEND if orjson is not None else JSON_BACKEND
+
+
+def observation_json(observation: StationObservation) -> str:
+    """
+    Compact JSON for a decoded observation, matching
+    `json.dumps(observation.to_dict(), separators=(",", ":"))`.
+
+    Numbers are formatted as decoded, integers with %d and floats with
+    their repr, which is what the standard library emits. Raises TypeError
+    for fields that are not numbers, e.g. None.
+    """
+    return OBSERVATION_TEMPLATE % (
+        observation.bar_trend,
+        float(observation.barometer),
+        float(observation.inside_temperature),
+        float(observation.inside_humidity),
+        float(observation.outside_temperature),
+        float(observation.outside_humidity),
+        observation.wind_speed,
+        observation.ten_min_avg_wind_speed,
+        observation.wind_direction,
+        encode_basestring_ascii(observation.wind_direction_text()),
+        observation.rain_rate,
+        float(observation.console_battery_voltage),
+        observation.forecast_icons,
+        encode_basestring_ascii(observation.forecast_icons_text()),
+        observation.forecast_rule_number,
+        encode_basestring_ascii(observation.forecast_text()),
+        encode_basestring_ascii(observation.sunrise.isoformat()),
+        encode_basestring_ascii(observation.sunset.isoformat()),
+        encode_basestring_ascii(observation.observation_made_at),
+        observation.identifier,
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def record_encoder(backend: Optional[str] = None) -> Callable[[Any], bytes]:
+    """
+    A function encoding a record to compact JSON bytes.
+
+    orjson encodes `to_dict` faster than the format string fills, so the
+    format string is only used with the standard library backend.
+    """
+    backend = backend or default_backend()
+    if backend == ORJSON_BACKEND:
+        if orjson is None:
+            raise ImportError(
+                "The orjson backend needs orjson: pip install skyentific[orjson]"
+            )
+        return lambda record: orjson.dumps(record.to_dict())
+    if backend != JSON_BACKEND:
+        raise ValueError("Unknown JSON backend %r" % backend)
+
+    encode = json.JSONEncoder(separators=(",", ":")).encode
+
+    def encode_record(record: Any) -> bytes:
+        if type(record) is StationObservation:
+            try:
+                return observation_json(record).encode()
+            except TypeError:
+                pass
+        return encode(record.to_dict()).encode()
+
+    return encode_record
+
+
+def dumps(record: Any, backend: Optional[str] = None) -> bytes:
+    """Compact JSON bytes for one record."""
+    return record_encoder(backend)(record)
+
+
+def dumps_ndjson(records: Iterable[Any], backend: Optional[str] = None) -> bytes:
+    """Newline delimited JSON for a batch of records, in one buffer."""
+    encode = record_encoder(backend)
+    lines = [encode(record) for record in records]
+    lines.append(b"")
+    return b"\n".join(lines)
+
+
+def write_ndjson(
+    records: Iterable[Any], stream: IO[bytes], backend: Optional[str] = None
+) -> int:
+    """Writes records to a binary stream as NDJSON, returning the count."""
+    encode = record_encoder(backend)
+    count = 0
+    for record in records:
+        stream.write(encode(record) + b"\n")
+        count += 1
+    return count
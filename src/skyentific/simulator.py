@@ -0,0 +1,535 @@
+"""
+A simulated WeatherLink IP logger for load and latency testing.
+
+`SimulatedLogger` is a TCP server that answers the wake-up, `LOOP n`,
+`LPS` and `DMPAFT` commands with CRC-valid synthetic records, so client
+throughput, concurrency and reconnect handling can be measured against
+real sockets without hardware. `SimulatorFaults` injects latency, NACKs,
+bad CRCs, partial writes and disconnects at configurable rates.
+
+Run `python -m skyentific.simulator --port 22222` to serve until stopped.
+"""
+
+# Standard Library
+import argparse
+import datetime
+import functools
+import logging
+import random
+import select
+import socket
+import socketserver
+import struct
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Skyentific Code
+from .archive import (
+    ARCHIVE_RECORD_LAYOUT,
+    ARCHIVE_RECORD_SIZE_BYTES,
+    ARCHIVE_RECORD_STRUCT,
+    ARCHIVE_RECORDS_PER_PAGE,
+    CANCEL_CODE,
+    pack_date_stamp,
+    record_stamp,
+)
+from .models import LOOP2_RECORD_LAYOUT, LOOP_RECORD_LAYOUT, compile_layout
+from .utils import (
+    ACKNOWLEDGED_RESPONSE_CODE,
+    BAD_CRC_RESPONSE_CODE,
+    NACK_RESPONSE_CODE,
+    WAKE_UP_RESPONSE,
+    crc16,
+)
+
+ARCHIVE_INTERVAL = datetime.timedelta(minutes=5)
+
+logger = logging.getLogger(__name__)
+
+
+@functools.lru_cache(maxsize=None)
+def layout_struct(layout: Tuple[Tuple[str, str], ...]) -> struct.Struct:
+    return compile_layout(layout)
+
+
+def pack_record(layout: Iterable[Tuple[str, str]], values: Dict[str, object]) -> bytes:
+    """
+    Packs a record from a layout table and appends its CRC.
+
+    Fields missing from `values` are zero, or dashed (0xFF) for byte
+    arrays, which is how the console reports absent sensors.
+    """
+    layout = tuple(layout)
+    record_struct = layout_struct(layout)
+    fields = []
+    for name, field_format in layout:
+        if name in values:
+            fields.append(values[name])
+        elif name == "crc":
+            fields.append(b"\x00\x00")
+        elif field_format.endswith("s"):
+            fill = b"\x00" if name.startswith("unused_") else b"\xff"
+            fields.append(fill * int(field_format[:-1]))
+        else:
+            fields.append(0)
+    record = record_struct.pack(*fields)[:-2]
+    return record + crc16(record).to_bytes(2, "big")
+
+
+def synthetic_loop_packet(sequence: int) -> bytes:
+    """A LOOP packet whose readings drift with `sequence`."""
+    return pack_record(
+        LOOP_RECORD_LAYOUT,
+        {
+            "header": b"LOO",
+            "bar_trend": 0,
+            "packet_type": 0,
+            "next_record": sequence % 2560,
+            "barometer": 29900 + sequence % 100,
+            "inside_temperature": 700,
+            "inside_humidity": 40,
+            "outside_temperature": 600 + sequence % 50,
+            "wind_speed": sequence % 20,
+            "ten_min_avg_wind_speed": 8,
+            "wind_direction": sequence * 7 % 360 + 1,
+            "outside_humidity": 60,
+            "uv_index": 0xFF,
+            "solar_radiation": 0x7FFF,
+            "start_date_of_storm": 0xFFFF,
+            "console_battery_voltage": 778,
+            "forecast_icons": 6,
+            "sunrise": 630,
+            "sunset": 1945,
+            "line_terminator": b"\n\r",
+        },
+    )
+
+
+def synthetic_loop2_packet(sequence: int) -> bytes:
+    """A LOOP2 packet whose readings drift with `sequence`."""
+    return pack_record(
+        LOOP2_RECORD_LAYOUT,
+        {
+            "header": b"LOO",
+            "bar_trend": 0,
+            "packet_type": 1,
+            "barometer": 29900 + sequence % 100,
+            "inside_temperature": 700,
+            "inside_humidity": 40,
+            "outside_temperature": 600 + sequence % 50,
+            "wind_speed": sequence % 20,
+            "wind_direction": sequence * 7 % 360 + 1,
+            "ten_min_avg_wind_speed": 80,
+            "two_min_avg_wind_speed": 75,
+            "ten_min_wind_gust": 15,
+            "wind_direction_for_ten_min_wind_gust": 270,
+            "dew_point": 45,
+            "outside_humidity": 60,
+            "heat_index": 60,
+            "wind_chill": 58,
+            "thsw_index": 61,
+            "uv_index": 0xFF,
+            "solar_radiation": 0x7FFF,
+            "start_date_of_storm": 0xFFFF,
+            "altimeter_setting": 29950,
+            "line_terminator": b"\n\r",
+        },
+    )
+
+
+def synthetic_archive_records(
+    count: int, end: Optional[datetime.datetime] = None
+) -> List[bytes]:
+    """`count` archive records five minutes apart, the last one at `end`."""
+    end = (end or datetime.datetime.now()).replace(second=0, microsecond=0)
+    records = []
+    for index in range(count):
+        timestamp = end - ARCHIVE_INTERVAL * (count - 1 - index)
+        values = dict(
+            (name, b"\xff" * int(field_format[:-1]) if "s" in field_format else 0)
+            for name, field_format in ARCHIVE_RECORD_LAYOUT
+        )
+        values["date_stamp"], values["time_stamp"] = pack_date_stamp(timestamp)
+        values["outside_temperature"] = 600 + index % 50
+        values["high_outside_temperature"] = 610 + index % 50
+        values["low_outside_temperature"] = 590 + index % 50
+        values["barometer"] = 29900 + index % 100
+        values["inside_temperature"] = 700
+        values["outside_humidity"] = 60
+        values["record_type"] = 0
+        records.append(
+            ARCHIVE_RECORD_STRUCT.pack(
+                *(values[name] for name, _ in ARCHIVE_RECORD_LAYOUT)
+            )
+        )
+    return records
+
+
+class SimulatorFaults(object):
+    """
+    How often the simulator misbehaves.
+
+    Rates are probabilities per response. `latency` is slept before every
+    response, `partial_write_delay` between the halves of a partial write.
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        nack_rate: float = 0.0,
+        bad_crc_rate: float = 0.0,
+        partial_write_rate: float = 0.0,
+        disconnect_rate: float = 0.0,
+        partial_write_delay: float = 0.01,
+        seed: Optional[int] = None,
+    ) -> None:
+        self.latency = latency
+        self.nack_rate = nack_rate
+        self.bad_crc_rate = bad_crc_rate
+        self.partial_write_rate = partial_write_rate
+        self.disconnect_rate = disconnect_rate
+        self.partial_write_delay = partial_write_delay
+        self.random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def happens(self, rate: float) -> bool:
+        if not rate:
+            return False
+        with self._lock:
+            return self.random.random() < rate
+
+
+class SimulatorStats(object):
+    """What the simulator has served."""
+
+    def __init__(self) -> None:
+        self.connections = 0
+        self.commands = 0
+        self.packets = 0
+        self.pages = 0
+        self.faults: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def count(self, name: str, amount: int = 1) -> None:
+        with self._lock:
+            setattr(self, name, getattr(self, name) + amount)
+
+    def fault(self, name: str) -> None:
+        with self._lock:
+            self.faults[name] = self.faults.get(name, 0) + 1
+
+    def to_dict(self) -> Dict[str, object]:
+        return {
+            "connections": self.connections,
+            "commands": self.commands,
+            "packets": self.packets,
+            "pages": self.pages,
+            "faults": dict(self.faults),
+        }
+
+
+class Disconnect(Exception):
+    """Raised inside a handler to drop the connection."""
+
+
+class LoggerHandler(socketserver.BaseRequestHandler):
+    """Speaks the console protocol on one connection."""
+
+    server: "SimulatedLogger"
+
+    def setup(self) -> None:
+        self.buffer = bytearray()
+        self.faults = self.server.faults
+        # The ACK and the packet are separate writes; without this Nagle's
+        # algorithm holds the packet until the client's delayed ACK.
+        self.request.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.server.stats.count("connections")
+        self.server.track(self.request)
+
+    def finish(self) -> None:
+        self.server.untrack(self.request)
+
+    def handle(self) -> None:
+        try:
+            while True:
+                line = self.read_line()
+                if line is None:
+                    return
+                self.server.stats.count("commands")
+                self.dispatch(line)
+        except (Disconnect, OSError):
+            return
+
+    def dispatch(self, line: bytes) -> None:
+        words = line.split()
+        if not words:
+            self.respond(WAKE_UP_RESPONSE, fault_free=True)
+        elif words[0] == b"LOOP" and len(words) == 2 and words[1].isdigit():
+            if self.acknowledge():
+                self.stream(int(words[1]), synthetic_loop_packet)
+        elif words[0] == b"LPS" and len(words) == 3:
+            if self.acknowledge():
+                types = int(words[1])
+                makers = []
+                if types & 1:
+                    makers.append(synthetic_loop_packet)
+                if types & 2:
+                    makers.append(synthetic_loop2_packet)
+                self.stream(int(words[2]), *makers or [synthetic_loop_packet])
+        elif words[0] == b"DMPAFT":
+            if self.acknowledge():
+                self.dump_after()
+        else:
+            self.respond(bytes((NACK_RESPONSE_CODE,)), fault_free=True)
+
+    def read_line(self) -> Optional[bytes]:
+        while b"\n" not in self.buffer:
+            data = self.request.recv(4096)
+            if not data:
+                return None
+            self.buffer += data
+        index = self.buffer.index(b"\n") + 1
+        line = bytes(self.buffer[:index])
+        del self.buffer[:index]
+        return line
+
+    def read_exactly(self, size: int) -> bytes:
+        while len(self.buffer) < size:
+            data = self.request.recv(4096)
+            if not data:
+                raise Disconnect()
+            self.buffer += data
+        data = bytes(self.buffer[:size])
+        del self.buffer[:size]
+        return data
+
+    def interrupted(self, timeout: float) -> bool:
+        """Whether the client sent anything within `timeout`, which stops a stream."""
+        if self.buffer:
+            return True
+        readable, _, _ = select.select([self.request], [], [], timeout)
+        return bool(readable)
+
+    def acknowledge(self) -> bool:
+        if self.faults.happens(self.faults.nack_rate):
+            self.server.stats.fault("nack")
+            self.respond(bytes((NACK_RESPONSE_CODE,)))
+            return False
+        self.respond(bytes((ACKNOWLEDGED_RESPONSE_CODE,)))
+        return True
+
+    def respond(self, data: bytes, fault_free: bool = False) -> None:
+        """Sends `data`, applying latency, partial writes and disconnects."""
+        faults = self.faults
+        if faults.latency:
+            time.sleep(faults.latency)
+        if fault_free or len(data) < 2:
+            self.request.sendall(data)
+            return
+        if faults.happens(faults.disconnect_rate):
+            self.server.stats.fault("disconnect")
+            self.request.sendall(data[: len(data) // 2])
+            raise Disconnect()
+        if faults.happens(faults.partial_write_rate):
+            self.server.stats.fault("partial_write")
+            self.request.sendall(data[: len(data) // 2])
+            time.sleep(faults.partial_write_delay)
+            self.request.sendall(data[len(data) // 2 :])
+            return
+        self.request.sendall(data)
+
+    def corrupt(self, data: bytes) -> bytes:
+        if self.faults.happens(self.faults.bad_crc_rate):
+            self.server.stats.fault("bad_crc")
+            data = bytearray(data)
+            data[len(data) // 2] ^= 0xFF
+            return bytes(data)
+        return data
+
+    def stream(self, count: int, *makers) -> None:
+        """Sends `count` packets, cycling through `makers`, until interrupted."""
+        for index in range(count):
+            if index and self.interrupted(self.server.packet_interval):
+                return
+            make_packet = makers[index % len(makers)]
+            packet = self.corrupt(make_packet(self.server.next_sequence()))
+            # Counted first, so a client that has the packet sees it counted.
+            self.server.stats.count("packets")
+            self.respond(packet)
+
+    def dump_after(self) -> None:
+        body = self.read_exactly(6)
+        if crc16(body) != 0:
+            self.respond(bytes((BAD_CRC_RESPONSE_CODE,)), fault_free=True)
+            return
+        self.respond(bytes((ACKNOWLEDGED_RESPONSE_CODE,)), fault_free=True)
+        since = (
+            int.from_bytes(body[0:2], "little"),
+            int.from_bytes(body[2:4], "little"),
+        )
+        records = self.server.archive_records
+        first = len(records)
+        for index, record in enumerate(records):
+            if record_stamp(record) > since:
+                first = index
+                break
+        first_page = first // ARCHIVE_RECORDS_PER_PAGE
+        slots = records[first_page * ARCHIVE_RECORDS_PER_PAGE :]
+        pages = -(-len(slots) // ARCHIVE_RECORDS_PER_PAGE)
+        header = pages.to_bytes(2, "little") + (
+            first % ARCHIVE_RECORDS_PER_PAGE if pages else 0
+        ).to_bytes(2, "little")
+        self.respond(header + crc16(header).to_bytes(2, "big"), fault_free=True)
+
+        page_number = 0
+        sent = False
+        while page_number < pages:
+            code = self.read_exactly(1)[0]
+            if code == CANCEL_CODE:
+                return
+            if code == ACKNOWLEDGED_RESPONSE_CODE and sent:
+                page_number += 1
+                if page_number == pages:
+                    return
+            elif code not in (ACKNOWLEDGED_RESPONSE_CODE, NACK_RESPONSE_CODE):
+                self.buffer[0:0] = bytes((code,))
+                return
+            start = page_number * ARCHIVE_RECORDS_PER_PAGE
+            chunk = slots[start : start + ARCHIVE_RECORDS_PER_PAGE]
+            page = (
+                bytes((page_number % 256,))
+                + b"".join(chunk)
+                + b"\xff"
+                * ARCHIVE_RECORD_SIZE_BYTES
+                * (ARCHIVE_RECORDS_PER_PAGE - len(chunk))
+                + b"\x00" * 4
+            )
+            page += crc16(page).to_bytes(2, "big")
+            page = self.corrupt(page)
+            self.server.stats.count("pages")
+            self.respond(page)
+            sent = True
+            if page_number == pages - 1 and not self.interrupted(
+                self.server.last_page_wait
+            ):
+                return
+
+
+class SimulatedLogger(socketserver.ThreadingTCPServer):
+    """
+    A threaded TCP server on localhost that behaves like an IP logger.
+
+    Attributes:
+        faults (SimulatorFaults): The faults to inject.
+        packet_interval (float): Seconds between streamed packets; the
+            console sends one about every two seconds.
+        archive_records (list): The raw records served by `DMPAFT`.
+        stats (SimulatorStats): What has been served so far.
+    """
+
+    daemon_threads = True
+    allow_reuse_address = True
+    # How long to wait for a NAK of the last archive page.
+    last_page_wait = 0.05
+
+    def __init__(
+        self,
+        address: Tuple[str, int] = ("127.0.0.1", 0),
+        faults: Optional[SimulatorFaults] = None,
+        packet_interval: float = 0.0,
+        archive_records: Optional[List[bytes]] = None,
+    ) -> None:
+        self.faults = faults or SimulatorFaults()
+        self.packet_interval = packet_interval
+        self.archive_records = (
+            synthetic_archive_records(100)
+            if archive_records is None
+            else list(archive_records)
+        )
+        self.stats = SimulatorStats()
+        self.connections: List[socket.socket] = []
+        self._connections_lock = threading.Lock()
+        self._sequence = 0
+        self._sequence_lock = threading.Lock()
+        super().__init__(address, LoggerHandler)
+        self.thread = threading.Thread(
+            target=self.serve_forever, args=(0.05,), daemon=True
+        )
+
+    @property
+    def address(self) -> Tuple[str, int]:
+        return self.server_address
+
+    def next_sequence(self) -> int:
+        with self._sequence_lock:
+            self._sequence += 1
+            return self._sequence
+
+    def track(self, connection: socket.socket) -> None:
+        with self._connections_lock:
+            self.connections.append(connection)
+
+    def untrack(self, connection: socket.socket) -> None:
+        """Forgets a connection once its handler is done with it."""
+        with self._connections_lock:
+            self.connections.remove(connection)
+
+    def disconnect_all(self) -> None:
+        """Closes every open accepted connection from the server side."""
+        with self._connections_lock:
+            connections = list(self.connections)
+        for connection in connections:
+            try:
+                connection.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+    def __enter__(self) -> "SimulatedLogger":
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.disconnect_all()
+        self.shutdown()
+        self.server_close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Simulate a WeatherLink IP logger.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=22222)
+    parser.add_argument("--packet-interval", type=float, default=2.0)
+    parser.add_argument("--archive-records", type=int, default=100)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--nack-rate", type=float, default=0.0)
+    parser.add_argument("--bad-crc-rate", type=float, default=0.0)
+    parser.add_argument("--partial-write-rate", type=float, default=0.0)
+    parser.add_argument("--disconnect-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    faults = SimulatorFaults(
+        latency=args.latency,
+        nack_rate=args.nack_rate,
+        bad_crc_rate=args.bad_crc_rate,
+        partial_write_rate=args.partial_write_rate,
+        disconnect_rate=args.disconnect_rate,
+        seed=args.seed,
+    )
+    with SimulatedLogger(
+        (args.host, args.port),
+        faults,
+        args.packet_interval,
+        synthetic_archive_records(args.archive_records),
+    ) as simulator:
+        logger.info("Simulating an IP logger on %s:%d", *simulator.address)
+        try:
+            simulator.thread.join()
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    main()
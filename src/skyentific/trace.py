@@ -0,0 +1,50 @@
+"""
+Structured tracing of the polling path, turned on per station.
+
+Tracing is off for every station until `enable` names it (or `enable()`
+with no arguments traces them all). The hot paths only look up the
+station when some station is traced, so tracing costs nothing otherwise.
+Events go to the `skyentific.trace` logger at INFO, with the station,
+event name and fields attached to the record as `extra` attributes for
+structured handlers:
+
+    trace.enable("192.168.1.100:22222")
+"""
+
+# Standard Library
+import logging
+from typing import FrozenSet
+
+ALL_STATIONS = "*"
+
+logger = logging.getLogger(__name__)
+
+# The traced `host:port` labels; empty when tracing is off.
+stations: FrozenSet[str] = frozenset()
+
+
+def enable(*addresses: str) -> None:
+    """Traces the given `host:port` stations, or all of them."""
+    global stations
+    stations = stations | frozenset(addresses or (ALL_STATIONS,))
+
+
+def disable(*addresses: str) -> None:
+    """Stops tracing the given stations, or all of them."""
+    global stations
+    stations = stations - frozenset(addresses) if addresses else frozenset()
+
+
+def is_traced(station: str) -> bool:
+    return station in stations or ALL_STATIONS in stations
+
+
+def event(station: str, name: str, **fields) -> None:
+    """Logs one trace event for a station."""
+    logger.info(
+        "station=%s event=%s%s",
+        station,
+        name,
+        "".join(" %s=%r" % item for item in fields.items()),
+        extra={"station": station, "event": name, "fields": fields},
+    )
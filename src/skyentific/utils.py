@@ -1,19 +1,29 @@
 # Standard Library
 import datetime
 import logging
+import select
 import socket
-from typing import List, Optional
+import time
+from typing import TYPE_CHECKING, List, Optional, Union
 
-# Third Party Code
-from bitstring import BitStream
+try:
+    # CRC-CCITT (XModem), the same polynomial as `CRC16_TABLE`, in C.
+    from binascii import crc_hqx
+except ImportError:  # pragma: no cover
+    crc_hqx = None
 
 # Supercell Code
+from . import metrics, trace
 from .exceptions import BadCRC, NotAcknowledged, UnknownResponseCode
 
-socket.setdefaulttimeout(2.0)
+if TYPE_CHECKING:
+    from bitstring import BitStream
+
 logger = logging.getLogger(__name__)
 
 SOCKET_BUFFER_SIZE = 16
+# Seconds allowed for each socket call on connections opened by `connect`.
+DEFAULT_TIMEOUT = 2.0
 
 RESPONSE_CODE_SIZE = 1
 
@@ -21,7 +31,11 @@ NACK_RESPONSE_CODE = 0x21
 BAD_CRC_RESPONSE_CODE = 0x18
 ACKNOWLEDGED_RESPONSE_CODE = 0x06
 
-CRC16_TABLE = [
+WAKE_UP_COMMAND = b"\n"
+WAKE_UP_RESPONSE = b"\n\r"
+WAKE_UP_ATTEMPTS = 3
+
+CRC16_TABLE = (
     0x0000,
     0x1021,
     0x2042,
@@ -278,60 +292,197 @@ CRC16_TABLE = [
     0x3EB2,
     0x0ED1,
     0x1EF0,
-]
+)
 
 
-def crc16(data: BitStream) -> int:
+def crc16_python(data: Union[bytes, bytearray, memoryview]) -> int:
     """
-    Calculate CRC16 using the given table.
+    Calculate CRC16 using the given table, one byte at a time.
 
     - `data`: The data to calculate the CRC of
 
     Return calculated value of CRC. Should be 0.
     """
     crc = 0
-    for data_byte in iter(data):
-        high_byte = crc >> 8
-        low_byte = (crc & 0x00FF) << 8
-        table_index = high_byte ^ data_byte
-        table_value = CRC16_TABLE[table_index]
-        crc = low_byte ^ table_value
+    table = CRC16_TABLE
+    for data_byte in data:
+        crc = ((crc & 0x00FF) << 8) ^ table[(crc >> 8) ^ data_byte]
     return crc
 
 
-def connect(host: str, port: int, socket_generator: callable) -> socket.socket:
-    """Connects to a TCP/IP host."""
+def crc16(data: Union[bytes, bytearray, memoryview, "BitStream"]) -> int:
+    """
+    Calculate the CRC16 of a record.
+
+    Uses `binascii.crc_hqx` when available and falls back to
+    `crc16_python` otherwise. A `BitStream` (or anything else with
+    `tobytes`) is converted to bytes first.
+
+    - `data`: The data to calculate the CRC of
+
+    Return calculated value of CRC. Should be 0.
+    """
+    if not isinstance(data, (bytes, bytearray, memoryview)):
+        data = data.tobytes()
+    if crc_hqx is not None:
+        return crc_hqx(data, 0)
+    return crc16_python(data)
+
+
+def connect(
+    host: str,
+    port: int,
+    socket_generator: callable,
+    timeout: Optional[float] = DEFAULT_TIMEOUT,
+) -> socket.socket:
+    """
+    Connects to a TCP/IP host.
+
+    The socket is given `timeout` seconds for the connect and for every
+    call after it (None blocks forever).
+    """
     sock = socket_generator(socket.AF_INET, socket.SOCK_STREAM)
+    sock.settimeout(timeout)
     logger.info("Connecting to %s:%s", host, port)
-    sock.connect((host, port))
+    registry = metrics.active
+    if registry is None and not trace.stations:
+        sock.connect((host, port))
+        return sock
+    station = "%s:%s" % (host, port)
+    metrics.label_socket(sock, station)
+    traced = trace.is_traced(station)
+    started_at = time.perf_counter()
+    try:
+        sock.connect((host, port))
+    except OSError as error:
+        if registry is not None:
+            registry.count_error(station, error)
+        if traced:
+            trace.event(station, "error", phase="connect", error=repr(error))
+        raise
+    finally:
+        elapsed = time.perf_counter() - started_at
+        if registry is not None:
+            registry.observe("connect", elapsed, station)
+    if traced:
+        trace.event(station, "connected", seconds=elapsed)
     return sock
 
 
-def request(sock: socket.socket, body: bytes) -> None:
-    """Send a request to a socket."""
-    sock.sendall(body)
-    response_code = BitStream(receive_data(sock, RESPONSE_CODE_SIZE)).int
+def check_response_code(response_code: int) -> None:
+    """Raises the exception matching a device response code."""
+    if response_code == ACKNOWLEDGED_RESPONSE_CODE:
+        return
     if response_code == NACK_RESPONSE_CODE:
         logger.error("Request was not acknowledged.")
         raise NotAcknowledged()
     elif response_code == BAD_CRC_RESPONSE_CODE:
         logger.error("Request contained a bad CRC, retransmit.")
         raise BadCRC()
-    elif response_code == ACKNOWLEDGED_RESPONSE_CODE:
-        logger.info("Request was acknowledged.")
     else:
         logger.error("Unknown response code %s", response_code)
         raise UnknownResponseCode()
 
 
+def request(sock: socket.socket, body: bytes) -> None:
+    """Send a request to a socket."""
+    sock.sendall(body)
+    response = receive_data(sock, RESPONSE_CODE_SIZE)
+    if not response:
+        raise ConnectionError("Connection closed before the response code.")
+    check_response_code(response[0])
+
+
 def receive_data(sock: socket.socket, buffer_size: Optional[int] = None) -> bytes:
     """Receives data from a socket."""
     return sock.recv(buffer_size or SOCKET_BUFFER_SIZE)
 
 
+def receive_exactly(
+    sock: socket.socket, size: int, buffer: Optional[bytearray] = None
+) -> memoryview:
+    """
+    Receives exactly `size` bytes from a socket.
+
+    The bytes are read with `recv_into` straight into `buffer` (a new
+    `bytearray` if none is given) and returned as a memoryview of it, so a
+    caller can reuse one buffer for every packet.
+    """
+    if buffer is None:
+        buffer = bytearray(size)
+    view = memoryview(buffer)[:size]
+    received = 0
+    while received < size:
+        count = sock.recv_into(view[received:], size - received)
+        if not count:
+            raise ConnectionError(
+                "Connection closed after %d of %d bytes." % (received, size)
+            )
+        received += count
+    return view
+
+
+class PacketReader(object):
+    """Reads fixed size packets from a socket into one reusable buffer."""
+
+    def __init__(self, sock: socket.socket, packet_size: int) -> None:
+        self.sock = sock
+        self.packet_size = packet_size
+        self.buffer = bytearray(packet_size)
+
+    def read(self) -> memoryview:
+        """
+        Reads the next packet.
+
+        The returned view is overwritten by the next call, copy it with
+        `bytes()` to keep it.
+        """
+        return receive_exactly(self.sock, self.packet_size, self.buffer)
+
+
+def wake_up(sock: socket.socket, attempts: int = WAKE_UP_ATTEMPTS) -> None:
+    """
+    Wakes up the console.
+
+    Sends a line feed until the console answers with a line feed and
+    carriage return, raising NotAcknowledged after `attempts` tries.
+    """
+    for attempt in range(attempts):
+        sock.sendall(WAKE_UP_COMMAND)
+        try:
+            response = receive_exactly(sock, len(WAKE_UP_RESPONSE))
+        except socket.timeout:
+            logger.debug("No wake up response on attempt %d.", attempt + 1)
+            continue
+        if response == WAKE_UP_RESPONSE:
+            logger.debug("Console is awake.")
+            return
+        logger.debug("Unexpected wake up response %r.", bytes(response))
+    logger.error("Console did not wake up after %d attempts.", attempts)
+    raise NotAcknowledged()
+
+
+def drain(sock: socket.socket) -> bool:
+    """
+    Discards any bytes waiting on a socket without blocking.
+
+    Returns False if the peer has closed the connection.
+    """
+    while select.select([sock], [], [], 0)[0]:
+        try:
+            data = sock.recv(SOCKET_BUFFER_SIZE * 64)
+        except (BlockingIOError, InterruptedError):
+            return True
+        except OSError:
+            return False
+        if not data:
+            return False
+        logger.debug("Discarded %d stale bytes.", len(data))
+    return True
+
+
 def make_time(time_stamp: int) -> datetime.time:
     """Converts an integer time to a time object."""
-    logger.debug(f"Converting time stamp {time_stamp} to time object.")
     if time_stamp < 0:
         raise ValueError("Time stamp must be positive.")
     if type(time_stamp) is not int:
@@ -340,5 +491,4 @@ def make_time(time_stamp: int) -> datetime.time:
     hour = time_stamp // 100
     minute = time_stamp % 100
     second = 0
-    logger.debug(f"Time stamp {time_stamp} converted to {hour}:{minute}:{second}.")
     return datetime.time(hour=hour, minute=minute, second=second)
@@ -1,7 +1,14 @@
+import asyncio
 import logging
+import socket
+import socketserver
+import threading
 
 logger = logging.getLogger(__name__)
 
+# A socket that never has data, lending MockSocket a descriptor to select on.
+IDLE_SOCKET, _IDLE_PEER = socket.socketpair()
+
 
 class MockSocket:
     """
@@ -68,6 +75,25 @@ class MockSocket:
         self.position += buffer_size
         return partialData
 
+    def recv_into(self, buffer, nbytes: int = 0) -> int:
+        """
+        Receives data from the socket into a buffer.
+
+        Args:
+            buffer: The writable buffer to fill.
+            nbytes (int): The maximum number of bytes to receive.
+
+        Returns:
+            int: The number of bytes received.
+        """
+        data = self.recv(nbytes or len(buffer))
+        buffer[: len(data)] = data
+        return len(data)
+
+    def fileno(self) -> int:
+        """A descriptor that is never readable, so nothing is waiting."""
+        return IDLE_SOCKET.fileno()
+
     def close(self) -> None:
         """
         Closes the socket.
@@ -96,3 +122,76 @@ class MockSocket:
             raise Exception("Socket already open")
         self.host, self.port = address
         self.open = True
+
+
+async def start_mock_server(response: bytes):
+    """
+    Starts a TCP server on localhost that answers each line with `response`.
+
+    Returns the server and a list the received lines are appended to.
+    """
+    received = []
+
+    async def handle(reader, writer):
+        while line := await reader.readline():
+            received.append(line)
+            writer.write(response)
+            await writer.drain()
+        writer.close()
+
+    server = await asyncio.start_server(handle, "127.0.0.1", 0)
+    return server, received
+
+
+class MockLoggerServer(socketserver.ThreadingTCPServer):
+    """
+    A threaded TCP server on localhost that answers lines from a table.
+
+    Attributes:
+        responses (dict): Maps each received line to the bytes sent back.
+        received (list): Every line received, across connections.
+        connections (list): The sockets of accepted connections.
+    """
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, responses):
+        self.responses = responses
+        self.received = []
+        self.connections = []
+
+        server = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                server.connections.append(self.connection)
+                for line in self.rfile:
+                    server.received.append(line)
+                    self.wfile.write(server.responses.get(line, b""))
+
+        super().__init__(("127.0.0.1", 0), Handler)
+        self.thread = threading.Thread(
+            target=self.serve_forever, args=(0.05,), daemon=True
+        )
+
+    @property
+    def address(self):
+        return self.server_address
+
+    def disconnect_all(self):
+        """Closes every accepted connection from the server side."""
+        for connection in self.connections:
+            try:
+                connection.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.disconnect_all()
+        self.shutdown()
+        self.server_close()
@@ -0,0 +1,70 @@
+from unittest import IsolatedAsyncioTestCase
+
+from skyentific.aio import AsyncWeatherLinkClient
+from skyentific.exceptions import BadCRC, NotAcknowledged, SkyentificError
+from skyentific.models import StationObservation
+from skyentific.utils import (
+    ACKNOWLEDGED_RESPONSE_CODE,
+    BAD_CRC_RESPONSE_CODE,
+    NACK_RESPONSE_CODE,
+)
+
+from .mocks import start_mock_server
+
+
+class TestAsyncWeatherLinkClient(IsolatedAsyncioTestCase):
+    loop_packet = b"LOO\x14\x00\xb1\x02It\x1e\x03\x0f\x8a\x02\x02\x03\x8c\x00\xff\xff\xff\xff\xff\xff\xff\xff\xff\xff\xff\xff\xff\xff\xff\x1b\xff\xff\xff\xff\xff\xff\xff\x00\x00V\xff\x7f\x00\x00\xff\xff\x00\x00\x02\x00\x02\x00\x00\x00\x00\x00\x00\x00\xff\xff\xff\xff\xff\xff\xff\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x006\x03\x03\xc0\x1b\x02\xe3\x07\n\r\xee\x00"
+
+    async def start_server(self, response: bytes):
+        server, self.received = await start_mock_server(response)
+        self.addAsyncCleanup(server.wait_closed)
+        self.addCleanup(server.close)
+        return server.sockets[0].getsockname()[1]
+
+    async def test_get_current(self):
+        port = await self.start_server(
+            ACKNOWLEDGED_RESPONSE_CODE.to_bytes(1, "big") + self.loop_packet
+        )
+        async with AsyncWeatherLinkClient("127.0.0.1", port) as client:
+            assert await client.get_current() == self.loop_packet
+            observation = await client.get_current_condition()
+        assert isinstance(observation, StationObservation)
+        assert observation.barometer == 29.769
+        assert self.received == [b"LOOP 1\n", b"LOOP 1\n"]
+        assert not client.connected
+
+    async def test_get_current_connects(self):
+        port = await self.start_server(
+            ACKNOWLEDGED_RESPONSE_CODE.to_bytes(1, "big") + self.loop_packet
+        )
+        client = AsyncWeatherLinkClient("127.0.0.1", port)
+        assert await client.get_current() == self.loop_packet
+        assert client.connected
+        await client.close()
+
+    async def test_response_codes(self):
+        for response_code, exception in (
+            (NACK_RESPONSE_CODE, NotAcknowledged),
+            (BAD_CRC_RESPONSE_CODE, BadCRC),
+        ):
+            port = await self.start_server(response_code.to_bytes(1, "big"))
+            async with AsyncWeatherLinkClient("127.0.0.1", port) as client:
+                with self.assertRaises(exception):
+                    await client.get_current()
+                with self.assertRaises(SkyentificError):
+                    await client.get_current_condition()
+
+    async def test_timeout(self):
+        port = await self.start_server(b"")
+        async with AsyncWeatherLinkClient("127.0.0.1", port, timeout=0.1) as client:
+            with self.assertRaises(NotAcknowledged):
+                await client.get_current()
+            assert not client.connected
+
+    async def test_initialization_error(self):
+        port = await self.start_server(
+            ACKNOWLEDGED_RESPONSE_CODE.to_bytes(1, "big") + self.loop_packet
+        )
+        async with AsyncWeatherLinkClient("127.0.0.1", port) as client:
+            with self.assertRaises(SkyentificError):
+                await client.get_current_condition(lambda record: 1 / 0)
@@ -0,0 +1,165 @@
+import datetime
+import importlib.util
+import os
+import tempfile
+
+from unittest import TestCase, skipUnless
+
+from skyentific.archive import (
+    ARCHIVE_RECORD_LAYOUT,
+    ARCHIVE_RECORD_STRUCT,
+    ArchiveFile,
+    decode_archive_records,
+    download_archive,
+    dump_after_body,
+    pack_date_stamp,
+    unpack_date_stamp,
+)
+from skyentific.exceptions import BadCRC
+from skyentific.utils import crc16
+
+from .mocks import MockSocket
+
+ACK = b"\x06"
+NAK = b"\x21"
+
+
+def make_archive_record(timestamp, outside_temperature=725):
+    values = dict.fromkeys((name for name, _ in ARCHIVE_RECORD_LAYOUT), 0)
+    for name, field_format in ARCHIVE_RECORD_LAYOUT:
+        if field_format.endswith("s"):
+            values[name] = b"\xff" * int(field_format[:-1])
+    values["date_stamp"], values["time_stamp"] = pack_date_stamp(timestamp)
+    values["outside_temperature"] = outside_temperature
+    values["barometer"] = 29920
+    values["outside_humidity"] = 55
+    return ARCHIVE_RECORD_STRUCT.pack(
+        *(values[name] for name, _ in ARCHIVE_RECORD_LAYOUT)
+    )
+
+
+def make_page(sequence, records):
+    records = list(records) + [b"\xff" * 52] * (5 - len(records))
+    body = bytes((sequence,)) + b"".join(records) + b"\x00" * 4
+    return body + crc16(body).to_bytes(2, "big")
+
+
+def make_header(pages, first_record):
+    body = pages.to_bytes(2, "little") + first_record.to_bytes(2, "little")
+    return body + crc16(body).to_bytes(2, "big")
+
+
+START = datetime.datetime(2024, 5, 1, 12, 0)
+RECORDS = [
+    make_archive_record(START + datetime.timedelta(minutes=5 * i), 700 + i)
+    for i in range(7)
+]
+
+
+class TestDateStamps(TestCase):
+    def test_round_trip(self):
+        timestamp = datetime.datetime(2023, 12, 31, 23, 55)
+        self.assertEqual(timestamp, unpack_date_stamp(*pack_date_stamp(timestamp)))
+
+    def test_dump_after_body_has_valid_crc(self):
+        body = dump_after_body(START)
+        self.assertEqual(6, len(body))
+        self.assertEqual(0, crc16(body))
+        self.assertEqual(b"\x00" * 4, dump_after_body(None)[:4])
+
+
+class TestDownloadArchive(TestCase):
+    def test_downloads_pages_skipping_old_records(self):
+        pages = make_page(0, RECORDS[:5]) + make_page(1, RECORDS[5:])
+        sock = MockSocket(ACK + ACK + make_header(2, 2) + pages)
+        buffer = download_archive(sock)
+        self.assertEqual(b"".join(RECORDS[2:]), buffer)
+        self.assertEqual(b"DMPAFT\n" + dump_after_body(None) + ACK + ACK, sock.sentData)
+
+    def test_bad_page_is_requested_again(self):
+        bad_page = bytearray(make_page(0, RECORDS[:5]))
+        bad_page[10] ^= 0xFF
+        sock = MockSocket(
+            ACK + ACK + make_header(1, 0) + bytes(bad_page) + make_page(0, RECORDS[:5])
+        )
+        self.assertEqual(b"".join(RECORDS[:5]), download_archive(sock))
+        self.assertTrue(sock.sentData.endswith(ACK + NAK))
+
+    def test_bad_page_gives_up_and_cancels(self):
+        bad_page = bytearray(make_page(0, RECORDS[:5]))
+        bad_page[10] ^= 0xFF
+        sock = MockSocket(ACK + ACK + make_header(1, 0) + bytes(bad_page) * 2)
+        with self.assertRaises(BadCRC):
+            download_archive(sock, max_page_attempts=2)
+        self.assertTrue(sock.sentData.endswith(ACK + NAK + b"\x1b"))
+
+    def test_bad_header_raises(self):
+        sock = MockSocket(ACK + ACK + b"\x01\x00\x00\x00\x00\x00")
+        with self.assertRaises(BadCRC):
+            download_archive(sock)
+
+    def test_skips_records_not_after_since(self):
+        sock = MockSocket(ACK + ACK + make_header(1, 0) + make_page(0, RECORDS[:5]))
+        since = START + datetime.timedelta(minutes=10)
+        self.assertEqual(b"".join(RECORDS[3:5]), download_archive(sock, since))
+
+
+class TestArchiveFile(TestCase):
+    def setUp(self):
+        handle, self.path = tempfile.mkstemp()
+        os.close(handle)
+        os.remove(self.path)
+
+    def tearDown(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    def test_backfill_resumes_from_last_record(self):
+        archive = ArchiveFile(self.path)
+        self.assertIsNone(archive.last_timestamp())
+        sock = MockSocket(ACK + ACK + make_header(1, 0) + make_page(0, RECORDS[:3]))
+        self.assertEqual(3, archive.backfill(sock))
+        self.assertEqual(
+            START + datetime.timedelta(minutes=10), archive.last_timestamp()
+        )
+
+        sock = MockSocket(
+            ACK
+            + ACK
+            + make_header(2, 0)
+            + make_page(0, RECORDS[:5])
+            + make_page(1, RECORDS[5:])
+        )
+        self.assertEqual(4, archive.backfill(sock))
+        self.assertEqual(
+            dump_after_body(START + datetime.timedelta(minutes=10)), sock.sentData[7:13]
+        )
+        self.assertEqual(b"".join(RECORDS), archive.read())
+
+    def test_backfill_drops_incomplete_record(self):
+        with open(self.path, "wb") as archive_file:
+            archive_file.write(b"".join(RECORDS[:2]) + RECORDS[2][:20])
+        archive = ArchiveFile(self.path)
+        sock = MockSocket(ACK + ACK + make_header(1, 0) + make_page(0, RECORDS[:4]))
+        with self.assertLogs("skyentific.archive", "WARNING"):
+            self.assertEqual(2, archive.backfill(sock))
+        self.assertEqual(4 * 52, os.path.getsize(self.path))
+        self.assertEqual(b"".join(RECORDS[:4]), archive.read())
+
+
+class TestDecodeArchiveRecords(TestCase):
+    @skipUnless(importlib.util.find_spec("numpy"), "NumPy is not installed")
+    def test_decodes_columns(self):
+        import numpy
+
+        columns = decode_archive_records(b"".join(RECORDS))
+        self.assertEqual(numpy.datetime64("2024-05-01T12:00"), columns["timestamp"][0])
+        self.assertEqual(numpy.datetime64("2024-05-01T12:30"), columns["timestamp"][6])
+        self.assertAlmostEqual(70.6, columns["outside_temperature"][6])
+        self.assertAlmostEqual(29.92, columns["barometer"][0])
+        self.assertEqual(55, columns["outside_humidity"][0])
+
+    @skipUnless(importlib.util.find_spec("numpy"), "NumPy is not installed")
+    def test_rejects_partial_records(self):
+        with self.assertRaises(ValueError):
+            decode_archive_records(RECORDS[0][:40])
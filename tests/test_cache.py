@@ -0,0 +1,128 @@
+import asyncio
+import threading
+
+from unittest import IsolatedAsyncioTestCase, TestCase
+
+from skyentific.cache import AsyncObservationCache, ObservationCache
+from skyentific.exceptions import NotAcknowledged
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestObservationCache(TestCase):
+    def test_returns_cached_observation_within_ttl(self):
+        clock = Clock()
+        reads = []
+        cache = ObservationCache(
+            lambda station: reads.append(station) or len(reads), ttl=2.5, clock=clock
+        )
+        assert cache.get("a") == 1
+        clock.now = 2.0
+        assert cache.get("a") == 1
+        assert cache.get("b") == 2
+        clock.now = 2.5
+        assert cache.get("a") == 3
+        assert reads == ["a", "b", "a"]
+        assert cache.stats.to_dict() == {
+            "hits": 1,
+            "misses": 3,
+            "coalesced": 0,
+            "errors": 0,
+        }
+
+    def test_coalesces_concurrent_reads(self):
+        started = threading.Event()
+        release = threading.Event()
+        reads = []
+
+        def fetch(station):
+            reads.append(station)
+            started.set()
+            release.wait(5)
+            return "observation"
+
+        cache = ObservationCache(fetch)
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(cache.get("a")))
+            for _ in range(5)
+        ]
+        threads[0].start()
+        started.wait(5)
+        for thread in threads[1:]:
+            thread.start()
+        while cache.stats.coalesced < 4:
+            threading.Event().wait(0.001)
+        release.set()
+        for thread in threads:
+            thread.join(5)
+        assert reads == ["a"]
+        assert results == ["observation"] * 5
+
+    def test_errors_are_shared_and_not_cached(self):
+        calls = []
+
+        def fetch(station):
+            calls.append(station)
+            if len(calls) == 1:
+                raise NotAcknowledged()
+            return "observation"
+
+        cache = ObservationCache(fetch)
+        with self.assertRaises(NotAcknowledged):
+            cache.get("a")
+        assert cache.get("a") == "observation"
+        assert cache.stats.errors == 1
+
+    def test_invalidate(self):
+        reads = []
+        cache = ObservationCache(lambda station: reads.append(station))
+        cache.get("a")
+        cache.invalidate("a")
+        cache.get("a")
+        assert reads == ["a", "a"]
+
+
+class TestAsyncObservationCache(IsolatedAsyncioTestCase):
+    async def test_coalesces_concurrent_reads(self):
+        reads = []
+        release = asyncio.Event()
+
+        async def fetch(station):
+            reads.append(station)
+            await release.wait()
+            return "observation"
+
+        cache = AsyncObservationCache(fetch)
+        waiters = [asyncio.ensure_future(cache.get("a")) for _ in range(5)]
+        await asyncio.sleep(0)
+        release.set()
+        assert await asyncio.gather(*waiters) == ["observation"] * 5
+        assert await cache.get("a") == "observation"
+        assert reads == ["a"]
+        assert cache.stats.to_dict() == {
+            "hits": 1,
+            "misses": 1,
+            "coalesced": 4,
+            "errors": 0,
+        }
+
+    async def test_errors_are_not_cached(self):
+        calls = []
+
+        async def fetch(station):
+            calls.append(station)
+            if len(calls) == 1:
+                raise NotAcknowledged()
+            return "observation"
+
+        cache = AsyncObservationCache(fetch)
+        with self.assertRaises(NotAcknowledged):
+            await cache.get("a")
+        assert await cache.get("a") == "observation"
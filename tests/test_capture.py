@@ -0,0 +1,136 @@
+import datetime
+import importlib.util
+import os
+import tempfile
+
+from unittest import TestCase, skipUnless
+
+from skyentific.capture import (
+    CAPTURE_HEADER_SIZE_BYTES,
+    CaptureReader,
+    CaptureWriter,
+)
+from skyentific.exceptions import BadCRC
+from skyentific.models import StationObservation
+from skyentific.simulator import synthetic_loop_packet
+
+PACKETS = [synthetic_loop_packet(sequence) for sequence in range(5)]
+STATION = "192.168.1.100:22222"
+RECEIVED_AT_NS = 1716831249 * 10**9
+
+
+class TestCapture(TestCase):
+    def setUp(self):
+        handle, self.path = tempfile.mkstemp()
+        os.close(handle)
+        os.remove(self.path)
+
+    def tearDown(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    def write(self, packets, station=STATION, **kwargs):
+        with CaptureWriter(self.path, **kwargs) as capture:
+            for index, packet in enumerate(packets):
+                capture.append(packet, station, RECEIVED_AT_NS + index)
+
+    def test_round_trip(self):
+        self.write(PACKETS[:2])
+        self.write(PACKETS[2:], station="")
+        self.assertEqual(
+            CAPTURE_HEADER_SIZE_BYTES + 5 * 192, os.path.getsize(self.path)
+        )
+        with CaptureReader(self.path) as capture:
+            self.assertEqual(5, len(capture))
+            frames = []
+            for received_at_ns, station, record in capture:
+                frames.append((received_at_ns, station, record))
+            self.assertEqual(frames[4], capture[-1])
+        self.assertEqual(
+            [
+                (RECEIVED_AT_NS, STATION, PACKETS[0]),
+                (RECEIVED_AT_NS + 1, STATION, PACKETS[1]),
+            ],
+            frames[:2],
+        )
+        self.assertEqual((RECEIVED_AT_NS + 2, "", PACKETS[4]), frames[4])
+
+    def test_replay(self):
+        self.write(PACKETS)
+        with CaptureReader(self.path) as capture:
+            replayed = list(capture.replay(StationObservation.init_with_bytes))
+        self.assertEqual([STATION] * 5, [station for station, _ in replayed])
+        observations = [observation for _, observation in replayed]
+        self.assertEqual(
+            [
+                StationObservation.init_with_bytes(packet).outside_temperature
+                for packet in PACKETS
+            ],
+            [observation.outside_temperature for observation in observations],
+        )
+        self.assertIsInstance(observations[0].identifier, int)
+        self.assertEqual(
+            datetime.datetime(2024, 5, 27, 17, 34, 9, tzinfo=datetime.timezone.utc),
+            observations[0].observed_at.replace(microsecond=0),
+        )
+
+    def test_drops_incomplete_frame(self):
+        self.write(PACKETS[:2])
+        with open(self.path, "ab") as capture_file:
+            capture_file.write(PACKETS[2][:40])
+        with CaptureReader(self.path) as capture:
+            self.assertEqual(2, len(capture))
+        self.write(PACKETS[3:4])
+        with CaptureReader(self.path) as capture:
+            self.assertEqual(PACKETS[3], capture[2][2])
+
+    def test_host_name_station(self):
+        self.write(PACKETS[:1], station="weather-station.example.com:22222")
+        with CaptureReader(self.path) as capture:
+            self.assertEqual("weather-station.example.com:22222", capture[0][1])
+
+    def test_keeps_station_size_of_existing_file(self):
+        self.write(PACKETS[:1], station="weather.example.com:22222", station_size=32)
+        self.write(PACKETS[1:2], station="weather.example.com:22222")
+        with CaptureReader(self.path) as capture:
+            self.assertEqual(32, capture.station_size)
+            self.assertEqual("weather.example.com:22222", capture[1][1])
+
+    def test_rejects_bad_input(self):
+        with self.assertRaises(ValueError):
+            self.write(PACKETS[:1], station="weather.example.com:22222", station_size=8)
+        with self.assertRaises(ValueError):
+            self.write([PACKETS[0][:-1]])
+        with open(self.path, "wb") as capture_file:
+            capture_file.write(b"not a capture file")
+        with self.assertRaises(ValueError):
+            CaptureReader(self.path)
+        with self.assertRaises(ValueError):
+            CaptureWriter(self.path)
+
+    @skipUnless(importlib.util.find_spec("numpy"), "NumPy is not installed")
+    def test_columns(self):
+        import numpy
+
+        self.write(PACKETS)
+        with CaptureReader(self.path) as capture:
+            frames = capture.frames()
+            self.assertFalse(frames.flags.owndata)
+            columns = capture.columns()
+        # The frames outlive the reader, keeping the file mapped.
+        self.assertEqual(STATION.encode(), frames["station"][0])
+        self.assertEqual(
+            [60.0, 60.1, 60.2, 60.3, 60.4], list(columns["outside_temperature"])
+        )
+        self.assertEqual(
+            numpy.datetime64(RECEIVED_AT_NS, "ns"), columns["received_at"][0]
+        )
+        self.assertEqual(STATION.encode(), columns["station"][4])
+
+    @skipUnless(importlib.util.find_spec("numpy"), "NumPy is not installed")
+    def test_columns_bad_crc(self):
+        self.write([PACKETS[0], PACKETS[1][:-1] + b"\x00"])
+        with CaptureReader(self.path) as capture:
+            with self.assertRaises(BadCRC):
+                capture.columns()
+            self.assertEqual(2, capture.columns(validate_crc=False)["barometer"].size)
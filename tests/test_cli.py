@@ -0,0 +1,121 @@
+import io
+import json
+import os
+import tempfile
+
+from unittest import TestCase
+
+from scripts.skyentific import (
+    poll_stations,
+    read_stations_file,
+    watch,
+    watch_stations,
+)
+from skyentific.fleet import Station
+from skyentific.simulator import SimulatedLogger, SimulatorFaults, synthetic_loop_packet
+from skyentific.utils import ACKNOWLEDGED_RESPONSE_CODE, crc16
+
+from .mocks import MockLoggerServer
+
+
+class TestWatch(TestCase):
+    def test_writes_one_line_per_observation_over_one_connection(self):
+        output = io.BytesIO()
+        with SimulatedLogger() as simulator:
+            written = watch(*simulator.address, interval=0, count=5, output=output)
+        lines = output.getvalue().splitlines()
+        assert written == 5
+        assert len(lines) == 5
+        assert all("outside_temperature" in json.loads(line) for line in lines)
+        assert simulator.stats.connections == 1
+
+    def test_interval_skips_packets(self):
+        output = io.BytesIO()
+        with SimulatedLogger(packet_interval=0.01) as simulator:
+            watch(*simulator.address, interval=0.05, count=2, output=output)
+        assert len(output.getvalue().splitlines()) == 2
+        assert simulator.stats.packets > 2
+
+    def test_reconnects_after_disconnect(self):
+        output = io.BytesIO()
+        sleeps = []
+        faults = SimulatorFaults(disconnect_rate=0.3, seed=1)
+        with SimulatedLogger(faults=faults) as simulator:
+            watch(
+                *simulator.address,
+                interval=0,
+                count=20,
+                output=output,
+                sleep=sleeps.append
+            )
+        assert len(output.getvalue().splitlines()) == 20
+        assert sleeps
+        assert simulator.stats.connections == len(sleeps) + 1
+
+    def test_skips_bad_packets(self):
+        output = io.BytesIO()
+        faults = SimulatorFaults(bad_crc_rate=0.5, seed=3)
+        with SimulatedLogger(faults=faults) as simulator:
+            watch(*simulator.address, interval=0, count=10, output=output)
+        assert len(output.getvalue().splitlines()) == 10
+        assert simulator.stats.packets > 10
+
+    def test_skips_packets_that_do_not_decode(self):
+        # A valid CRC around a bar trend the console never sends.
+        record = bytearray(synthetic_loop_packet(1)[:-2])
+        record[3] = 5
+        bad_packet = bytes(record) + crc16(record).to_bytes(2, "big")
+        output = io.BytesIO()
+        server = MockLoggerServer(
+            {
+                b"\n": b"\n\r",
+                b"LOOP 100\n": ACKNOWLEDGED_RESPONSE_CODE.to_bytes(1, "big")
+                + bad_packet
+                + synthetic_loop_packet(2)
+                + synthetic_loop_packet(3),
+            }
+        )
+        with server, self.assertLogs(level="WARNING") as logs:
+            written = watch(*server.address, interval=0, count=2, output=output)
+        assert written == 2
+        assert len(output.getvalue().splitlines()) == 2
+        assert "does not decode" in logs.output[0]
+
+
+class TestStations(TestCase):
+    def test_read_stations_file(self):
+        with tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False) as f:
+            f.write("# loggers\n10.0.0.1:22222\n\n10.0.0.2:22222  # roof\n")
+        self.addCleanup(os.remove, f.name)
+        assert read_stations_file(f.name) == ["10.0.0.1:22222", "10.0.0.2:22222"]
+
+    def test_poll_stations_writes_one_line_per_station(self):
+        output = io.BytesIO()
+        faults = SimulatorFaults(nack_rate=1.0)
+        with SimulatedLogger() as good, SimulatedLogger(faults=faults) as bad:
+            stations = [
+                Station(*good.address, timeout=1),
+                Station(*bad.address, timeout=1),
+                Station(*good.address, timeout=1),
+            ]
+            failures = poll_stations(stations, workers=2, output=output)
+        results = [json.loads(line) for line in output.getvalue().splitlines()]
+        assert failures == 1
+        assert [result["station"] for result in results] == [
+            station.address for station in stations
+        ]
+        assert [result["ok"] for result in results] == [True, False, True]
+        assert "outside_temperature" in results[0]["observation"]
+        assert results[1]["error"] == "SkyentificError"
+
+    def test_watch_stations(self):
+        output = io.BytesIO()
+        with SimulatedLogger() as first, SimulatedLogger() as second:
+            stations = [
+                Station(*first.address, interval=0.01),
+                Station(*second.address, interval=0.01),
+            ]
+            watch_stations(stations, workers=2, count=3, output=output)
+        results = [json.loads(line) for line in output.getvalue().splitlines()]
+        assert len(results) == 6
+        assert all(result["ok"] for result in results)
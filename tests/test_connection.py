@@ -0,0 +1,83 @@
+import socket
+import time
+
+from unittest import TestCase
+
+from skyentific.connection import WeatherLinkConnection
+from skyentific.exceptions import SkyentificError
+from skyentific.utils import ACKNOWLEDGED_RESPONSE_CODE, NACK_RESPONSE_CODE
+
+from .mocks import MockLoggerServer
+
+
+class TestWeatherLinkConnection(TestCase):
+    loop_packet = b"LOO\x14\x00\xb1\x02It\x1e\x03\x0f\x8a\x02\x02\x03\x8c\x00\xff\xff\xff\xff\xff\xff\xff\xff\xff\xff\xff\xff\xff\xff\xff\x1b\xff\xff\xff\xff\xff\xff\xff\x00\x00V\xff\x7f\x00\x00\xff\xff\x00\x00\x02\x00\x02\x00\x00\x00\x00\x00\x00\x00\xff\xff\xff\xff\xff\xff\xff\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x006\x03\x03\xc0\x1b\x02\xe3\x07\n\r\xee\x00"
+
+    def setUp(self):
+        self.server = MockLoggerServer(
+            {
+                b"\n": b"\n\r",
+                b"LOOP 1\n": ACKNOWLEDGED_RESPONSE_CODE.to_bytes(1, "big")
+                + self.loop_packet,
+            }
+        )
+        self.server.__enter__()
+        self.addCleanup(self.server.__exit__, None, None, None)
+        self.now = 0.0
+
+    def make_connection(self, **kwargs):
+        host, port = self.server.address
+        connection = WeatherLinkConnection(
+            host, port, sleep=lambda delay: None, clock=lambda: self.now, **kwargs
+        )
+        self.addCleanup(connection.close)
+        return connection
+
+    def test_keeps_connection_open(self):
+        connection = self.make_connection()
+        for _ in range(3):
+            observation = connection.get_current_condition()
+            assert observation.barometer == 29.769
+        assert connection.connections == 1
+        assert self.server.received == [b"\n", b"LOOP 1\n", b"LOOP 1\n", b"LOOP 1\n"]
+
+    def test_wakes_up_when_idle(self):
+        connection = self.make_connection(idle_timeout=10)
+        connection.get_current()
+        self.now += 11
+        connection.get_current()
+        assert self.server.received == [b"\n", b"LOOP 1\n", b"\n", b"LOOP 1\n"]
+
+    def test_reconnects_after_disconnect(self):
+        connection = self.make_connection()
+        connection.get_current()
+        self.server.disconnect_all()
+        time.sleep(0.05)
+        assert connection.get_current() == self.loop_packet
+        assert connection.connections == 2
+
+    def test_retries_after_nack(self):
+        connection = self.make_connection()
+        connection.get_current()
+        self.server.responses[b"LOOP 1\n"] = NACK_RESPONSE_CODE.to_bytes(1, "big")
+        with self.assertRaises(SkyentificError):
+            connection.get_current_condition()
+        assert self.server.received == [
+            b"\n",
+            b"LOOP 1\n",
+            b"LOOP 1\n",
+            b"\n",
+            b"LOOP 1\n",
+        ]
+
+    def test_unreachable(self):
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            port = sock.getsockname()[1]
+        delays = []
+        connection = WeatherLinkConnection(
+            "127.0.0.1", port, reconnect_delays=(0, 1, 2), sleep=delays.append
+        )
+        with self.assertRaises(SkyentificError):
+            connection.get_current()
+        assert delays == [1, 2]
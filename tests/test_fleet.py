@@ -0,0 +1,101 @@
+import socket
+
+from unittest import IsolatedAsyncioTestCase, TestCase
+
+from skyentific.fleet import FleetPoller, Station, StationStats
+from skyentific.utils import ACKNOWLEDGED_RESPONSE_CODE
+
+from .mocks import start_mock_server
+
+
+def unused_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class TestStation(TestCase):
+    def test_parse(self):
+        station = Station.parse("192.168.1.100:22222", interval=5)
+        assert station.host == "192.168.1.100"
+        assert station.port == 22222
+        assert station.interval == 5.0
+        assert station.address == "192.168.1.100:22222"
+        for address in ("192.168.1.100", ":22222", "host:port"):
+            with self.assertRaises(ValueError):
+                Station.parse(address)
+
+    def test_stats(self):
+        stats = StationStats()
+        assert stats.mean_latency is None
+        stats.record(0.1)
+        stats.record(0.3, TimeoutError())
+        assert stats.to_dict() == {
+            "successes": 1,
+            "failures": 1,
+            "errors": {"TimeoutError": 1},
+            "mean_latency": 0.2,
+            "max_latency": 0.3,
+            "last_latency": 0.3,
+        }
+
+
+class TestFleetPoller(IsolatedAsyncioTestCase):
+    loop_packet = b"LOO\x14\x00\xb1\x02It\x1e\x03\x0f\x8a\x02\x02\x03\x8c\x00\xff\xff\xff\xff\xff\xff\xff\xff\xff\xff\xff\xff\xff\xff\xff\x1b\xff\xff\xff\xff\xff\xff\xff\x00\x00V\xff\x7f\x00\x00\xff\xff\x00\x00\x02\x00\x02\x00\x00\x00\x00\x00\x00\x00\xff\xff\xff\xff\xff\xff\xff\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x006\x03\x03\xc0\x1b\x02\xe3\x07\n\r\xee\x00"
+
+    async def test_run(self):
+        server, received = await start_mock_server(
+            ACKNOWLEDGED_RESPONSE_CODE.to_bytes(1, "big") + self.loop_packet
+        )
+        self.addAsyncCleanup(server.wait_closed)
+        self.addCleanup(server.close)
+        good = Station("127.0.0.1", server.sockets[0].getsockname()[1], interval=0.01)
+        bad = Station("127.0.0.1", unused_port(), interval=0.01, timeout=0.5)
+        observations = []
+        errors = []
+        poller = FleetPoller(
+            [good, bad],
+            max_concurrency=1,
+            on_observation=lambda station, observation: observations.append(station),
+            on_error=lambda station, error: errors.append(station),
+        )
+        await poller.run(cycles=3)
+
+        assert observations == [good] * 3
+        assert errors == [bad] * 3
+        assert len(received) == 3
+        assert poller.stats[good.address].successes == 3
+        assert poller.stats[good.address].failures == 0
+        assert poller.stats[bad.address].failures == 3
+        assert poller.stats[bad.address].polls == 3
+
+    async def test_poll_without_run(self):
+        server, _ = await start_mock_server(
+            ACKNOWLEDGED_RESPONSE_CODE.to_bytes(1, "big") + self.loop_packet
+        )
+        self.addAsyncCleanup(server.wait_closed)
+        self.addCleanup(server.close)
+        station = Station("127.0.0.1", server.sockets[0].getsockname()[1])
+        observation = await FleetPoller([station]).poll(station)
+        assert observation.barometer == 29.769
+
+    async def test_callback_errors_do_not_stop_polling(self):
+        server, _ = await start_mock_server(
+            ACKNOWLEDGED_RESPONSE_CODE.to_bytes(1, "big") + self.loop_packet
+        )
+        self.addAsyncCleanup(server.wait_closed)
+        self.addCleanup(server.close)
+        port = server.sockets[0].getsockname()[1]
+        stations = [Station("127.0.0.1", port, interval=0.01) for _ in range(2)]
+        stations[1].port = unused_port()
+        stations[1].timeout = 0.5
+
+        def fail(station, result):
+            raise RuntimeError("callback failed")
+
+        poller = FleetPoller(stations, on_observation=fail, on_error=fail)
+        with self.assertLogs("skyentific.fleet", "ERROR") as logs:
+            await poller.run(cycles=2)
+        assert poller.stats[stations[0].address].successes == 2
+        assert poller.stats[stations[1].address].failures == 2
+        assert len(logs.records) == 4
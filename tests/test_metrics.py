@@ -0,0 +1,92 @@
+import socket
+
+from unittest import TestCase
+
+from skyentific import get_current_condition, metrics
+from skyentific.exceptions import SkyentificError
+from skyentific.metrics import Histogram, MetricsRegistry
+from skyentific.models import StationObservation
+from skyentific.retry import RetryPolicy
+from skyentific.simulator import SimulatedLogger, SimulatorFaults
+from skyentific.utils import connect
+
+
+class TestHistogram(TestCase):
+    def test_cumulative_counts(self):
+        histogram = Histogram((0.1, 1.0))
+        for value in (0.05, 0.1, 0.5, 2.0):
+            histogram.observe(value)
+        assert histogram.cumulative_counts() == [2, 3]
+        assert histogram.count == 4
+        assert histogram.sum == 2.65
+
+
+class TestMetricsRegistry(TestCase):
+    def test_to_prometheus(self):
+        registry = MetricsRegistry((0.1, 1.0))
+        registry.observe("request", 0.05, "10.0.0.1:22222")
+        registry.observe("request", 0.5, "10.0.0.1:22222")
+        registry.count_retry("10.0.0.1:22222", 2)
+        registry.count_error("10.0.0.1:22222", TimeoutError())
+        text = registry.to_prometheus()
+        labels = 'phase="request",station="10.0.0.1:22222"'
+        assert "# TYPE skyentific_phase_seconds histogram" in text
+        assert 'skyentific_phase_seconds_bucket{%s,le="0.1"} 1' % labels in text
+        assert 'skyentific_phase_seconds_bucket{%s,le="1.0"} 2' % labels in text
+        assert 'skyentific_phase_seconds_bucket{%s,le="+Inf"} 2' % labels in text
+        assert "skyentific_phase_seconds_count{%s} 2" % labels in text
+        assert 'skyentific_retries_total{station="10.0.0.1:22222"} 2' in text
+        assert (
+            'skyentific_errors_total{station="10.0.0.1:22222",error="TimeoutError"} 1'
+            in text
+        )
+        assert text.endswith("\n")
+
+
+class TestInstrumentedPolling(TestCase):
+    def setUp(self):
+        self.registry = metrics.enable()
+        self.addCleanup(metrics.disable)
+
+    def test_records_each_phase(self):
+        with SimulatedLogger() as simulator:
+            host, port = simulator.address
+            sock = connect(host, port, socket.socket)
+            get_current_condition(sock, StationObservation.init_with_bytes)
+        station = "%s:%s" % (host, port)
+        phases = {phase for phase, _ in self.registry.histograms}
+        assert phases == {"connect", "request", "receive", "decode"}
+        for (_, label), histogram in self.registry.histograms.items():
+            assert label == station
+            assert histogram.count == 1
+
+    def test_host_name_labels_every_phase(self):
+        with SimulatedLogger() as simulator:
+            _, port = simulator.address
+            sock = connect("localhost", port, socket.socket)
+            get_current_condition(sock, StationObservation.init_with_bytes)
+        labels = {label for _, label in self.registry.histograms}
+        assert labels == {"localhost:%d" % port}
+        assert len(self.registry.histograms) == 4
+
+    def test_records_retries_and_errors(self):
+        faults = SimulatorFaults(nack_rate=1.0)
+        with SimulatedLogger(faults=faults) as simulator:
+            host, port = simulator.address
+            sock = connect(host, port, socket.socket)
+            with self.assertRaises(SkyentificError):
+                get_current_condition(
+                    sock,
+                    StationObservation.init_with_bytes,
+                    retry_policy=RetryPolicy(max_attempts=3, base_delay=0),
+                )
+        station = "%s:%s" % (host, port)
+        assert self.registry.retries == {station: 2}
+        assert self.registry.errors == {(station, "NotAcknowledged"): 3}
+
+    def test_disabled_records_nothing(self):
+        metrics.disable()
+        with SimulatedLogger() as simulator:
+            sock = connect(*simulator.address, socket.socket)
+            get_current_condition(sock, StationObservation.init_with_bytes)
+        assert self.registry.histograms == {}
@@ -1,18 +1,38 @@
 import copy
 import datetime
+import importlib.util
 
 from unittest.mock import Mock
-from unittest import TestCase
+from unittest import TestCase, skipUnless
 
 from bitstring import BitStream
 
 from skyentific.bar_trend import BarTrend
 from skyentific.exceptions import BadCRC
+from skyentific.utils import crc16
 from skyentific.models import (
+    LOOP_RECORD_LAYOUT,
+    LOOP_RECORD_SIZE_BYTES,
+    LOOP_RECORD_STRUCT,
+    OBSERVATION_STRUCT,
+    FORECAST_ICONS_LOOKUP,
+    LUNATION_LOOKUP,
+    WIND_DIRECTION_LOOKUP,
     lunation_text,
     wind_direction_text,
     forecast_icons_text,
+    LOOP_LAYOUT,
+    LOOP2_LAYOUT,
+    LOOP2_RECORD_LAYOUT,
+    Loop2Record,
+    LoopPacketView,
+    LoopRecord,
+    compile_layout,
+    decode_record,
     StationObservation,
+    storm_start_date,
+    crc16_rows,
+    decode_loop_records,
 )
 
 loop_packet = b"LOO\x14\x00\xb1\x02It\x1e\x03\x0f\x8a\x02\x02\x03\x8c\x00\xff\xff\xff\xff\xff\xff\xff\xff\xff\xff\xff\xff\xff\xff\xff\x1b\xff\xff\xff\xff\xff\xff\xff\x00\x00V\xff\x7f\x00\x00\xff\xff\x00\x00\x02\x00\x02\x00\x00\x00\x00\x00\x00\x00\xff\xff\xff\xff\xff\xff\xff\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x006\x03\x03\xc0\x1b\x02\xe3\x07\n\r\xee\x00"
@@ -20,6 +40,114 @@ loop2_packet = b"LOO\x14\x01\xb1\x02It\x1e\x03\x0f\x8a\x02\x02\x03\x8c\x00\xff\x
 loop_packet_badCRC = b"POO\x14\x00\xb1\x02It\x1e\x03\x0f\x8a\x02\x02\x03\x8c\x00\xff\xff\xff\xff\xff\xff\xff\xff\xff\xff\xff\xff\xff\xff\xff\x1b\xff\xff\xff\xff\xff\xff\xff\x00\x00V\xff\x7f\x00\x00\xff\xff\x00\x00\x02\x00\x02\x00\x00\x00\x00\x00\x00\x00\xff\xff\xff\xff\xff\xff\xff\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x006\x03\x03\xc0\x1b\x02\xe3\x07\n\r\xee\x00"
 
 
+def make_loop2_packet(**values):
+    fields = {
+        "header": b"LOO",
+        "bar_trend": -20,
+        "packet_type": 1,
+        "barometer": 30012,
+        "inside_temperature": 715,
+        "inside_humidity": 41,
+        "outside_temperature": -32,
+        "wind_speed": 7,
+        "wind_direction": 270,
+        "ten_min_avg_wind_speed": 52,
+        "two_min_avg_wind_speed": 61,
+        "ten_min_wind_gust": 14,
+        "wind_direction_for_ten_min_wind_gust": 290,
+        "dew_point": -10,
+        "outside_humidity": 80,
+        "heat_index": -3,
+        "wind_chill": -12,
+        "thsw_index": -8,
+        "solar_radiation": 0x7FFF,
+        "start_date_of_storm": 0xFFFF,
+        "uv_index": 0xFF,
+        "day_rain": 12,
+        "last_hour_rain": 3,
+        "altimeter_setting": 30105,
+        "line_terminator": b"\n\r",
+    }
+    fields.update(values)
+    layout_struct = compile_layout(LOOP2_RECORD_LAYOUT)
+    packet = layout_struct.pack(
+        *(
+            fields.get(name, b"" if field_format.endswith("s") else 0)
+            for name, field_format in LOOP2_RECORD_LAYOUT[:-1]
+        ),
+        b"",
+    )[:-2]
+    return packet + crc16(packet).to_bytes(2, "big")
+
+
+def searched_lunation_text(lunation):
+    """The lookup walk `lunation_text` used before its tables."""
+    if lunation < 0.5:
+        direction = "Waxing"
+    elif lunation == 0.5 or lunation == 1.0:
+        direction = ""
+    else:
+        direction = "Waning"
+    for lunation_value, text in LUNATION_LOOKUP.items():
+        if lunation > lunation_value:
+            continue
+        break
+    if direction == "":
+        return text
+    return "%s (%s)" % (text, direction)
+
+
+def searched_wind_direction_text(wind_direction):
+    """The lookup walk `wind_direction_text` used before its table."""
+    for wind_direction_value, text in WIND_DIRECTION_LOOKUP.items():
+        if wind_direction >= wind_direction_value:
+            continue
+        break
+    return text
+
+
+def joined_forecast_icons_text(forecast_icons):
+    """The bit loop `forecast_icons_text` used before its table."""
+    if forecast_icons == 0:
+        return "Unknown"
+    return ", ".join(
+        FORECAST_ICONS_LOOKUP[i] for i in range(5) if forecast_icons & (1 << i)
+    )
+
+
+class TestTextTables(TestCase):
+    def test_lunation_text_matches_search(self):
+        values = [i / 10000 for i in range(10001)] + list(LUNATION_LOOKUP)
+        values += [value + 1e-12 for value in LUNATION_LOOKUP if value < 1.0]
+        values += [value - 1e-12 for value in LUNATION_LOOKUP]
+        for lunation in values:
+            self.assertEqual(
+                searched_lunation_text(lunation), lunation_text(lunation), lunation
+            )
+
+    def test_wind_direction_text_matches_search(self):
+        for wind_direction in range(361):
+            self.assertEqual(
+                searched_wind_direction_text(wind_direction),
+                wind_direction_text(wind_direction),
+                wind_direction,
+            )
+        for tenths in range(3601):
+            wind_direction = tenths / 10
+            self.assertEqual(
+                searched_wind_direction_text(wind_direction),
+                wind_direction_text(wind_direction),
+                wind_direction,
+            )
+
+    def test_forecast_icons_text_matches_join(self):
+        for forecast_icons in range(32):
+            self.assertEqual(
+                joined_forecast_icons_text(forecast_icons),
+                forecast_icons_text(forecast_icons),
+            )
+
+
 class TestModel(TestCase):
     def test_lunation_text(self):
         with self.assertRaises(ValueError):
@@ -160,3 +288,196 @@ class TestModel(TestCase):
                 "identifier": 101,
             },
         )
+
+    def test_loop_record_layout(self):
+        assert LOOP_RECORD_STRUCT.size == LOOP_RECORD_SIZE_BYTES
+        assert OBSERVATION_STRUCT.size == LOOP_RECORD_SIZE_BYTES
+        assert len(LOOP_RECORD_STRUCT.unpack(loop_packet)) == len(LOOP_RECORD_LAYOUT)
+
+    def test_init_with_bytes_invalid(self):
+        with self.assertRaises(ValueError):
+            StationObservation.init_with_bytes(loop_packet[:-1])
+        with self.assertRaises(ValueError):
+            StationObservation.init_with_bytes(loop2_packet)
+        observation = StationObservation.init_with_bytes(memoryview(loop_packet))
+        assert observation.barometer == 29.769
+
+    @skipUnless(importlib.util.find_spec("numpy"), "NumPy is not installed")
+    def test_decode_loop_records(self):
+        import numpy
+
+        columns = decode_loop_records(loop_packet * 3)
+        observation = LoopRecord.init_with_bytes(loop_packet)
+        assert columns["solar_radiation"][0] == 0x7FFF
+        for name, column in columns.items():
+            assert len(column) == 3
+            expected = getattr(observation, name)
+            if expected is None:
+                continue
+            if name in ("sunrise", "sunset"):
+                expected = expected.hour * 100 + expected.minute
+            assert (column == expected).all(), name
+
+        rows = numpy.frombuffer(loop_packet + loop_packet_badCRC, numpy.uint8)
+        assert list(crc16_rows(rows.reshape(2, -1))) == [0, 51809]
+        assert decode_loop_records(b"")["barometer"].size == 0
+        with self.assertRaises(BadCRC):
+            decode_loop_records(loop_packet + loop_packet_badCRC)
+        with self.assertRaises(ValueError):
+            decode_loop_records(loop_packet[:-1])
+        with self.assertRaises(ValueError):
+            decode_loop_records(loop2_packet, validate_crc=False)
+
+    def test_station_observation_is_compact(self):
+        observation = StationObservation.init_with_bytes(loop_packet)
+        assert not hasattr(observation, "__dict__")
+        with self.assertRaises(AttributeError):
+            observation.unknown_field = 1
+        assert observation._identifier is None
+        assert observation._observation_made_at is None
+        identifier = observation.identifier
+        assert identifier == observation.identifier
+        assert observation.observation_made_at == observation.observed_at.isoformat()
+        assert observation.observed_at.tzinfo is not None
+
+    def test_station_observation_setters(self):
+        observation = StationObservation.init_with_bytes(loop_packet)
+        observation.identifier = 42
+        assert observation.identifier == 42
+        observation.observation_made_at = "2024-05-27T17:34:09+00:00"
+        assert observation.observed_at == datetime.datetime(
+            2024, 5, 27, 17, 34, 9, tzinfo=datetime.timezone.utc
+        )
+        assert observation.to_dict()["observation_made_at"] == (
+            "2024-05-27T17:34:09+00:00"
+        )
+        observed_at = datetime.datetime(2024, 5, 28, tzinfo=datetime.timezone.utc)
+        observation.observation_made_at = observed_at
+        assert observation.observation_made_at == observed_at.isoformat()
+
+    def test_loop_packet_view(self):
+        observed_at = datetime.datetime(2024, 5, 27, 17, 34, 9, 120265)
+        view = LoopPacketView(loop_packet, 101, observed_at)
+        assert view.__dict__.keys() == {
+            "record",
+            "observed_at",
+            "_observation_made_at",
+            "_identifier",
+        }
+        assert view.outside_temperature == 65.0
+        assert view.__dict__["outside_temperature"] == 65.0
+        assert "barometer" not in view.__dict__
+        assert view.record.obj is loop_packet
+        assert (
+            view.to_dict()
+            == StationObservation.init_with_bytes(
+                loop_packet, 101, observation_made_at=observed_at
+            ).to_dict()
+        )
+
+        buffer = bytearray(loop_packet)
+        view = LoopPacketView.init_with_bytes(buffer)
+        buffer[12:14] = b"\x00\x00"
+        assert view.outside_temperature == 65.0
+
+        with self.assertRaises(ValueError):
+            LoopPacketView(loop_packet[:-1])
+        with self.assertRaises(ValueError):
+            LoopPacketView(loop2_packet)
+
+    def test_loop_record(self):
+        observed_at = datetime.datetime(2024, 5, 27, 17, 34, 9, 120265)
+        record = LoopRecord.init_with_bytes(loop_packet, 101, observed_at)
+        observation = StationObservation.init_with_bytes(loop_packet, 101, observed_at)
+        assert isinstance(record, StationObservation)
+        assert not hasattr(record, "__dict__")
+        record_dict = record.to_dict()
+        assert {
+            key: value
+            for key, value in record_dict.items()
+            if key in observation.to_dict()
+        } == observation.to_dict()
+        assert record.next_record == 689
+        assert record.extra_temperatures == (None,) * 7
+        assert record.extra_humidities == (None,) * 7
+        assert record.leaf_wetnesses == (None, None, None, 0)
+        assert record.uv_index == 86
+        assert record.solar_radiation is None
+        assert record.start_date_of_storm is None
+        assert record.month_rain == 2
+        assert record.year_rain == 2
+        assert record_dict["extra_temperature_humidity_alarms"] == [0] * 8
+
+        view = LoopPacketView(loop_packet)
+        for name in LoopRecord.__slots__:
+            assert getattr(view, name) == getattr(record, name), name
+
+        packet = bytearray(loop_packet)
+        packet[18:21] = bytes([0, 90, 190])
+        packet[48:50] = ((5 << 12) | (27 << 7) | 24).to_bytes(2, "little")
+        record = LoopRecord.init_with_bytes(bytes(packet))
+        assert record.extra_temperatures[:4] == (-90, 0, 100, None)
+        assert record.start_date_of_storm == datetime.date(2024, 5, 27)
+
+        with self.assertRaises(ValueError):
+            LoopRecord.init_with_bytes(loop_packet[:-1])
+        with self.assertRaises(ValueError):
+            LoopRecord.init_with_bytes(loop2_packet)
+
+    def test_storm_start_date(self):
+        assert storm_start_date(0xFFFF) is None
+        assert storm_start_date(0) is None
+        assert storm_start_date((12 << 12) | (31 << 7) | 99) == datetime.date(
+            2099, 12, 31
+        )
+
+    def test_record_layouts(self):
+        record = LoopRecord.init_with_bytes(loop_packet)
+        decoded = LOOP_LAYOUT.decode(loop_packet)
+        assert set(decoded) == set(LoopRecord.__slots__) | set(
+            StationObservation.__slots__
+        ) - {"observed_at", "_observation_made_at", "_identifier"}
+        for name, value in decoded.items():
+            assert getattr(record, name) == value, name
+        with self.assertRaises(ValueError):
+            LOOP_LAYOUT.decode(loop2_packet)
+        with self.assertRaises(ValueError):
+            LOOP2_LAYOUT.decode(loop_packet)
+        with self.assertRaises(ValueError):
+            LOOP2_LAYOUT.decode(loop_packet[:-1])
+
+    def test_loop2_record(self):
+        packet = make_loop2_packet()
+        assert len(packet) == LOOP_RECORD_SIZE_BYTES
+        assert crc16(packet) == 0
+        observed_at = datetime.datetime(2024, 5, 27, 17, 34, 9, 120265)
+        record = decode_record(packet, 7, observed_at)
+        assert isinstance(record, Loop2Record)
+        assert not hasattr(record, "__dict__")
+        assert record.bar_trend == BarTrend.FALLING_SLOWLY
+        assert record.barometer == 30.012
+        assert record.inside_temperature == 71.5
+        assert record.outside_temperature == -3.2
+        assert record.ten_min_avg_wind_speed == 5.2
+        assert record.two_min_avg_wind_speed == 6.1
+        assert record.ten_min_wind_gust == 14
+        assert record.wind_direction_for_ten_min_wind_gust == 290
+        assert record.dew_point == -10
+        assert record.wind_chill == -12
+        assert record.solar_radiation is None
+        assert record.uv_index is None
+        assert record.start_date_of_storm is None
+        assert record.day_rain == 12
+        assert record.last_hour_rain == 3
+        assert record.altimeter_setting == 30.105
+        record_dict = record.to_dict()
+        assert record_dict["wind_direction_text"] == "W"
+        assert record_dict["observation_made_at"] == observed_at.isoformat()
+        assert record_dict["identifier"] == 7
+        assert "unused_1" not in record_dict
+
+        assert isinstance(decode_record(loop_packet), LoopRecord)
+        with self.assertRaises(ValueError):
+            decode_record(packet[:-1])
+        with self.assertRaises(ValueError):
+            StationObservation.init_with_bytes(packet)
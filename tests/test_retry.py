@@ -0,0 +1,111 @@
+import socket
+
+from unittest import TestCase
+
+from skyentific.exceptions import BadCRC, NotAcknowledged
+from skyentific.retry import RetryPolicy, RetryStats
+
+
+class Clock:
+    """A fake clock advanced by the fake sleep."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def sleep(self, delay):
+        self.sleeps.append(delay)
+        self.now += delay
+
+    def __call__(self):
+        return self.now
+
+
+def failing(*errors, result="done"):
+    errors = list(errors)
+
+    def function():
+        if errors:
+            raise errors.pop(0)
+        return result
+
+    return function
+
+
+class TestRetryPolicy(TestCase):
+    def test_delay(self):
+        policy = RetryPolicy(base_delay=1, multiplier=2, max_delay=5, jitter=0)
+        assert [policy.delay(attempt) for attempt in range(1, 6)] == [1, 2, 4, 5, 5]
+        jittered = RetryPolicy(base_delay=1, jitter=0.5, random_function=lambda: 1.0)
+        assert jittered.delay(1) == 1.5
+        jittered = RetryPolicy(base_delay=1, jitter=0.5, random_function=lambda: 0.0)
+        assert jittered.delay(1) == 0.5
+        with self.assertRaises(ValueError):
+            RetryPolicy(max_attempts=0)
+
+    def test_call_retries(self):
+        clock = Clock()
+        stats = RetryStats()
+        policy = RetryPolicy(base_delay=1, jitter=0)
+        function = failing(BadCRC(), socket.timeout())
+        assert policy.call(function, stats, clock.sleep, clock) == "done"
+        assert clock.sleeps == [1, 2]
+        assert stats.to_dict() == {
+            "calls": 1,
+            "attempts": 3,
+            "errors": {"BadCRC": 1, "TimeoutError": 1},
+            "elapsed": 3.0,
+            "delayed": 3.0,
+        }
+
+    def test_call_gives_up(self):
+        clock = Clock()
+        stats = RetryStats()
+        policy = RetryPolicy(max_attempts=2, base_delay=1, jitter=0)
+        with self.assertRaises(NotAcknowledged):
+            policy.call(
+                failing(NotAcknowledged(), NotAcknowledged()), stats, clock.sleep, clock
+            )
+        assert stats.attempts == 2
+        assert clock.sleeps == [1]
+
+    def test_call_does_not_retry_other_errors(self):
+        clock = Clock()
+        with self.assertRaises(KeyError):
+            RetryPolicy().call(failing(KeyError()), sleep=clock.sleep, clock=clock)
+        assert clock.sleeps == []
+
+    def test_deadline(self):
+        clock = Clock()
+        policy = RetryPolicy(base_delay=1, jitter=0, deadline=2.5)
+        with self.assertRaises(BadCRC):
+            policy.call(
+                failing(BadCRC(), BadCRC(), BadCRC()), sleep=clock.sleep, clock=clock
+            )
+        assert clock.sleeps == [1]
+
+    def test_overrides(self):
+        clock = Clock()
+        policy = RetryPolicy(
+            base_delay=1,
+            jitter=0,
+            retry_on=(BadCRC,),
+            overrides={KeyError: RetryPolicy(base_delay=10, jitter=0)},
+        )
+        function = failing(BadCRC(), KeyError())
+        assert policy.call(function, sleep=clock.sleep, clock=clock) == "done"
+        assert clock.sleeps == [1, 20]
+
+    def test_policy_for_matches_the_cause(self):
+        slow = RetryPolicy(base_delay=10)
+        policy = RetryPolicy(retry_on=(), overrides={socket.timeout: slow})
+        try:
+            try:
+                raise socket.timeout()
+            except socket.timeout as e:
+                raise NotAcknowledged() from e
+        except NotAcknowledged as e:
+            error = e
+        assert policy.policy_for(error) is slow
+        assert policy.policy_for(NotAcknowledged()) is None
+        assert RetryPolicy(retry_on=(socket.timeout,)).policy_for(error) is not None
@@ -0,0 +1,78 @@
+import datetime
+import importlib.util
+import io
+import json
+
+from unittest import TestCase, skipUnless
+
+from skyentific.models import LoopRecord, StationObservation
+from skyentific.serialize import (
+    OBSERVATION_FIELDS,
+    dumps,
+    dumps_ndjson,
+    record_encoder,
+    observation_json,
+    write_ndjson,
+)
+from skyentific.simulator import synthetic_loop_packet
+
+from .test_models import loop_packet
+
+OBSERVATION_MADE_AT = datetime.datetime(2024, 5, 27, 17, 34, 9)
+PACKETS = [loop_packet] + [synthetic_loop_packet(i) for i in range(255)]
+
+
+def compact(value):
+    return json.dumps(value, separators=(",", ":"))
+
+
+class TestSerialize(TestCase):
+    def setUp(self):
+        self.observations = [
+            StationObservation.init_with_bytes(packet, i, OBSERVATION_MADE_AT)
+            for i, packet in enumerate(PACKETS)
+        ]
+
+    def test_observation_json_matches_to_dict(self):
+        for observation in self.observations:
+            self.assertEqual(
+                compact(observation.to_dict()), observation_json(observation)
+            )
+
+    def test_observation_fields_match_to_dict(self):
+        self.assertEqual(
+            list(self.observations[0].to_dict()),
+            [name for name, _ in OBSERVATION_FIELDS],
+        )
+
+    def test_dumps_falls_back_to_to_dict(self):
+        observation = self.observations[0]
+        observation.rain_rate = None
+        assert json.loads(dumps(observation, "json"))["rain_rate"] is None
+        record = LoopRecord.init_with_bytes(loop_packet, 1, OBSERVATION_MADE_AT)
+        assert dumps(record, "json") == compact(record.to_dict()).encode()
+
+    def test_dumps_ndjson(self):
+        buffer = dumps_ndjson(self.observations[:3], "json")
+        lines = buffer.split(b"\n")
+        assert lines[-1] == b""
+        assert [json.loads(line) for line in lines[:-1]] == [
+            observation.to_dict() for observation in self.observations[:3]
+        ]
+        assert dumps_ndjson([], "json") == b""
+
+    def test_write_ndjson(self):
+        stream = io.BytesIO()
+        assert write_ndjson(self.observations[:3], stream, "json") == 3
+        assert stream.getvalue() == dumps_ndjson(self.observations[:3], "json")
+
+    def test_unknown_backend(self):
+        with self.assertRaises(ValueError):
+            record_encoder("yaml")
+
+    @skipUnless(importlib.util.find_spec("orjson"), "orjson is not installed")
+    def test_orjson_backend(self):
+        record = LoopRecord.init_with_bytes(loop_packet, 1, OBSERVATION_MADE_AT)
+        assert json.loads(dumps(record, "orjson")) == record.to_dict()
+        observation = self.observations[0]
+        assert json.loads(dumps(observation, "orjson")) == observation.to_dict()
@@ -0,0 +1,100 @@
+import datetime
+import socket
+import time
+
+from unittest import TestCase
+
+from skyentific import get_current, stream_lps
+from skyentific.archive import download_archive, record_stamp, unpack_date_stamp
+from skyentific.exceptions import NotAcknowledged
+from skyentific.models import Loop2Record, LoopRecord
+from skyentific.simulator import (
+    SimulatedLogger,
+    SimulatorFaults,
+    synthetic_archive_records,
+)
+from skyentific.utils import crc16, wake_up
+
+
+def wait_for(condition, timeout=2.0):
+    """Polls `condition` until it holds or `timeout` seconds pass."""
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+class TestSimulatedLogger(TestCase):
+    def connect(self, simulator):
+        sock = socket.create_connection(simulator.address, timeout=2)
+        self.addCleanup(sock.close)
+        return sock
+
+    def test_wake_up_and_loop(self):
+        with SimulatedLogger() as simulator:
+            sock = self.connect(simulator)
+            wake_up(sock)
+            record = LoopRecord.init_with_bytes(get_current(sock))
+            assert 60.0 <= record.outside_temperature < 65.0
+            assert wait_for(lambda: simulator.stats.packets == 1)
+
+    def test_lps_alternates_packet_types(self):
+        with SimulatedLogger() as simulator:
+            records = list(stream_lps(self.connect(simulator), count=4))
+        assert [type(record) for record in records] == [
+            LoopRecord,
+            Loop2Record,
+            LoopRecord,
+            Loop2Record,
+        ]
+
+    def test_dump_after(self):
+        end = datetime.datetime(2024, 5, 1, 12, 0)
+        records = synthetic_archive_records(12, end)
+        with SimulatedLogger(archive_records=records) as simulator:
+            sock = self.connect(simulator)
+            assert download_archive(sock) == b"".join(records)
+            since = unpack_date_stamp(*record_stamp(records[6]))
+            assert download_archive(sock, since) == b"".join(records[7:])
+            assert LoopRecord.init_with_bytes(get_current(sock))
+
+    def test_dump_after_survives_bad_pages(self):
+        records = synthetic_archive_records(20)
+        faults = SimulatorFaults(bad_crc_rate=0.3, seed=4)
+        with SimulatedLogger(faults=faults, archive_records=records) as simulator:
+            buffer = download_archive(self.connect(simulator), max_page_attempts=10)
+        assert buffer == b"".join(records)
+        assert simulator.stats.faults["bad_crc"] > 0
+
+    def test_nack(self):
+        with SimulatedLogger(faults=SimulatorFaults(nack_rate=1.0)) as simulator:
+            with self.assertRaises(NotAcknowledged):
+                get_current(self.connect(simulator))
+
+    def test_bad_crc(self):
+        with SimulatedLogger(faults=SimulatorFaults(bad_crc_rate=1.0)) as simulator:
+            packet = get_current(self.connect(simulator))
+        assert crc16(packet) != 0
+        assert simulator.stats.faults == {"bad_crc": 1}
+
+    def test_partial_writes_are_reassembled(self):
+        faults = SimulatorFaults(partial_write_rate=1.0, partial_write_delay=0.001)
+        with SimulatedLogger(faults=faults) as simulator:
+            assert crc16(get_current(self.connect(simulator))) == 0
+        assert simulator.stats.faults["partial_write"] == 1
+
+    def test_disconnect(self):
+        with SimulatedLogger(faults=SimulatorFaults(disconnect_rate=1.0)) as simulator:
+            with self.assertRaises(NotAcknowledged):
+                get_current(self.connect(simulator))
+
+    def test_forgets_closed_connections(self):
+        with SimulatedLogger() as simulator:
+            for _ in range(3):
+                sock = socket.create_connection(simulator.address, timeout=2)
+                wake_up(sock)
+                sock.close()
+            sock = self.connect(simulator)
+            wake_up(sock)
+            assert wait_for(lambda: len(simulator.connections) == 1)
+        assert simulator.stats.connections == 4
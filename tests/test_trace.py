@@ -0,0 +1,94 @@
+import socket
+
+from unittest import IsolatedAsyncioTestCase, TestCase
+
+from skyentific import get_current, trace
+from skyentific.aio import AsyncWeatherLinkClient
+from skyentific.simulator import SimulatedLogger, SimulatorFaults
+from skyentific.exceptions import NotAcknowledged
+from skyentific.utils import ACKNOWLEDGED_RESPONSE_CODE, connect
+
+from .mocks import start_mock_server
+
+
+class TestTrace(TestCase):
+    def setUp(self):
+        self.addCleanup(trace.disable)
+
+    def test_enable_and_disable(self):
+        trace.enable("a:1")
+        assert trace.is_traced("a:1")
+        assert not trace.is_traced("b:1")
+        trace.enable()
+        assert trace.is_traced("b:1")
+        trace.disable()
+        assert not trace.is_traced("a:1")
+
+    def test_traces_enabled_station(self):
+        with SimulatedLogger() as simulator:
+            station = "%s:%s" % simulator.address
+            trace.enable(station)
+            with self.assertLogs("skyentific.trace", "INFO") as logs:
+                sock = connect(*simulator.address, socket.socket)
+                get_current(sock)
+                sock.close()
+        events = [record.event for record in logs.records]
+        assert events == ["connected", "acknowledged", "received"]
+        assert all(record.station == station for record in logs.records)
+        assert logs.records[-1].fields["crc_ok"] is True
+        assert logs.records[-1].fields["size"] == 99
+
+    def test_traces_errors(self):
+        with SimulatedLogger(faults=SimulatorFaults(nack_rate=1.0)) as simulator:
+            trace.enable()
+            with self.assertLogs("skyentific.trace", "INFO") as logs:
+                sock = connect(*simulator.address, socket.socket)
+                with self.assertRaises(NotAcknowledged):
+                    get_current(sock)
+                sock.close()
+        assert logs.records[-1].event == "error"
+        assert logs.records[-1].fields["phase"] == "request"
+
+    def test_other_stations_are_not_traced(self):
+        with SimulatedLogger() as simulator:
+            trace.enable("192.0.2.1:22222")
+            with self.assertNoLogs("skyentific.trace", "INFO"):
+                sock = connect(*simulator.address, socket.socket)
+                get_current(sock)
+                sock.close()
+
+
+class TestAsyncTrace(IsolatedAsyncioTestCase):
+    loop_packet = b"LOO\x14\x00\xb1\x02It\x1e\x03\x0f\x8a\x02\x02\x03\x8c\x00\xff\xff\xff\xff\xff\xff\xff\xff\xff\xff\xff\xff\xff\xff\xff\x1b\xff\xff\xff\xff\xff\xff\xff\x00\x00V\xff\x7f\x00\x00\xff\xff\x00\x00\x02\x00\x02\x00\x00\x00\x00\x00\x00\x00\xff\xff\xff\xff\xff\xff\xff\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x006\x03\x03\xc0\x1b\x02\xe3\x07\n\r\xee\x00"
+
+    def setUp(self):
+        self.addCleanup(trace.disable)
+
+    async def test_traces_enabled_station(self):
+        server, _ = await start_mock_server(
+            ACKNOWLEDGED_RESPONSE_CODE.to_bytes(1, "big") + self.loop_packet
+        )
+        self.addAsyncCleanup(server.wait_closed)
+        self.addCleanup(server.close)
+        port = server.sockets[0].getsockname()[1]
+        station = "127.0.0.1:%s" % port
+        trace.enable(station)
+        with self.assertLogs("skyentific.trace", "INFO") as logs:
+            client = AsyncWeatherLinkClient("127.0.0.1", port)
+            await client.get_current()
+            await client.close()
+        events = [record.event for record in logs.records]
+        assert events == ["connected", "acknowledged", "received"]
+        assert all(record.station == station for record in logs.records)
+        assert logs.records[-1].fields["crc_ok"] is True
+
+    async def test_traces_connect_errors(self):
+        with socket.socket() as unused:
+            unused.bind(("127.0.0.1", 0))
+            port = unused.getsockname()[1]
+        trace.enable()
+        with self.assertLogs("skyentific.trace", "INFO") as logs:
+            with self.assertRaises(NotAcknowledged):
+                await AsyncWeatherLinkClient("127.0.0.1", port).get_current()
+        assert logs.records[-1].event == "error"
+        assert logs.records[-1].fields["phase"] == "connect"
@@ -1,15 +1,25 @@
 import datetime
+import random
 import socket
+import os
+import subprocess
+import sys
 
 from unittest.mock import Mock
 from unittest import TestCase
 
 from skyentific.exceptions import NotAcknowledged, BadCRC, UnknownResponseCode
+from bitstring import BitStream
+
 from skyentific.utils import (
+    CRC16_TABLE,
     crc16,
+    crc16_python,
     connect,
     request,
     receive_data,
+    receive_exactly,
+    PacketReader,
     make_time,
     NACK_RESPONSE_CODE,
     BAD_CRC_RESPONSE_CODE,
@@ -33,6 +43,37 @@ class TestUtils(TestCase):
             calculated_crc == expected_crc_result
         ), f"Expected CRC: {expected_crc_result}, but got: {calculated_crc}"
 
+    def test_crc16_matches_table(self):
+        def reference_crc16(data):
+            crc = 0
+            for data_byte in iter(data):
+                high_byte = crc >> 8
+                low_byte = (crc & 0x00FF) << 8
+                crc = low_byte ^ CRC16_TABLE[high_byte ^ data_byte]
+            return crc
+
+        generator = random.Random(1234)
+        samples = [b"", b"\x00", self.loop_packet]
+        samples += [
+            generator.randbytes(generator.randrange(1, 300)) for _ in range(500)
+        ]
+        for sample in samples:
+            expected = reference_crc16(sample)
+            assert crc16_python(sample) == expected
+            assert crc16(sample) == expected
+            assert crc16(bytearray(sample)) == expected
+            assert crc16(memoryview(sample)) == expected
+        assert crc16(BitStream(self.loop_packet)) == 0
+        assert crc16(b"POO" + self.loop_packet[3:]) != 0
+
+    def test_crc16_table(self):
+        assert isinstance(CRC16_TABLE, tuple)
+        for index, value in enumerate(CRC16_TABLE):
+            crc = index << 8
+            for _ in range(8):
+                crc = ((crc << 1) ^ 0x1021 if crc & 0x8000 else crc << 1) & 0xFFFF
+            assert value == crc
+
     def test_connect(self):
         # Positive test cases
         socket_generator = Mock()
@@ -41,6 +82,29 @@ class TestUtils(TestCase):
         sock = connect("4.4.4.4", 8888, socket_generator)
         sock.connect.assert_called_once_with(("4.4.4.4", 8888))
         socket_generator.assert_called_once_with(socket.AF_INET, socket.SOCK_STREAM)
+        sock.settimeout.assert_called_once_with(2.0)
+
+    def test_connect_timeout(self):
+        socket_generator = Mock()
+        sock = connect("4.4.4.4", 8888, socket_generator, timeout=None)
+        sock.settimeout.assert_called_once_with(None)
+
+    def test_import_leaves_global_state_alone(self):
+        # Importing the package must not load its heavy dependencies or
+        # change the default timeout of every socket in the process.
+        script = (
+            "import socket, sys, skyentific; "
+            "print(socket.getdefaulttimeout(), "
+            "sorted({'bitstring', 'dateutil', 'numpy'} & set(sys.modules)))"
+        )
+        output = subprocess.run(
+            [sys.executable, "-c", script],
+            capture_output=True,
+            check=True,
+            env={"PYTHONPATH": os.pathsep.join(sys.path)},
+            text=True,
+        ).stdout
+        assert output.strip() == "None []"
 
     def test_request_nack(self):
         mock_socket = MockSocket(NACK_RESPONSE_CODE.to_bytes(1, "big"))
@@ -56,6 +120,13 @@ class TestUtils(TestCase):
         mock_socket = MockSocket(ACKNOWLEDGED_RESPONSE_CODE.to_bytes(1, "big"))
         request(mock_socket, b"Hello World")
 
+    def test_request_closed(self):
+        reader_socket, writer_socket = socket.socketpair()
+        with reader_socket, writer_socket:
+            writer_socket.shutdown(socket.SHUT_WR)
+            with self.assertRaises(ConnectionError):
+                request(reader_socket, b"Hello World")
+
     def test_request_unknown_response_code(self):
         mock_socket = MockSocket(b"\xFF")
         with self.assertRaises(UnknownResponseCode):
@@ -74,6 +145,34 @@ class TestUtils(TestCase):
         with self.assertRaises(Exception):
             receive_data(mock_socket, 1) == b""
 
+    def test_receive_exactly(self):
+        mock_socket = MockSocket(b"Hello World")
+        assert receive_exactly(mock_socket, 5) == b"Hello"
+        buffer = bytearray(16)
+        view = receive_exactly(mock_socket, 6, buffer)
+        assert view == b" World"
+        assert view.obj is buffer
+
+    def test_receive_exactly_closed(self):
+        reader_socket, writer_socket = socket.socketpair()
+        with reader_socket, writer_socket:
+            writer_socket.sendall(b"Hello")
+            writer_socket.shutdown(socket.SHUT_WR)
+            with self.assertRaises(ConnectionError):
+                receive_exactly(reader_socket, 6)
+
+    def test_packet_reader(self):
+        reader_socket, writer_socket = socket.socketpair()
+        with reader_socket, writer_socket:
+            writer_socket.sendall(self.loop_packet * 2 + b"LOO")
+            reader = PacketReader(reader_socket, len(self.loop_packet))
+            first = reader.read()
+            assert first == self.loop_packet
+            second = reader.read()
+            assert second == self.loop_packet
+            assert first.obj is second.obj
+            assert reader_socket.recv(3) == b"LOO"
+
     def test_make_time(self):
         # Positive test cases
         self.assertEqual(make_time(0), datetime.time(0, 0, 0))  # 00:00:00
@@ -1,15 +1,25 @@
 import logging
 import socket
+import threading
 import time
 
 from unittest.mock import Mock
 from unittest import TestCase
 
-from skyentific import get_current, get_current_condition, LOOP_RECORD_SIZE_BYTES
+from skyentific import (
+    get_current,
+    get_current_condition,
+    stream_loop,
+    stream_lps,
+    LOOP_RECORD_SIZE_BYTES,
+)
 from skyentific.utils import ACKNOWLEDGED_RESPONSE_CODE
+from skyentific.models import Loop2Record, LoopRecord, StationObservation
 from skyentific.exceptions import StopTrying, NotAcknowledged, SkyentificError
+from skyentific.retry import RetryPolicy, RetryStats
 
 from .mocks import MockSocket
+from .test_models import make_loop2_packet
 
 logger = logging.getLogger(__name__)
 
@@ -38,6 +48,40 @@ class TestSkyentific(TestCase):
         with self.assertRaises(NotAcknowledged):
             get_current(mock_socket)
 
+    def test_stream_loop(self):
+        mock_socket = MockSocket(
+            self.code_bytes + self.loop_packet * 2 + self.code_bytes + self.loop_packet
+        )
+        records = list(stream_loop(mock_socket, count=3, packets_per_command=2))
+        assert records == [self.loop_packet] * 3
+        assert mock_socket.sentData == b"LOOP 2\nLOOP 1\n"
+
+    def test_stream_loop_decodes(self):
+        mock_initialization_function = Mock(return_value="decoded")
+        records = stream_loop(
+            self.mock_socket,
+            packets_per_command=5,
+            initialization_function=mock_initialization_function,
+        )
+        assert next(records) == "decoded"
+        mock_initialization_function.assert_called_once_with(self.loop_packet)
+        assert self.mock_socket.sentData == b"LOOP 5\n"
+
+    def test_stream_lps(self):
+        mock_socket = MockSocket(
+            self.code_bytes + self.loop_packet + make_loop2_packet()
+        )
+        records = list(stream_lps(mock_socket, count=2))
+        assert mock_socket.sentData == b"LPS 3 2\n"
+        assert isinstance(records[0], LoopRecord)
+        assert isinstance(records[1], Loop2Record)
+        assert records[1].two_min_avg_wind_speed == 6.1
+
+    def test_stream_loop_socket_error(self):
+        mock_socket = MockSocket(b"", recv_side_effect=socket.timeout("Timeout"))
+        with self.assertRaises(NotAcknowledged):
+            next(stream_loop(mock_socket, count=1))
+
     def test_get_current_condition(self):
         mock_initialization_function = Mock(return_value=b"\x00")
         delays = [0.1, 1.0]
@@ -98,3 +142,121 @@ class TestSkyentific(TestCase):
 
         mock_initialization_function.assert_not_called()
         assert retry_count == 2
+
+    def test_current_condition_retry_policy(self):
+        mock_initialization_function = Mock(return_value="decoded")
+        stats = RetryStats()
+        receive_error_mock_socket = MockSocket(b"", recv_side_effect=NotAcknowledged)
+        receive_error_mock_socket.open = True
+        policy = RetryPolicy(max_attempts=3, base_delay=0)
+        with self.assertRaises(SkyentificError):
+            get_current_condition(
+                receive_error_mock_socket,
+                mock_initialization_function,
+                retry_policy=policy,
+                retry_stats=stats,
+            )
+        mock_initialization_function.assert_not_called()
+        assert stats.attempts == 3
+        assert stats.errors == {"NotAcknowledged": 3}
+        assert not receive_error_mock_socket.open
+
+        assert (
+            get_current_condition(
+                self.mock_socket,
+                mock_initialization_function,
+                retry_policy=policy,
+                retry_stats=stats,
+            )
+            == "decoded"
+        )
+        assert stats.attempts == 4
+
+    def test_current_condition_timeout_override(self):
+        # Only the socket.timeout override allows a second attempt.
+        timing_out = MockSocket(b"", recv_side_effect=socket.timeout)
+        timing_out.open = True
+        stats = RetryStats()
+        policy = RetryPolicy(
+            max_attempts=1,
+            overrides={socket.timeout: RetryPolicy(max_attempts=2, base_delay=0)},
+        )
+        assert (
+            get_current_condition(
+                timing_out,
+                Mock(return_value="decoded"),
+                retry_policy=policy,
+                retry_stats=stats,
+                reconnect=Mock(return_value=self.mock_socket),
+            )
+            == "decoded"
+        )
+        assert stats.attempts == 2
+        assert stats.errors == {"NotAcknowledged": 1}
+        assert isinstance(stats.last_error.__cause__, socket.timeout)
+
+    def test_current_condition_without_delay_function(self):
+        receive_error_mock_socket = MockSocket(b"", recv_side_effect=NotAcknowledged)
+        with self.assertRaises(SkyentificError):
+            get_current_condition(receive_error_mock_socket, Mock())
+
+    def test_current_condition_retry_discards_partial_packet(self):
+        # The first LOOP times out halfway through the record and the rest
+        # arrives late, so the retry must not read it as its ACK.
+        client, server = socket.socketpair()
+        client.settimeout(0.2)
+
+        def console():
+            with server:
+                server.recv(16)
+                server.sendall(self.code_bytes + self.loop_packet[:50])
+                time.sleep(0.4)
+                server.sendall(self.loop_packet[50:])
+                server.recv(16)
+                server.sendall(b"\n\r")
+                server.recv(16)
+                server.sendall(self.code_bytes + self.loop_packet)
+                server.recv(16)
+
+        thread = threading.Thread(target=console, daemon=True)
+        thread.start()
+        stats = RetryStats()
+        observation = get_current_condition(
+            client,
+            StationObservation.init_with_bytes,
+            retry_policy=RetryPolicy(max_attempts=2, base_delay=0.6, jitter=0),
+            retry_stats=stats,
+        )
+        thread.join(2)
+        assert observation.barometer == 29.769
+        assert stats.errors == {"NotAcknowledged": 1}
+
+    def test_current_condition_retry_stops_when_closed(self):
+        client, server = socket.socketpair()
+        server.close()
+        stats = RetryStats()
+        with self.assertRaises(SkyentificError):
+            get_current_condition(
+                client,
+                Mock(),
+                retry_policy=RetryPolicy(max_attempts=5, base_delay=0),
+                retry_stats=stats,
+            )
+        assert stats.attempts == 2
+
+    def test_current_condition_retry_reconnects(self):
+        failing = MockSocket(b"", recv_side_effect=NotAcknowledged)
+        failing.open = True
+        reconnect = Mock(return_value=self.mock_socket)
+        assert (
+            get_current_condition(
+                failing,
+                Mock(return_value="decoded"),
+                retry_policy=RetryPolicy(max_attempts=2, base_delay=0),
+                reconnect=reconnect,
+            )
+            == "decoded"
+        )
+        reconnect.assert_called_once_with()
+        assert not failing.open
+        assert not self.mock_socket.open